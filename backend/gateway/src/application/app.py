@@ -3,9 +3,9 @@ from fastapi import APIRouter
 from application.routes.auth import authentication_router
 from application.routes.account import profile_router
 from application.routes.customer import address_router
-from application.routes.driver import driver_status_router, driver_location_router, driver_vehicle_router
+from application.routes.driver import driver_status_router, driver_location_router, driver_vehicle_router, driver_trajectory_router
 from application.routes.restaurant import restaurant_router, menu_router
-from application.routes.order import feedback_router, order_location_router
+from application.routes.order import feedback_router, order_location_router, restaurant_order_router, customer_order_router
 
 def init_router() -> APIRouter:
     router = APIRouter()
@@ -15,8 +15,11 @@ def init_router() -> APIRouter:
     router.include_router(driver_location_router)
     router.include_router(driver_status_router)
     router.include_router(driver_vehicle_router)
+    router.include_router(driver_trajectory_router)
     router.include_router(restaurant_router)
     router.include_router(menu_router)
     router.include_router(feedback_router)
     router.include_router(order_location_router)
+    router.include_router(restaurant_order_router)
+    router.include_router(customer_order_router)
     return router
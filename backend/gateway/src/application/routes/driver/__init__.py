@@ -1,3 +1,4 @@
 from application.routes.driver.location import router as driver_location_router
 from application.routes.driver.online_status import router as driver_status_router
 from application.routes.driver.vehicle import router as driver_vehicle_router
+from application.routes.driver.trajectory import router as driver_trajectory_router
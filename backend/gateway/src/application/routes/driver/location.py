@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Request, Depends
-from application.schemas.driver.location import LocationsSchema, LocationPointMixin
+from application.schemas.driver.location import LocationsSchema, LocationPointMixin, SubmitLocationResponse
 from application.exceptions import handle_exception
 from ftgo_utils.enums import ResponseStatus, Roles
 from ftgo_utils.errors import BaseError, ErrorCodes
@@ -13,7 +13,7 @@ router = APIRouter(
     dependencies=[Depends(AccessManager([Roles.DRIVER]))],
 )
 
-@router.post("/submit", response_model=SuccessResponse)
+@router.post("/submit", response_model=SubmitLocationResponse)
 async def submit_location(request: Request, request_data: LocationsSchema):
     try:
         data = {
@@ -24,7 +24,7 @@ async def submit_location(request: Request, request_data: LocationsSchema):
         status = response.get('status', ResponseStatus.ERROR.value)
 
         if status == ResponseStatus.SUCCESS.value:
-            return SuccessResponse()
+            return SubmitLocationResponse(next_report_interval_s=response.get("next_report_interval_s"))
 
         error_code = ErrorCodes.get_error_code(response.get('error_code'))
         raise BaseError(
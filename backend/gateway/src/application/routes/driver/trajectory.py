@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Request, Depends
+from application.schemas.driver.location import TrajectoryRequest, TrajectoryResponse
+from application.exceptions import handle_exception
+from ftgo_utils.enums import ResponseStatus, Roles
+from ftgo_utils.errors import BaseError, ErrorCodes
+from services.location import LocationService
+from application.dependencies import AccessManager
+
+router = APIRouter(
+    prefix='/location',
+    tags=["driver_location_service"],
+    dependencies=[Depends(AccessManager([Roles.ADMIN]))],
+)
+
+@router.post("/trajectory", response_model=TrajectoryResponse)
+async def get_trajectory(request: Request, request_data: TrajectoryRequest):
+    try:
+        response = await LocationService.get_driver_trajectory(data=request_data.dict(exclude_none=True))
+        status = response.pop('status', ResponseStatus.ERROR.value)
+
+        if status == ResponseStatus.SUCCESS.value:
+            return TrajectoryResponse(**response)
+
+        raise BaseError(
+            error_code=ErrorCodes.get_error_code(response.get('error_code')),
+            message="Getting driver trajectory failed",
+            payload=request_data.dict(),
+        )
+    except Exception as e:
+        await handle_exception(
+            request, e, default_failure_message="Getting driver trajectory failed"
+        )
@@ -1,2 +1,4 @@
 from application.routes.order.feedback import router as feedback_router
 from application.routes.order.order import router as order_location_router
+from application.routes.order.restaurant_order import router as restaurant_order_router
+from application.routes.order.customer_order import router as customer_order_router
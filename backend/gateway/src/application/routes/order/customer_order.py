@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Request, Depends
+from application.exceptions import handle_exception
+from ftgo_utils.enums import ResponseStatus, Roles
+from ftgo_utils.errors import BaseError, ErrorCodes
+from application.schemas.order.order import GetOrderHistoryRequest, GetOrderHistoryResponse
+from services.order import OrderService
+from application.dependencies import AccessManager
+
+# Routes over the authenticated customer's own orders; the customer is always the caller.
+router = APIRouter(
+    prefix='/order',
+    tags=["order_service"],
+    dependencies=[Depends(AccessManager([Roles.CUSTOMER]))],
+)
+
+
+@router.post("/history", response_model=GetOrderHistoryResponse)
+async def get_order_history(request: Request, request_data: GetOrderHistoryRequest):
+    try:
+        data = {
+            "customer_id": request.state.user.user_id,
+            **request_data.dict(exclude_none=True),
+        }
+        response = await OrderService.get_order_history(data=data)
+        status = response.pop('status', ResponseStatus.ERROR.value)
+
+        if status == ResponseStatus.SUCCESS.value:
+            return GetOrderHistoryResponse(**response)
+
+        error_code = ErrorCodes.get_error_code(response.get('error_code'))
+        raise BaseError(
+            error_code=error_code,
+            message="Getting order history failed",
+            payload=request_data.dict(),
+        )
+    except Exception as e:
+        await handle_exception(
+            request, e, default_failure_message="Getting order history failed"
+        )
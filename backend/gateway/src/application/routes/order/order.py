@@ -5,8 +5,7 @@ from ftgo_utils.enums import ResponseStatus, Roles
 from ftgo_utils.errors import BaseError, ErrorCodes
 from application.schemas.common import SuccessResponse
 from application.schemas.order.order import (
-    CreateOrderRequest, GetOrderHistoryRequest, GetOrderHistoryResponse,
-    UpdateOrderRequest, ConfirmOrderRequest, RejectOrderRequest
+    CreateOrderRequest, UpdateOrderRequest, ConfirmOrderRequest, RejectOrderRequest
 )
 from services.order import OrderService
 from application.dependencies import AccessManager
@@ -17,31 +16,6 @@ router = APIRouter(
     dependencies=[Depends(AccessManager([Roles.DRIVER]))],
 )
 
-@router.post("/history", response_model=GetOrderHistoryResponse)
-async def get_order_history(request: Request, request_data: GetOrderHistoryRequest):
-    try:
-        data = {
-            "order_id": request_data['order_id'],
-        }
-        response = await OrderService.get_order_history(data=data)
-        status = response.get('status', ResponseStatus.ERROR.value)
-
-        if status == ResponseStatus.SUCCESS.value:
-            return SuccessResponse()
-
-        error_code = ErrorCodes.get_error_code(response.get('error_code'))
-        raise BaseError(
-            error_code=error_code,
-            message="Submitting location failed",
-            payload=request_data.dict(),
-        )
-    except Exception as e:
-        await handle_exception(
-            request, e, default_failure_message="Submitting location failed"
-        )
-
-
-
 @router.post("/create", response_model=SuccessResponse)
 async def create_order(request: Request, request_data: CreateOrderRequest):
     try:
@@ -141,4 +115,4 @@ async def restaurant_reject(request: Request, request_data: RejectOrderRequest):
     except Exception as e:
         await handle_exception(
             request, e, default_failure_message="Rejecting order failed"
-        )
\ No newline at end of file
+        )
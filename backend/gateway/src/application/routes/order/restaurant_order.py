@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Request, Depends, status as http_status
+from application.exceptions import handle_exception
+from application.schemas.user import UserStateSchema
+from ftgo_utils.enums import OrderStatus, ResponseStatus, Roles
+from ftgo_utils.errors import BaseError, ErrorCodes
+from application.schemas.order.order import ChangeOrdersStatusRequest, ConfirmOrdersRequest, OrderBatchResponse
+from services.order import OrderService
+from services.restaurant import RestaurantService
+from application.dependencies import AccessManager
+
+# Batch routes for restaurant dashboards. The restaurant is always the one owned by the
+# authenticated user, so a batch can only touch that restaurant's orders.
+router = APIRouter(
+    prefix='/order',
+    tags=["order_service"],
+    dependencies=[Depends(AccessManager([Roles.RESTAURANT_ADMIN]))],
+)
+
+RESTAURANT_STATUSES = frozenset({
+    OrderStatus.CONFIRMED, OrderStatus.REJECTED, OrderStatus.PREPARING, OrderStatus.READY_FOR_PICKUP,
+})
+
+
+async def get_supplier_restaurant_id(request: Request) -> str:
+    user: UserStateSchema = request.state.user
+    response = await RestaurantService.get_supplier_restaurant_info(data={"user_id": user.user_id})
+    if response.get('status') == ResponseStatus.SUCCESS.value and response.get('id'):
+        return response['id']
+    raise BaseError(
+        error_code=ErrorCodes.USER_PERMISSION_DENIED_ERROR,
+        status_code=http_status.HTTP_403_FORBIDDEN,
+        message="No restaurant is registered for this user",
+    )
+
+
+@router.post("/status/change_many", response_model=OrderBatchResponse)
+async def change_orders_status(request: Request, request_data: ChangeOrdersStatusRequest):
+    try:
+        if request_data.status not in RESTAURANT_STATUSES:
+            raise BaseError(
+                error_code=ErrorCodes.USER_PERMISSION_DENIED_ERROR,
+                status_code=http_status.HTTP_403_FORBIDDEN,
+                message=f"Restaurants cannot move orders to {request_data.status.value}",
+            )
+        data = {
+            "order_ids": request_data.order_ids,
+            "new_status": request_data.status.value,
+            "changed_by": request.state.user.user_id,
+            "comments": request_data.comments,
+            "restaurant_id": await get_supplier_restaurant_id(request),
+        }
+        response = await OrderService.change_status_many(data=data)
+        status = response.pop('status', ResponseStatus.ERROR.value)
+
+        if status == ResponseStatus.SUCCESS.value:
+            return OrderBatchResponse(**response)
+
+        error_code = ErrorCodes.get_error_code(response.get('error_code'))
+        raise BaseError(
+            error_code=error_code,
+            message="Changing orders status failed",
+            payload=request_data.dict(),
+        )
+    except Exception as e:
+        await handle_exception(
+            request, e, default_failure_message="Changing orders status failed"
+        )
+
+
+@router.post("/confirm_many", response_model=OrderBatchResponse)
+async def restaurant_confirm_many(request: Request, request_data: ConfirmOrdersRequest):
+    try:
+        data = {
+            "order_ids": request_data.order_ids,
+            "restaurant_id": await get_supplier_restaurant_id(request),
+        }
+        response = await OrderService.restaurant_confirm_many(data=data)
+        status = response.pop('status', ResponseStatus.ERROR.value)
+
+        if status == ResponseStatus.SUCCESS.value:
+            return OrderBatchResponse(**response)
+
+        error_code = ErrorCodes.get_error_code(response.get('error_code'))
+        raise BaseError(
+            error_code=error_code,
+            message="Confirming orders failed",
+            payload=request_data.dict(),
+        )
+    except Exception as e:
+        await handle_exception(
+            request, e, default_failure_message="Confirming orders failed"
+        )
@@ -4,5 +4,29 @@ from pydantic import Field
 
 from ftgo_utils.schemas import LocationMixin, BaseSchema, LocationPointMixin
 
+from application.schemas.common import SuccessResponse
+
 class LocationsSchema(BaseSchema):
     locations: List[LocationMixin] = Field(..., min_items=1)
+
+class SubmitLocationResponse(SuccessResponse):
+    next_report_interval_s: Optional[float] = Field(None, description="Seconds the client should wait before its next report")
+
+class TrajectoryRequest(BaseSchema):
+    driver_id: str
+    start_time: float
+    end_time: float
+    max_points: Optional[int] = Field(None, ge=2)
+    method: Optional[str] = Field(None, description="none, douglas_peucker or time_bucket")
+
+class TrajectoryPointSchema(BaseSchema):
+    timestamp: float
+    latitude: float
+    longitude: float
+
+class TrajectoryResponse(BaseSchema):
+    driver_id: str
+    method: str
+    raw_point_count: int
+    truncated: bool = False
+    points: List[TrajectoryPointSchema]
@@ -2,6 +2,8 @@ from typing import Optional, Any
 
 from pydantic import Field
 
+from ftgo_utils.enums import OrderStatus
+
 from ftgo_utils.schemas import (
     uuid_field,
     AddressMixin,
@@ -15,15 +17,14 @@ class CreateOrderRequest(BaseSchema):
 
 
 class GetOrderHistoryRequest(BaseSchema):
-    order_id: str = uuid_field()
+    cursor: Optional[str] = Field(None, description="next_cursor of the previous page")
+    limit: Optional[int] = Field(None, ge=1, le=100)
+    fields: Optional[list[str]] = Field(None, description="Order fields to return; list view fields by default")
 
 
 class GetOrderHistoryResponse(BaseSchema):
-    customer_id: str = uuid_field()
-    restaurant_id: str = uuid_field()
-    total_amount: float = Field(..., gt=0)
-    order_items: list[dict[str, Any]]
-    status_history: list
+    orders: list[dict[str, Any]]
+    next_cursor: Optional[str] = None
 
 
 class UpdateOrderRequest(BaseSchema):
@@ -39,4 +40,23 @@ class ConfirmOrderRequest(BaseSchema):
 
 class RejectOrderRequest(BaseSchema):
     order_id: str = uuid_field()
-    restaurant_id: str = uuid_field()
\ No newline at end of file
+    restaurant_id: str = uuid_field()
+
+class ChangeOrdersStatusRequest(BaseSchema):
+    order_ids: list[str] = Field(..., min_length=1, max_length=500)
+    status: OrderStatus
+    comments: Optional[str] = None
+
+
+class ConfirmOrdersRequest(BaseSchema):
+    order_ids: list[str] = Field(..., min_length=1, max_length=500)
+
+
+class OrderBatchResult(BaseSchema):
+    order_id: str
+    result: str = Field(..., description="applied, conflict or not_found")
+    status: Optional[str] = None
+
+
+class OrderBatchResponse(BaseSchema):
+    results: list[OrderBatchResult]
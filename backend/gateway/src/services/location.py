@@ -27,3 +27,7 @@ class LocationService(Microservice):
     @classmethod
     async def get_driver_status(cls, data: Dict) -> Dict:
         return await cls._call_rpc('driver.status.get', data=data)
+
+    @classmethod
+    async def get_driver_trajectory(cls, data: Dict) -> Dict:
+        return await cls._call_rpc('driver.location.trajectory', data=data)
@@ -22,4 +22,12 @@ class OrderService(Microservice):
 
     @classmethod
     async def restaurant_reject(cls, data: Dict) -> Dict:
-        return await cls._call_rpc('order.restaurant.reject', data=data)
\ No newline at end of file
+        return await cls._call_rpc('order.restaurant.reject', data=data)
+
+    @classmethod
+    async def change_status_many(cls, data: Dict) -> Dict:
+        return await cls._call_rpc('order.status.change_many', data=data)
+
+    @classmethod
+    async def restaurant_confirm_many(cls, data: Dict) -> Dict:
+        return await cls._call_rpc('order.restaurant.confirm_many', data=data)
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from application.app import init_router
+from application.routes.order.customer_order import get_order_history
+from application.schemas.order.order import GetOrderHistoryRequest
+from ftgo_utils.enums import ResponseStatus, Roles
+from ftgo_utils.errors import BaseError
+from services.order import OrderService
+
+
+def request_as(role: Roles, user_id: str = "user_1") -> SimpleNamespace:
+    return SimpleNamespace(state=SimpleNamespace(user=SimpleNamespace(role=role.value, user_id=user_id), request_id="request_1"))
+
+
+def check_access(path: str, role: Roles) -> None:
+    [route] = [route for route in init_router().routes if route.path == path]
+    for dependency in route.dependencies:
+        dependency.dependency(request_as(role))
+
+
+@pytest.mark.parametrize("path, allowed", [
+    ("/order/history", Roles.CUSTOMER),
+    ("/order/confirm_many", Roles.RESTAURANT_ADMIN),
+    ("/order/status/change_many", Roles.RESTAURANT_ADMIN),
+])
+def test_order_routes_are_open_to_their_role_only(path, allowed):
+    check_access(path, allowed)
+    for role in set(Roles) - {allowed}:
+        with pytest.raises(BaseError):
+            check_access(path, role)
+
+
+@pytest.mark.asyncio
+async def test_order_history_is_read_for_the_calling_customer():
+    with patch.object(OrderService, "get_order_history", new_callable=AsyncMock) as get_history:
+        get_history.return_value = {"status": ResponseStatus.SUCCESS.value, "orders": [], "next_cursor": None}
+        response = await get_order_history(request_as(Roles.CUSTOMER, "customer_1"), GetOrderHistoryRequest(limit=10))
+
+    get_history.assert_awaited_once_with(data={"customer_id": "customer_1", "limit": 10})
+    assert response.orders == [] and response.next_cursor is None
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from application import DriverService, TrackerService
+from data_access.repository import CacheRepository, DatabaseRepository
+from test_doubles.redis import FakeAsyncRedis, current_operation
+
+# Simulates a fleet driving road-like paths and submitting location batches through
+# DriverService.submit_location while riders query TrackerService.get_nearest_drivers.
+# Redis is the in-memory double and Postgres writes are discarded, so throughput and latency
+# measure the service's own CPU cost; Redis commands and round-trips per operation carry over.
+#
+#   PYTHONPATH=src:tests python -m benchmarks.fleet --drivers 5000 --update-hz 0.25 --query-rate 50 --duration 20
+
+CENTER = (35.70, 51.40)
+METERS_PER_DEGREE = 111_320.0
+BLOCK_M = 200.0
+HEADINGS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+class SimulatedDriver:
+    # Moves along a Manhattan-like grid: straight down a street, turning at some intersections
+    # and bouncing off the edges of the simulated area.
+    def __init__(self, driver_id: str, rng: random.Random, spread_deg: float):
+        self.driver_id = driver_id
+        self.rng = rng
+        self.spread_deg = spread_deg
+        self.latitude = CENTER[0] + rng.uniform(-spread_deg, spread_deg)
+        self.longitude = CENTER[1] + rng.uniform(-spread_deg, spread_deg)
+        self.heading = rng.randrange(len(HEADINGS))
+        self.speed = rng.uniform(4, 14)
+        self.to_intersection_m = rng.uniform(0, BLOCK_M)
+
+    def step(self, dt: float) -> None:
+        remaining_m = self.speed * dt
+        while remaining_m > 0:
+            moved_m = min(remaining_m, self.to_intersection_m)
+            north, east = HEADINGS[self.heading]
+            self.latitude += north * moved_m / METERS_PER_DEGREE
+            self.longitude += east * moved_m / (METERS_PER_DEGREE * math.cos(math.radians(self.latitude)))
+            remaining_m -= moved_m
+            self.to_intersection_m -= moved_m
+            if self.to_intersection_m <= 0:
+                self.to_intersection_m = BLOCK_M
+                if self.rng.random() < 0.3:
+                    self.heading = (self.heading + self.rng.choice((1, 3))) % len(HEADINGS)
+                    self.speed = self.rng.uniform(4, 14)
+            if abs(self.latitude - CENTER[0]) > self.spread_deg or abs(self.longitude - CENTER[1]) > self.spread_deg:
+                self.heading = (self.heading + 2) % len(HEADINGS)
+
+    def report(self, interval_s: float, batch_size: int, now: float) -> List[Dict[str, Any]]:
+        spacing_s = interval_s / batch_size
+        points = []
+        for index in range(batch_size):
+            self.step(spacing_s)
+            points.append({
+                "latitude": self.latitude,
+                "longitude": self.longitude,
+                "timestamp": now - (batch_size - 1 - index) * spacing_s,
+                "accuracy": self.rng.uniform(3, 12),
+                "speed": self.speed,
+                "bearing": self.heading * 90.0,
+            })
+        return points
+
+
+def schedule(args: argparse.Namespace) -> List[Tuple[float, str, int]]:
+    # Operations in simulated-time order: every driver reports once per 1 / update_hz seconds,
+    # queries arrive evenly at query_rate per second.
+    submits_per_s = args.drivers * args.update_hz
+    operations = [(index / submits_per_s, "submit", index % args.drivers) for index in range(int(submits_per_s * args.duration))]
+    operations += [(index / args.query_rate, "query", index) for index in range(int(args.query_rate * args.duration))]
+    return sorted(operations)
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    if not latencies:
+        return 0.0
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+async def discard(*args, **kwargs) -> None:
+    return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    redis = await FakeAsyncRedis.create(host="localhost", port=6379, db=0)
+    CacheRepository._data_access = redis
+    drivers = [SimulatedDriver(f"driver_{index}", rng, args.spread_deg) for index in range(args.drivers)]
+    for driver in drivers:
+        await DriverService.change_status_online(driver.driver_id)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for operation in schedule(args):
+        queue.put_nowait(operation)
+    latencies: Dict[str, List[float]] = {"submit": [], "query": []}
+    interval_s = 1 / args.update_hz
+
+    async def worker() -> None:
+        while not queue.empty():
+            _, kind, index = queue.get_nowait()
+            token = current_operation.set(kind)
+            started_at = time.perf_counter()
+            if kind == "submit":
+                driver = drivers[index]
+                await DriverService.submit_location(driver.driver_id, driver.report(interval_s, args.batch_size, time.time()))
+            else:
+                latitude = CENTER[0] + rng.uniform(-args.spread_deg, args.spread_deg)
+                longitude = CENTER[1] + rng.uniform(-args.spread_deg, args.spread_deg)
+                await TrackerService.get_nearest_drivers(
+                    {"latitude": latitude, "longitude": longitude}, radius=args.radius, max_count=args.max_count
+                )
+            latencies[kind].append(time.perf_counter() - started_at)
+            current_operation.reset(token)
+
+    redis.reset_round_trips()
+    with patch.object(DatabaseRepository, "bulk_insert", discard):
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed_s = time.perf_counter() - started_at
+
+    report = {"elapsed_s": elapsed_s}
+    for kind, kind_latencies in latencies.items():
+        operation_stats = redis.stats["operations"].get(kind, {"round_trips": 0, "commands": 0})
+        count = len(kind_latencies) or 1
+        report[kind] = {
+            "count": len(kind_latencies),
+            "throughput_per_s": len(kind_latencies) / elapsed_s,
+            "p50_ms": percentile(kind_latencies, 0.50),
+            "p99_ms": percentile(kind_latencies, 0.99),
+            "redis_commands": operation_stats["commands"] / count,
+            "redis_round_trips": operation_stats["round_trips"] / count,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic fleet load against the location service")
+    parser.add_argument("--drivers", type=int, default=2_000)
+    parser.add_argument("--update-hz", type=float, default=0.25, help="Location batches per driver per second")
+    parser.add_argument("--query-rate", type=float, default=50, help="Nearest-driver queries per second")
+    parser.add_argument("--duration", type=float, default=20, help="Simulated seconds of traffic")
+    parser.add_argument("--batch-size", type=int, default=4, help="Points per submitted batch")
+    parser.add_argument("--radius", type=int, default=1_000)
+    parser.add_argument("--max-count", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--spread-deg", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['elapsed_s']:.2f}s wall clock")
+    print(f"{'operation':>9} {'count':>7} {'per_s':>9} {'p50_ms':>8} {'p99_ms':>8} {'commands':>9} {'trips':>6}")
+    for kind in ("submit", "query"):
+        result = report[kind]
+        print(
+            f"{kind:>9} {result['count']:>7} {result['throughput_per_s']:>9.1f} {result['p50_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['redis_commands']:>9.1f} {result['redis_round_trips']:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+import h3
+
+from data_access.repository import CacheRepository
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+from test_doubles.redis import FakeAsyncRedis
+
+# Compares nearest-driver query cost when every radius is served from the finest resolution
+# against the multi-resolution planner. Runs against the in-memory Redis double, so latencies
+# only show relative CPU cost; cells and drivers scanned carry over to a real Redis.
+#
+#   PYTHONPATH=src:tests python -m benchmarks.hexagon_query --drivers 20000
+
+
+async def populate(drivers: int, center: tuple, spread_deg: float, rng: random.Random) -> None:
+    for start in range(0, drivers, 500):
+        commands = []
+        for index in range(start, min(start + 500, drivers)):
+            location = GeoLocation(
+                latitude=center[0] + rng.uniform(-spread_deg, spread_deg),
+                longitude=center[1] + rng.uniform(-spread_deg, spread_deg),
+                timestamp=time.time(),
+                accuracy=5,
+                speed=3,
+            )
+            commands.extend(Hexagon.move_driver_commands(f"driver_{index}", None, location, available=True))
+        await CacheRepository.execute([command for command in commands if command is not None])
+
+
+async def measure(redis: FakeAsyncRedis, radius_m: float, resolutions: List[int], points: List[tuple]) -> dict:
+    resolution, k = Hexagon.plan_query(radius_m, resolutions)
+    cells, scanned, round_trips, latencies = [], [], [], []
+    for latitude, longitude in points:
+        redis.reset_round_trips()
+        started_at = time.perf_counter()
+        hex_ids = list(h3.grid_disk(h3.latlng_to_cell(latitude, longitude, resolution), k))
+        positions = await Hexagon.get_cells_driver_positions(hex_ids)
+        await Hexagon.get_cells_eligible_drivers(hex_ids, available_only=True)
+        latencies.append(time.perf_counter() - started_at)
+        cells.append(len(hex_ids))
+        scanned.append(len(positions))
+        round_trips.append(redis.round_trips)
+    latencies.sort()
+    return {
+        "resolution": resolution,
+        "cells": statistics.mean(cells),
+        "drivers_scanned": statistics.mean(scanned),
+        "round_trips": statistics.mean(round_trips),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    redis = await FakeAsyncRedis.create(host="localhost", port=6379, db=0)
+    CacheRepository._data_access = redis
+    center = (35.70, 51.40)
+    await populate(args.drivers, center, args.spread_deg, rng)
+    points = [
+        (center[0] + rng.uniform(-args.spread_deg / 2, args.spread_deg / 2),
+         center[1] + rng.uniform(-args.spread_deg / 2, args.spread_deg / 2))
+        for _ in range(args.queries)
+    ]
+
+    strategies = {"finest": Hexagon.resolutions()[:1], "planned": Hexagon.resolutions()}
+    print(f"{'radius_m':>9} {'strategy':>8} {'res':>4} {'cells':>7} {'scanned':>9} {'trips':>6} {'p50_ms':>8} {'p99_ms':>8}")
+    for radius_m in args.radii:
+        for name, resolutions in strategies.items():
+            result = await measure(redis, radius_m, resolutions, points)
+            print(
+                f"{radius_m:>9} {name:>8} {result['resolution']:>4} {result['cells']:>7.0f} "
+                f"{result['drivers_scanned']:>9.0f} {result['round_trips']:>6.1f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nearest-driver query cost across radii and resolutions")
+    parser.add_argument("--drivers", type=int, default=20_000)
+    parser.add_argument("--spread-deg", type=float, default=0.3)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--radii", type=int, nargs="+", default=[300, 1_000, 3_000, 5_000, 10_000])
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
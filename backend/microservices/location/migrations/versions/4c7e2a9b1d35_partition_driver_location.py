@@ -0,0 +1,99 @@
+"""partition driver_location by day
+
+Revision ID: 4c7e2a9b1d35
+Revises: 9fafa9afc18d
+Create Date: 2026-10-19 10:12:48.301557
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c7e2a9b1d35'
+down_revision = '9fafa9afc18d'
+branch_labels = None
+depends_on = None
+
+PRECREATE_DAYS = 7
+COLUMNS = "id, driver_id, latitude, longitude, accuracy, speed, bearing, timestamp, created_at, updated_at"
+
+
+def _driver_location_columns():
+    return [
+        sa.Column('driver_id', sa.String(), nullable=False),
+        sa.Column('latitude', sa.Float(precision=32), nullable=False),
+        sa.Column('longitude', sa.Float(precision=32), nullable=False),
+        sa.Column('accuracy', sa.Float(precision=32), nullable=True),
+        sa.Column('speed', sa.Float(precision=32), nullable=True),
+        sa.Column('bearing', sa.Float(precision=32), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table('driver_location', 'driver_location_unpartitioned')
+    # timestamp is the partition key and NOT NULL below; rows written before the column was
+    # enforced fall back to when they were stored rather than failing the copy.
+    op.execute("UPDATE driver_location_unpartitioned SET timestamp = created_at WHERE timestamp IS NULL")
+    op.execute("ALTER TABLE driver_location_unpartitioned RENAME CONSTRAINT driver_location_pkey TO driver_location_unpartitioned_pkey")
+
+    op.create_table('driver_location',
+    *_driver_location_columns(),
+    sa.PrimaryKeyConstraint('id', 'timestamp'),
+    postgresql_partition_by='RANGE (timestamp)',
+    )
+
+    # One partition per UTC day from the oldest stored point up to a week ahead, or to the
+    # newest point if a clock-skewed device sent one later; LocationPartitions keeps
+    # extending the range at runtime.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            day date;
+        BEGIN
+            FOR day IN
+                SELECT generate_series(
+                    COALESCE((SELECT min(timestamp AT TIME ZONE 'UTC')::date FROM driver_location_unpartitioned), current_date - 1),
+                    GREATEST(
+                        (SELECT max(timestamp AT TIME ZONE 'UTC')::date FROM driver_location_unpartitioned),
+                        current_date + {PRECREATE_DAYS}
+                    ),
+                    interval '1 day'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF driver_location FOR VALUES FROM (%L) TO (%L)',
+                    'driver_location_p' || to_char(day, 'YYYYMMDD'),
+                    day::timestamp AT TIME ZONE 'UTC',
+                    (day + 1)::timestamp AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute(f"INSERT INTO driver_location ({COLUMNS}) SELECT {COLUMNS} FROM driver_location_unpartitioned")
+    op.drop_table('driver_location_unpartitioned')
+
+    op.create_index('ix_driver_location_driver_id_timestamp', 'driver_location', ['driver_id', sa.text('timestamp DESC')])
+    op.create_index('ix_driver_location_timestamp_brin', 'driver_location', ['timestamp'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.create_table('driver_location_unpartitioned',
+    *_driver_location_columns(),
+    sa.PrimaryKeyConstraint('id', name='driver_location_unpartitioned_pkey'),
+    )
+    # The partitioned key is (id, timestamp), so an id may repeat across days; the
+    # unpartitioned table keys on id alone and keeps the newest row for each.
+    op.execute(
+        f"INSERT INTO driver_location_unpartitioned ({COLUMNS}) "
+        f"SELECT DISTINCT ON (id) {COLUMNS} FROM driver_location ORDER BY id, timestamp DESC"
+    )
+    # Dropping the parent drops every attached partition with it.
+    op.drop_table('driver_location')
+    op.rename_table('driver_location_unpartitioned', 'driver_location')
+    op.execute("ALTER TABLE driver_location RENAME CONSTRAINT driver_location_unpartitioned_pkey TO driver_location_pkey")
@@ -12,10 +12,10 @@ class DriverService:
         **kwargs,
     ) -> Dict[str, Any]:
         driver = await Driver.load(driver_id)
-        await driver.submit_locations(
+        next_report_interval_s = await driver.submit_locations(
             locations=locations,
         )
-        return {}
+        return {"next_report_interval_s": next_report_interval_s}
 
     @staticmethod
     async def change_status_online(driver_id: str, **kwargs) -> Dict[str, Any]:
@@ -41,6 +41,12 @@ class DriverService:
         await driver.change_availability(DriverAvailabilityStatus.OCCUPIED.value)
         return {}
 
+    @staticmethod
+    async def set_drivers_occupied(driver_ids: List[str], **kwargs) -> Dict[str, Any]:
+        # Used by dispatch to take a whole batch of assigned drivers out of the available sets.
+        await Driver.change_availability_many(list(dict.fromkeys(driver_ids)), DriverAvailabilityStatus.OCCUPIED.value)
+        return {}
+
     @staticmethod
     async def get_last_location(driver_id: str, **kwargs) -> Dict[str, Any]:
         driver = await Driver.load(driver_id)
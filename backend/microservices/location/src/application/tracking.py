@@ -1,6 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from application import get_logger
+from domain.density_map import DensityMap
 from domain.driver import Driver
+from domain.trajectory import Trajectory
 from ftgo_utils.errors import ErrorCodes, BaseError
 
 class TrackerService:
@@ -16,3 +18,55 @@ class TrackerService:
 
         nearest_drivers = await Driver.get_nearest_drivers(latitude=latitude, longitude=longitude, radius_m=radius, max_driver_count=max_count)
         return {"drivers": nearest_drivers}
+
+    @staticmethod
+    async def get_nearest_drivers_many(locations: List[Dict[str, Any]], radius: float, max_count: int, **kwargs) -> Dict[str, Any]:
+        points = []
+        for location in locations:
+            latitude = location.get('latitude')
+            longitude = location.get('longitude')
+            if latitude is None or longitude is None:
+                raise BaseError(
+                    error_code=ErrorCodes.INVALID_LOCATION_ERROR,
+                    payload={"location": location},
+                )
+            points.append((latitude, longitude))
+
+        nearest_drivers = await Driver.get_nearest_drivers_many(points, radius_m=radius, max_driver_count=max_count)
+        return {"results": [{"drivers": drivers} for drivers in nearest_drivers]}
+
+    @staticmethod
+    async def get_driver_trajectory(
+        driver_id: str,
+        start_time: float,
+        end_time: float,
+        max_points: Optional[int] = None,
+        method: Optional[str] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        trajectory = Trajectory(
+            driver_id=driver_id,
+            start_time=start_time,
+            end_time=end_time,
+            max_points=max_points,
+            method=method,
+        )
+        return await trajectory.load()
+
+    @staticmethod
+    async def get_density_heatmap(
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        resolution: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        density_map = DensityMap(
+            min_latitude=min_latitude,
+            min_longitude=min_longitude,
+            max_latitude=max_latitude,
+            max_longitude=max_longitude,
+            resolution=resolution,
+        )
+        return await density_map.load()
@@ -6,3 +6,11 @@ from config.enums import LayerNames
 from config.status import DriverStatusConfig
 from config.hexagon import HexagonConfig
 from config.location import LocationConfig
+from config.metrics import MetricsConfig
+from config.spatial_index import SpatialIndexConfig
+from config.write_buffer import WriteBufferConfig
+from config.partition import PartitionConfig
+from config.trajectory import TrajectoryConfig
+from config.reporting import ReportingCadenceConfig
+from config.archive import ArchiveConfig
+from config.presence import PresenceConfig
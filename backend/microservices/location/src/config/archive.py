@@ -0,0 +1,18 @@
+from config.base import BaseConfig, env_var
+
+class ArchiveConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        path: str = None,
+        export_batch_size: int = None,
+        row_group_size: int = None,
+        compression: str = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "LOCATION_ARCHIVE_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.path = path or env_var("LOCATION_ARCHIVE_PATH", default="archive/driver_location", cast_type=str)
+        self.export_batch_size = export_batch_size or env_var("LOCATION_ARCHIVE_EXPORT_BATCH_SIZE", default=50_000, cast_type=int)
+        self.row_group_size = row_group_size or env_var("LOCATION_ARCHIVE_ROW_GROUP_SIZE", default=100_000, cast_type=int)
+        self.compression = compression or env_var("LOCATION_ARCHIVE_COMPRESSION", default="zstd", cast_type=str)
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from config.base import BaseConfig, env_var
 
 class RedisConfig(BaseConfig):
@@ -8,9 +10,27 @@ class RedisConfig(BaseConfig):
         db: int = None,
         default_ttl: int = None,
         password: str = None,
+        shards: List[str] = None,
+        shard_virtual_nodes: int = None,
+        shard_resolution: int = None,
     ):
         self.host = host or env_var("REDIS_HOST", "localhost")
         self.port = port or env_var("REDIS_PORT", 6300, int)
         self.db = db or env_var("REDIS_DB", 0, int)
         self.default_ttl = default_ttl or env_var("REDIS_DEFAULT_TTL", 600, int)
         self.password = password or env_var("REDIS_PASSWORD", "location_password")
+        # Comma-separated host:port/db endpoints; empty keeps the single host/port/db instance.
+        self.shards = shards or env_var("REDIS_SHARDS", "", lambda s: [endpoint.strip() for endpoint in str(s).split(",") if endpoint.strip()])
+        self.shard_virtual_nodes = shard_virtual_nodes or env_var("REDIS_SHARD_VIRTUAL_NODES", 128, int)
+        # Cell keys are routed by their parent at this H3 resolution, so a region stays on one shard.
+        self.shard_resolution = shard_resolution or env_var("REDIS_SHARD_RESOLUTION", 5, int)
+
+    def shard_endpoints(self) -> List[Tuple[str, int, int]]:
+        if not self.shards:
+            return [(self.host, self.port, self.db)]
+        endpoints = []
+        for shard in self.shards:
+            address, _, db = shard.partition("/")
+            host, _, port = address.partition(":")
+            endpoints.append((host, int(port or self.port), int(db or self.db)))
+        return endpoints
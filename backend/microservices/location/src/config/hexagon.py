@@ -1,3 +1,5 @@
+from typing import List
+
 from config.base import BaseConfig, env_var
 
 class HexagonConfig(BaseConfig):
@@ -9,6 +11,16 @@ class HexagonConfig(BaseConfig):
         driver_hexagon_cache_ttl: int = None,
         hexagon_resolution: int = None,
         k_ring_radius: int = None,
+        available_drivers_cache_key: str = None,
+        last_seen_cache_key: str = None,
+        freshness_s: int = None,
+        sweep_interval_s: int = None,
+        sweep_batch_size: int = None,
+        hexagon_resolutions: List[int] = None,
+        max_query_cells: int = None,
+        density_cache_key: str = None,
+        density_reconcile_interval_s: int = None,
+        heatmap_max_cells: int = None,
     ):
         self.cache_key = cache_key or env_var("HEXAGONS_CACHE_KEY", default="hexagons_cache", cast_type=str)
         self.cache_ttl = cache_ttl or env_var("HEXAGONS_CACHE_TTL", default=10 * 60, cast_type=int)
@@ -16,3 +28,14 @@ class HexagonConfig(BaseConfig):
         self.driver_hexagon_cache_ttl = driver_hexagon_cache_ttl or env_var("DRIVER_HEXAGON_CACHE_TTL", default=10 * 60, cast_type=int)
         self.hexagon_resolution = hexagon_resolution or env_var("HEXAGON_RESOLUTION", default=8, cast_type=int)
         self.k_ring_radius = k_ring_radius or env_var("K_RING_RADIUS", default=1, cast_type=int)
+        self.available_drivers_cache_key = available_drivers_cache_key or env_var("HEXAGON_AVAILABLE_DRIVERS_CACHE_KEY", default="hexagon_available_drivers", cast_type=str)
+        self.last_seen_cache_key = last_seen_cache_key or env_var("HEXAGON_LAST_SEEN_CACHE_KEY", default="hexagon_last_seen", cast_type=str)
+        self.freshness_s = freshness_s or env_var("HEXAGON_DRIVER_FRESHNESS_S", default=60, cast_type=int)
+        self.sweep_interval_s = sweep_interval_s or env_var("HEXAGON_SWEEP_INTERVAL_S", default=30, cast_type=int)
+        self.sweep_batch_size = sweep_batch_size or env_var("HEXAGON_SWEEP_BATCH_SIZE", default=500, cast_type=int)
+        # Coarser resolutions indexed alongside hexagon_resolution, as parents of the driver's cell.
+        self.hexagon_resolutions = hexagon_resolutions or env_var("HEXAGON_RESOLUTIONS", default="8,7,6", cast_type=lambda s: [int(resolution) for resolution in str(s).split(",")])
+        self.max_query_cells = max_query_cells or env_var("HEXAGON_MAX_QUERY_CELLS", default=37, cast_type=int)
+        self.density_cache_key = density_cache_key or env_var("HEXAGON_DENSITY_CACHE_KEY", default="hexagon_density", cast_type=str)
+        self.density_reconcile_interval_s = density_reconcile_interval_s or env_var("HEXAGON_DENSITY_RECONCILE_INTERVAL_S", default=5 * 60, cast_type=int)
+        self.heatmap_max_cells = heatmap_max_cells or env_var("HEXAGON_HEATMAP_MAX_CELLS", default=2000, cast_type=int)
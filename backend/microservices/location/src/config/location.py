@@ -10,6 +10,11 @@ class LocationConfig(BaseConfig):
         maximum_speed_threshold_m: int = None,
         keep_last_locations_count: int = None,
         maximum_location_to_store_per_driver: int = None,
+        thinning_enabled: bool = None,
+        thinning_min_distance_m: float = None,
+        thinning_min_interval_s: float = None,
+        province_cell_size_deg: float = None,
+        province_cache_size: int = None,
     ):
         self.cache_key = cache_key or env_var("LOCATIONS_CACHE_KEY", default="locations_cache", cast_type=str)
         self.cache_ttl = cache_ttl or env_var("LOCATIONS_CACHE_TTL", default=10 * 60, cast_type=int)
@@ -18,3 +23,10 @@ class LocationConfig(BaseConfig):
         self.maximum_speed_threshold_m = maximum_speed_threshold_m or env_var("MAXIMUM_SPEED_THRESHOLD_M", default=150, cast_type=int)
         self.keep_last_locations_count = keep_last_locations_count or env_var("KEEP_LAST_LOCATIONS_COUNT", default=5, cast_type=int)
         self.maximum_location_to_store_per_driver = maximum_location_to_store_per_driver or env_var("MAXIMUM_LOCATION_TO_STORE_PER_DRIVER", default=20, cast_type=int)
+        self.thinning_enabled = thinning_enabled if thinning_enabled is not None else env_var(
+            "LOCATION_THINNING_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.thinning_min_distance_m = thinning_min_distance_m or env_var("LOCATION_THINNING_MIN_DISTANCE_M", default=10, cast_type=float)
+        self.thinning_min_interval_s = thinning_min_interval_s or env_var("LOCATION_THINNING_MIN_INTERVAL_S", default=30, cast_type=float)
+        self.province_cell_size_deg = province_cell_size_deg or env_var("LOCATION_PROVINCE_CELL_SIZE_DEG", default=0.02, cast_type=float)
+        self.province_cache_size = province_cache_size or env_var("LOCATION_PROVINCE_CACHE_SIZE", default=100_000, cast_type=int)
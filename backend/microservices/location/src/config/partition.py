@@ -0,0 +1,20 @@
+from config.base import BaseConfig, env_var
+
+class PartitionConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        precreate_days: int = None,
+        retention_days: int = None,
+        detach_expired: bool = None,
+        precreate_interval_s: int = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "LOCATION_PARTITION_MAINTENANCE_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.precreate_days = precreate_days or env_var("LOCATION_PARTITION_PRECREATE_DAYS", default=7, cast_type=int)
+        self.retention_days = retention_days or env_var("LOCATION_RETENTION_DAYS", default=30, cast_type=int)
+        self.detach_expired = detach_expired if detach_expired is not None else env_var(
+            "LOCATION_PARTITION_DETACH_EXPIRED", default=False, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.precreate_interval_s = precreate_interval_s or env_var("LOCATION_PARTITION_PRECREATE_INTERVAL_S", default=60 * 60, cast_type=int)
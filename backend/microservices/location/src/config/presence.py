@@ -0,0 +1,18 @@
+from config.base import BaseConfig, env_var
+
+class PresenceConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        stream_key: str = None,
+        stream_maxlen: int = None,
+        read_block_ms: int = None,
+        read_batch_size: int = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "PRESENCE_FEED_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.stream_key = stream_key or env_var("PRESENCE_STREAM_KEY", default="driver_presence", cast_type=str)
+        self.stream_maxlen = stream_maxlen or env_var("PRESENCE_STREAM_MAXLEN", default=1_000_000, cast_type=int)
+        self.read_block_ms = read_block_ms or env_var("PRESENCE_READ_BLOCK_MS", default=1000, cast_type=int)
+        self.read_batch_size = read_batch_size or env_var("PRESENCE_READ_BATCH_SIZE", default=500, cast_type=int)
@@ -0,0 +1,18 @@
+from config.base import BaseConfig, env_var
+
+class ReportingCadenceConfig(BaseConfig):
+    def __init__(
+        self,
+        min_interval_s: float = None,
+        available_max_interval_s: float = None,
+        delivery_max_interval_s: float = None,
+        available_spacing_m: float = None,
+        delivery_spacing_m: float = None,
+        stationary_speed_mps: float = None,
+    ):
+        self.min_interval_s = min_interval_s or env_var("REPORT_MIN_INTERVAL_S", default=2, cast_type=float)
+        self.available_max_interval_s = available_max_interval_s or env_var("REPORT_AVAILABLE_MAX_INTERVAL_S", default=30, cast_type=float)
+        self.delivery_max_interval_s = delivery_max_interval_s or env_var("REPORT_DELIVERY_MAX_INTERVAL_S", default=10, cast_type=float)
+        self.available_spacing_m = available_spacing_m or env_var("REPORT_AVAILABLE_SPACING_M", default=150, cast_type=float)
+        self.delivery_spacing_m = delivery_spacing_m or env_var("REPORT_DELIVERY_SPACING_M", default=50, cast_type=float)
+        self.stationary_speed_mps = stationary_speed_mps or env_var("REPORT_STATIONARY_SPEED_MPS", default=0.5, cast_type=float)
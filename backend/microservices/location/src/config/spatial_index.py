@@ -0,0 +1,20 @@
+from config.base import BaseConfig, env_var
+
+class SpatialIndexConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        change_stream_key: str = None,
+        change_stream_maxlen: int = None,
+        read_block_ms: int = None,
+        read_batch_size: int = None,
+        max_staleness_s: float = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "SPATIAL_INDEX_REPLICA_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.change_stream_key = change_stream_key or env_var("HEXAGON_CHANGE_STREAM_KEY", default="hexagon_changes", cast_type=str)
+        self.change_stream_maxlen = change_stream_maxlen or env_var("HEXAGON_CHANGE_STREAM_MAXLEN", default=100_000, cast_type=int)
+        self.read_block_ms = read_block_ms or env_var("SPATIAL_INDEX_READ_BLOCK_MS", default=1000, cast_type=int)
+        self.read_batch_size = read_batch_size or env_var("SPATIAL_INDEX_READ_BATCH_SIZE", default=1000, cast_type=int)
+        self.max_staleness_s = max_staleness_s or env_var("SPATIAL_INDEX_MAX_STALENESS_S", default=5, cast_type=float)
@@ -0,0 +1,14 @@
+from config.base import BaseConfig, env_var
+
+class TrajectoryConfig(BaseConfig):
+    def __init__(
+        self,
+        max_window_s: int = None,
+        default_max_points: int = None,
+        max_points_limit: int = None,
+        fetch_batch_size: int = None,
+    ):
+        self.max_window_s = max_window_s or env_var("TRAJECTORY_MAX_WINDOW_S", default=7 * 24 * 60 * 60, cast_type=int)
+        self.default_max_points = default_max_points or env_var("TRAJECTORY_DEFAULT_MAX_POINTS", default=500, cast_type=int)
+        self.max_points_limit = max_points_limit or env_var("TRAJECTORY_MAX_POINTS_LIMIT", default=5000, cast_type=int)
+        self.fetch_batch_size = fetch_batch_size or env_var("TRAJECTORY_FETCH_BATCH_SIZE", default=2000, cast_type=int)
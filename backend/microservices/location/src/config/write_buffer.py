@@ -0,0 +1,16 @@
+from config.base import BaseConfig, env_var
+
+class WriteBufferConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        flush_interval_ms: int = None,
+        flush_batch_size: int = None,
+        max_buffered_rows: int = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "LOCATION_WRITE_BUFFER_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.flush_interval_ms = flush_interval_ms or env_var("LOCATION_WRITE_BUFFER_FLUSH_INTERVAL_MS", default=500, cast_type=int)
+        self.flush_batch_size = flush_batch_size or env_var("LOCATION_WRITE_BUFFER_FLUSH_BATCH_SIZE", default=1000, cast_type=int)
+        self.max_buffered_rows = max_buffered_rows or env_var("LOCATION_WRITE_BUFFER_MAX_ROWS", default=20000, cast_type=int)
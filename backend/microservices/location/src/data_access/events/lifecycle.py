@@ -5,6 +5,11 @@ from rabbitmq_rpc import RPCClient
 
 from data_access.repository.cache_repository import CacheRepository
 from data_access.repository.db_repository import DatabaseRepository
+from data_access.repository.spatial_index_replica import SpatialIndexReplica
+from data_access.repository.hexagon_sweeper import HexagonSweeper
+from data_access.repository.hexagon_density_reconciler import HexagonDensityReconciler
+from data_access.repository.location_write_buffer import LocationWriteBuffer
+from data_access.repository.location_partitions import LocationPartitions
 from data_access.broker import RPCBroker
 
 from config import BaseConfig
@@ -14,17 +19,39 @@ async def setup() -> None:
     logger = get_logger()
     await CacheRepository.initialize()
     logger.info("Connected to Redis")
+    await SpatialIndexReplica.initialize()
+    logger.info("Started spatial index replica")
+    await HexagonSweeper.initialize()
+    logger.info("Started hexagon sweeper")
+    await HexagonDensityReconciler.initialize()
+    logger.info("Started hexagon density reconciliation")
     await DatabaseRepository.initialize()
     logger.info("Connected to PostgreSQL")
+    await LocationPartitions.initialize()
+    logger.info("Started location partition creation")
+    await LocationWriteBuffer.initialize()
+    logger.info("Started location write buffer")
     await RPCBroker.initialize(asyncio.get_event_loop())
     logger.info("Connected to RabbitMQ")
 
 
 async def teardown() -> None:
+    # Stop taking requests first so nothing enqueues after the write buffer drains, and keep
+    # PostgreSQL and Redis open until every buffered point and background task has finished.
     logger = get_logger()
-    await CacheRepository.terminate()
-    logger.info("Disconnected from Redis")
+    await RPCBroker.terminate()
+    logger.info("Disconnected from RabbitMQ")
+    await LocationWriteBuffer.terminate()
+    logger.info("Flushed location write buffer")
+    await SpatialIndexReplica.terminate()
+    logger.info("Stopped spatial index replica")
+    await HexagonSweeper.terminate()
+    logger.info("Stopped hexagon sweeper")
+    await HexagonDensityReconciler.terminate()
+    logger.info("Stopped hexagon density reconciliation")
+    await LocationPartitions.terminate()
+    logger.info("Stopped location partition creation")
     await DatabaseRepository.terminate()
     logger.info("Disconnected from PostgreSQL")
-    await RPCBroker.terminate()
-    logger.info("Disconnected from RabbitMQ")
\ No newline at end of file
+    await CacheRepository.terminate()
+    logger.info("Disconnected from Redis")
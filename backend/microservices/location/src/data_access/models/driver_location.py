@@ -1,6 +1,6 @@
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import String, DateTime, Float
+from sqlalchemy import String, DateTime, Float, Index, text
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.sql import func
 
@@ -10,6 +10,11 @@ from ftgo_utils.uuid_gen import uuid4
 
 class DriverLocation(Base):
     __tablename__ = "driver_location"
+    __table_args__ = (
+        Index("ix_driver_location_driver_id_timestamp", "driver_id", text("timestamp DESC")),
+        Index("ix_driver_location_timestamp_brin", "timestamp", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     driver_id: Mapped[str] = mapped_column(String, nullable=False)
 
@@ -20,7 +25,8 @@ class DriverLocation(Base):
     speed: Mapped[Optional[float]] = mapped_column(Float(precision=32), nullable=True)
     bearing: Mapped[Optional[float]] = mapped_column(Float(precision=32), nullable=True)
 
-    timestamp: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Part of the primary key because every unique constraint on a partitioned table must include the partition key.
+    timestamp: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True, nullable=False)
 
     @classmethod
     def from_dto(cls, dto: 'DriverLocationDTO') -> 'DriverLocation':
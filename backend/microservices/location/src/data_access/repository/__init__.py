@@ -1,2 +1,9 @@
 from data_access.repository.cache_repository import CacheRepository
 from data_access.repository.db_repository import DatabaseRepository
+from data_access.repository.spatial_index_replica import SpatialIndexReplica
+from data_access.repository.location_write_buffer import LocationWriteBuffer
+from data_access.repository.location_archive import LocationArchive
+from data_access.repository.location_partitions import LocationPartitions
+from data_access.repository.hexagon_density_reconciler import HexagonDensityReconciler
+from data_access.repository.hexagon_sweeper import HexagonSweeper
+from data_access.repository.presence_feed import PresenceFeed, PresenceConsumer
@@ -1,34 +1,112 @@
+import asyncio
 import json
-from typing import List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
+import h3
 from aredis_client import AsyncRedis
-from ftgo_utils.errors import ErrorCodes
+from ftgo_utils.errors import BaseError, ErrorCodes
+from redis.exceptions import WatchError
 
 from config import RedisConfig
 from data_access import get_logger
 from data_access.repository.base import BaseRepository
+from data_access.repository.hash_ring import HashRing
 from utils import handle_exception
+from utils.metrics import CACHE_WATCH_CONFLICTS
 
 
 class CacheRepository(BaseRepository):
+    # With several shards configured, every key is routed through a consistent hash ring: cell keys
+    # by their coarse H3 parent and everything else (driver ids, stream names) by the key itself.
+    # Batched operations are split per shard and the shard pipelines run concurrently.
     _data_access: Optional[AsyncRedis] = None
+    _shards: List[AsyncRedis] = []
+    _ring: Optional[HashRing] = None
+    _shard_resolution: int = 5
     _group: str = ""
+    _group_views: Dict[str, Type["CacheRepository"]] = {}
 
     @classmethod
     async def initialize(cls) -> None:
         cache_config = RedisConfig()
         try:
-            cls._data_access = await AsyncRedis.create(
-                host=cache_config.host,
-                port=cache_config.port,
-                db=cache_config.db,
-                password=cache_config.password,
+            endpoints = cache_config.shard_endpoints()
+            connections = [
+                await AsyncRedis.create(host=host, port=port, db=db, password=cache_config.password)
+                for host, port, db in endpoints
+            ]
+            cls.use_shards(
+                connections,
+                names=[f"{host}:{port}/{db}" for host, port, db in endpoints],
+                virtual_nodes=cache_config.shard_virtual_nodes,
+                shard_resolution=cache_config.shard_resolution,
             )
         except Exception as e:
             payload = cache_config.dict()
             get_logger().error(ErrorCodes.CACHE_CONNECTION_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.CACHE_CONNECTION_ERROR, payload=payload)
 
+    @classmethod
+    def use_shards(
+        cls,
+        connections: List[AsyncRedis],
+        names: Optional[List[str]] = None,
+        virtual_nodes: int = 128,
+        shard_resolution: Optional[int] = None,
+    ) -> None:
+        # Ring positions come from the names, so they must stay stable across restarts.
+        cls._data_access = connections[0]
+        cls._shards = list(connections) if len(connections) > 1 else []
+        cls._ring = HashRing(names or [str(index) for index in range(len(connections))], virtual_nodes) if cls._shards else None
+        if shard_resolution is not None:
+            cls._shard_resolution = shard_resolution
+
+    @classmethod
+    def shard_key(cls, key: str) -> str:
+        if h3.is_valid_cell(key) and h3.get_resolution(key) > cls._shard_resolution:
+            return h3.cell_to_parent(key, cls._shard_resolution)
+        return key
+
+    @classmethod
+    def _connections(cls) -> List[AsyncRedis]:
+        return cls._shards or [cls._data_access]
+
+    @classmethod
+    def _connection_for(cls, prefixed_key: str) -> AsyncRedis:
+        if not cls._shards:
+            return cls._data_access
+        return cls._shards[cls._shard_index(prefixed_key)]
+
+    @classmethod
+    def _shard_index(cls, prefixed_key: str) -> int:
+        return cls._ring.node_index(cls.shard_key(prefixed_key.split(":", 1)[-1]))
+
+    @classmethod
+    async def _pipeline(cls, commands: List[Tuple[str, str, tuple, dict]]) -> List[Any]:
+        # Raw results in command order. Each shard's share runs as one transactional pipeline, so
+        # commands are atomic together only when they land on the same shard.
+        async def run(connection: AsyncRedis, to_run: List[Tuple[str, str, tuple, dict]]) -> List[Any]:
+            async with connection.get_or_create_session() as session:
+                pipeline = session.pipeline()
+                for name, key, args, kwargs in to_run:
+                    getattr(pipeline, name)(key, *args, **kwargs)
+                return await pipeline.execute()
+
+        if not cls._shards:
+            return await run(cls._data_access, commands)
+        positions: Dict[int, List[int]] = {}
+        for position, (_, key, _, _) in enumerate(commands):
+            positions.setdefault(cls._shard_index(key), []).append(position)
+        shard_results = await asyncio.gather(*(
+            run(cls._shards[shard], [commands[position] for position in shard_positions])
+            for shard, shard_positions in positions.items()
+        ))
+        values = [None] * len(commands)
+        for shard_positions, results in zip(positions.values(), shard_results):
+            for position, value in zip(shard_positions, results):
+                values[position] = value
+        return values
+
     @classmethod
     async def fetch(
         cls,
@@ -41,41 +119,39 @@ class CacheRepository(BaseRepository):
             to_fetch_keys = [keys] if single_fetch else keys
             to_fetch_fields = [fields] if isinstance(fields, str) else fields
             
-            async with cls._data_access.get_or_create_session() as session:
-                pipeline = session.pipeline()
-                
-                if data_type == "hash":
-                    if to_fetch_fields:  # Fetch specific fields
-                        for key, field in zip(to_fetch_keys, to_fetch_fields):
-                            pipeline.hget(cls._prefixed_key(key), field)
-                    else:  # Fetch entire hash
-                        for key in to_fetch_keys:
-                            pipeline.hgetall(cls._prefixed_key(key))
-                elif data_type == "list":
-                    for key in to_fetch_keys:
-                        pipeline.lrange(cls._prefixed_key(key), 0, -1)
-                else:  # Default to string
-                    for key in to_fetch_keys:
-                        pipeline.get(cls._prefixed_key(key))
-                
-                values = await pipeline.execute()
-                
-                if data_type == "hash":
-                    deserialized_values = []
-                    for value_dict in values:
-                        if value_dict:
-                            deserialized_dict = {key: cls._deserialize_value(value) if value else None for key, value in value_dict.items()}
-                            deserialized_values.append(deserialized_dict)
-                        else:
-                            deserialized_values.append(None)
-                else:
-                    deserialized_values = [
-                        cls._deserialize_value(value) if value else None
-                        for value in values
-                    ]
-                
-                return deserialized_values[0] if single_fetch else deserialized_values
-            
+            if data_type == "hash":
+                if to_fetch_fields:  # Fetch specific fields
+                    commands = [("hget", cls._prefixed_key(key), (field,), {}) for key, field in zip(to_fetch_keys, to_fetch_fields)]
+                else:  # Fetch entire hash
+                    commands = [("hgetall", cls._prefixed_key(key), (), {}) for key in to_fetch_keys]
+            elif data_type == "list":
+                commands = [("lrange", cls._prefixed_key(key), (0, -1), {}) for key in to_fetch_keys]
+            elif data_type == "set":
+                commands = [("smembers", cls._prefixed_key(key), (), {}) for key in to_fetch_keys]
+            else:  # Default to string
+                commands = [("get", cls._prefixed_key(key), (), {}) for key in to_fetch_keys]
+
+            values = await cls._pipeline(commands)
+
+            if data_type == "hash":
+                deserialized_values = []
+                for value_dict in values:
+                    if value_dict:
+                        deserialized_dict = {key: cls._deserialize_value(value) if value else None for key, value in value_dict.items()}
+                        deserialized_values.append(deserialized_dict)
+                    else:
+                        deserialized_values.append(None)
+            elif data_type == "set":
+                deserialized_values = [set(value) if value else set() for value in values]
+            else:
+                deserialized_values = [
+                    cls._deserialize_value(value) if value else None
+                    for value in values
+                ]
+
+            return deserialized_values[0] if single_fetch else deserialized_values
+
+
         except Exception as e:
             payload = {"keys": keys, "fields": fields}
             get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
@@ -103,18 +179,17 @@ class CacheRepository(BaseRepository):
         if len(to_insert_keys) != len(to_insert_values):
             raise ValueError("Keys and values must have the same length")
         try:
-            async with cls._data_access.get_or_create_session() as session:
-                pipeline = session.pipeline()
-                for key, value in zip(to_insert_keys, to_insert_values):
-                    if data_type == "hash" and isinstance(value, dict):
-                        for field, val in value.items():
-                            pipeline.hset(cls._prefixed_key(key), field, cls._serialize_value(val))
-                    elif data_type == "list" and isinstance(value, list):
-                        for item in value:
-                            pipeline.rpush(cls._prefixed_key(key), cls._serialize_value(item))
-                    else:
-                        pipeline.set(cls._prefixed_key(key), cls._serialize_value(value), ex=ttl)
-                await pipeline.execute()
+            commands = []
+            for key, value in zip(to_insert_keys, to_insert_values):
+                if data_type == "hash" and isinstance(value, dict):
+                    for field, val in value.items():
+                        commands.append(("hset", cls._prefixed_key(key), (field, cls._serialize_value(val)), {}))
+                elif data_type == "list" and isinstance(value, list):
+                    for item in value:
+                        commands.append(("rpush", cls._prefixed_key(key), (cls._serialize_value(item),), {}))
+                else:
+                    commands.append(("set", cls._prefixed_key(key), (cls._serialize_value(value),), {"ex": ttl}))
+            await cls._pipeline(commands)
         except Exception as e:
             payload = {"keys": keys, "values": values, "ttl": ttl}
             get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
@@ -129,19 +204,12 @@ class CacheRepository(BaseRepository):
     ) -> None:
         try:
             to_delete_keys = [keys] if isinstance(keys, str) else keys
-            async with cls._data_access.get_or_create_session() as session:
-                pipeline = session.pipeline()
-                if data_type == "hash" and fields:
-                    for key in to_delete_keys:
-                        if isinstance(fields, str):
-                            fields_to_delete = [fields]
-                        else:
-                            fields_to_delete = fields
-                        pipeline.hdel(cls._prefixed_key(key), *fields_to_delete)
-                else:
-                    for key in to_delete_keys:
-                        pipeline.delete(cls._prefixed_key(key))
-                await pipeline.execute()
+            if data_type == "hash" and fields:
+                fields_to_delete = tuple([fields] if isinstance(fields, str) else fields)
+                commands = [("hdel", cls._prefixed_key(key), fields_to_delete, {}) for key in to_delete_keys]
+            else:
+                commands = [("delete", cls._prefixed_key(key), (), {}) for key in to_delete_keys]
+            await cls._pipeline(commands)
         except Exception as e:
             payload = {"keys": keys, "fields": fields}
             get_logger().error(ErrorCodes.CACHE_DELETE_ERROR.value, payload=payload)
@@ -152,30 +220,198 @@ class CacheRepository(BaseRepository):
     async def expire(cls, keys: Union[str, List[str]], ttl: int) -> None:
         to_expire_keys = [keys] if isinstance(keys, str) else keys
         try:
-            async with cls._data_access.get_or_create_session() as session:
-                pipeline = session.pipeline()
-                for key in to_expire_keys:
-                    pipeline.expire(cls._prefixed_key(key), ttl)
-                await pipeline.execute()
+            await cls._pipeline([("expire", cls._prefixed_key(key), (ttl,), {}) for key in to_expire_keys])
         except Exception as e:
             payload = {"keys": keys, "ttl": ttl}
             get_logger().error(ErrorCodes.CACHE_EXPIRE_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.CACHE_EXPIRE_ERROR, payload=payload)
 
+    @classmethod
+    def command(cls, name: str, key: str, *args, **kwargs) -> Tuple[str, str, tuple, dict]:
+        return name, cls._prefixed_key(key), tuple(cls._serialize_value(arg) for arg in args), kwargs
+
+    @classmethod
+    async def execute(cls, commands: List[Optional[Tuple[str, str, tuple, dict]]]) -> List[Any]:
+        # Runs commands built by `command` (possibly from different groups) in one transactional
+        # pipeline per shard.
+        to_execute = [command for command in commands if command is not None]
+        try:
+            values = await cls._pipeline(to_execute)
+            return [cls._deserialize_value(value) if isinstance(value, str) else value for value in values]
+        except Exception as e:
+            payload = {"commands": [(name, key) for name, key, _, _ in to_execute]}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
+    @classmethod
+    async def execute_watched(
+        cls,
+        reads: List[Tuple[str, str, tuple, dict]],
+        build: Callable[[List[Any]], List[Optional[Tuple[str, str, tuple, dict]]]],
+        retries: int = 10,
+    ) -> List[Any]:
+        # Optimistic read-modify-write: the keys of `reads` are WATCHed before they are read, and the
+        # commands `build` derives from the values run in one MULTI on that connection. A concurrent
+        # change to a watched key aborts EXEC and the round is repeated with fresh values, so `build`
+        # may run more than once. Reads must share a shard; writes routed to other shards are sent
+        # once EXEC went through. Returns the values of the round that committed.
+        connection = cls._connection_for(reads[0][1])
+        try:
+            for _ in range(retries):
+                async with connection.get_or_create_session() as session:
+                    pipeline = session.pipeline()
+                    try:
+                        await pipeline.watch(*(key for _, key, _, _ in reads))
+                        values = await cls.execute(reads)
+                        writes = [command for command in build(values) if command is not None]
+                        local = [command for command in writes if cls._connection_for(command[1]) is connection]
+                        remote = [command for command in writes if cls._connection_for(command[1]) is not connection]
+                        pipeline.multi()
+                        for name, key, args, kwargs in local:
+                            getattr(pipeline, name)(key, *args, **kwargs)
+                        await pipeline.execute()
+                    except WatchError:
+                        CACHE_WATCH_CONFLICTS.inc()
+                        continue
+                    finally:
+                        await pipeline.reset()
+                if remote:
+                    await cls._pipeline(remote)
+                return values
+            raise BaseError(
+                error_code=ErrorCodes.CACHE_INSERT_ERROR,
+                message=f"watched keys kept changing over {retries} attempts",
+            )
+        except Exception as e:
+            payload = {"keys": [key for _, key, _, _ in reads]}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
+    @classmethod
+    async def scan_keys(cls, pattern: str = "*", count: int = 1000) -> List[str]:
+        try:
+            prefix = cls._prefixed_key("")
+
+            async def scan(connection: AsyncRedis) -> List[str]:
+                async with connection.get_or_create_session() as session:
+                    return [key async for key in session.scan_iter(match=f"{prefix}{pattern}", count=count)]
+
+            shard_keys = await asyncio.gather(*(scan(connection) for connection in cls._connections()))
+            return [key[len(prefix):] for keys in shard_keys for key in keys]
+        except Exception as e:
+            payload = {"group": cls._group, "pattern": pattern}
+            get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_FETCH_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_add(cls, key: str, fields: Dict[str, Any], maxlen: Optional[int] = None) -> str:
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                return await session.xadd(stream_key, fields, maxlen=maxlen, approximate=True)
+        except Exception as e:
+            payload = {"key": key, "fields": fields}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_read(
+        cls,
+        key: str,
+        last_id: str,
+        count: Optional[int] = None,
+        block_ms: Optional[int] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                response = await session.xread({stream_key: last_id}, count=count, block=block_ms)
+            return [entry for _, entries in response or [] for entry in entries]
+        except Exception as e:
+            payload = {"key": key, "last_id": last_id}
+            get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_FETCH_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_last_id(cls, key: str) -> str:
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                entries = await session.xrevrange(stream_key, count=1)
+            return entries[0][0] if entries else "0-0"
+        except Exception as e:
+            payload = {"key": key}
+            get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_FETCH_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_create_group(cls, key: str, group: str, start_id: str = "$") -> bool:
+        # Returns False when the group already exists, which keeps its stored offset.
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                await session.xgroup_create(stream_key, group, id=start_id, mkstream=True)
+            return True
+        except Exception as e:
+            if "BUSYGROUP" in str(e):
+                return False
+            payload = {"key": key, "group": group}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_read_group(
+        cls,
+        key: str,
+        group: str,
+        consumer: str,
+        last_id: str = ">",
+        count: Optional[int] = None,
+        block_ms: Optional[int] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        # last_id ">" reads entries never delivered to the group; "0" re-reads this consumer's
+        # delivered but unacknowledged ones.
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                response = await session.xreadgroup(group, consumer, {stream_key: last_id}, count=count, block=block_ms)
+            return [entry for _, entries in response or [] for entry in entries]
+        except Exception as e:
+            payload = {"key": key, "group": group, "consumer": consumer}
+            get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_FETCH_ERROR, payload=payload)
+
+    @classmethod
+    async def stream_ack(cls, key: str, group: str, entry_ids: List[str]) -> int:
+        if not entry_ids:
+            return 0
+        stream_key = cls._prefixed_key(key)
+        try:
+            async with cls._connection_for(stream_key).get_or_create_session() as session:
+                return await session.xack(stream_key, group, *entry_ids)
+        except Exception as e:
+            payload = {"key": key, "group": group, "entry_ids": entry_ids}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
     @classmethod
     async def flush(cls) -> None:
         try:
-            async with cls._data_access.get_or_create_session() as session:
-                await session.flushdb()
+            for connection in cls._connections():
+                async with connection.get_or_create_session() as session:
+                    await session.flushdb()
         except Exception as e:
             get_logger().error(ErrorCodes.CACHE_FLUSH_ERROR.value)
             await handle_exception(e=e, error_code=ErrorCodes.CACHE_FLUSH_ERROR)
 
     @classmethod
     async def terminate(cls) -> None:
-        if cls._data_access:
-            await cls._data_access.disconnect()
-            cls._data_access = None
+        for connection in cls._connections():
+            if connection:
+                await connection.disconnect()
+        cls._data_access = None
+        cls._shards = []
+        cls._ring = None
 
     @classmethod
     def _prefixed_key(cls, key: str) -> str:
@@ -194,5 +430,9 @@ class CacheRepository(BaseRepository):
 
     @classmethod
     def get_cache(cls, group: str = "") -> "CacheRepository":
-        cls._group = group
-        return cls
+        # Each group gets its own subclass so concurrent callers never share a mutable prefix.
+        view = cls._group_views.get(group)
+        if view is None:
+            view = type(cls.__name__, (cls,), {"_group": group})
+            cls._group_views[group] = view
+        return view
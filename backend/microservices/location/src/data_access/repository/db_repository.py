@@ -1,8 +1,10 @@
-from typing import Optional, List, Dict, Type, Union
+from typing import Any, AsyncIterator, Optional, List, Dict, Tuple, Type, Union
+from sqlalchemy import insert
 from sqlalchemy.future import select
 
 from asyncpg_client import AsyncPostgres
 from ftgo_utils.errors import ErrorCodes
+from ftgo_utils.uuid_gen import uuid4
 from config import PostgresConfig
 from data_access import get_logger
 from data_access.repository.base import BaseRepository
@@ -60,6 +62,41 @@ class DatabaseRepository(BaseRepository):
             get_logger().error(ErrorCodes.DB_FETCH_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.DB_FETCH_ERROR, payload=payload)
 
+    @classmethod
+    async def stream(
+        cls,
+        dto_class: Type[BaseDTO],
+        columns: List[str],
+        query: Dict[str, Union[str, int, float]],
+        range_query: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        order_by: Optional[Union[str, List[str]]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Tuple]:
+        # Reads plain column tuples through a server-side cursor, batch_size rows at a time,
+        # so long scans never build ORM instances or hold the whole result in memory.
+        # range_query maps a column to a (lower, upper) pair, lower inclusive, upper exclusive.
+        model_class = cls._get_model_class(dto_class)
+        statement = select(*[getattr(model_class, column) for column in columns]).filter_by(**query)
+        for column_name, (lower, upper) in (range_query or {}).items():
+            column = getattr(model_class, column_name)
+            if lower is not None:
+                statement = statement.where(column >= lower)
+            if upper is not None:
+                statement = statement.where(column < upper)
+        if order_by:
+            order_columns = [order_by] if isinstance(order_by, str) else order_by
+            statement = statement.order_by(*[getattr(model_class, column) for column in order_columns])
+        try:
+            async with cls._data_access.get_or_create_session() as session:
+                result = await session.stream(statement.execution_options(yield_per=batch_size))
+                async for partition in result.partitions():
+                    for row in partition:
+                        yield tuple(row)
+        except Exception as e:
+            payload = dict(model=model_class.__name__, query=query, columns=columns)
+            get_logger().error(ErrorCodes.DB_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.DB_FETCH_ERROR, payload=payload)
+
     @classmethod
     async def insert(cls, dto_instances: Union[List[BaseDTO], BaseDTO], **kwargs) -> Union[BaseDTO, List[BaseDTO], None]:
         if not dto_instances:
@@ -81,6 +118,29 @@ class DatabaseRepository(BaseRepository):
             get_logger().error(ErrorCodes.DB_INSERT_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.DB_INSERT_ERROR, payload=payload)
 
+    @classmethod
+    async def bulk_insert(cls, dto_instances: List[BaseDTO], **kwargs) -> int:
+        # Append-only path: one multi-row INSERT per call, without loading the rows back.
+        if not dto_instances:
+            return 0
+        model_class = cls._get_model_class(type(dto_instances[0]))
+        rows = []
+        for dto in dto_instances:
+            row = model_class.from_dto(dto).to_dict()
+            row.pop("created_at", None)
+            row.pop("updated_at", None)
+            row["id"] = row.get("id") or uuid4()
+            rows.append(row)
+        try:
+            async with cls._data_access.get_or_create_session() as session:
+                await session.execute(insert(model_class), rows)
+                await session.commit()
+                return len(rows)
+        except Exception as e:
+            payload = dict(model=model_class.__name__, rows=len(rows))
+            get_logger().error(ErrorCodes.DB_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.DB_INSERT_ERROR, payload=payload)
+
     @classmethod
     async def update(
         cls,
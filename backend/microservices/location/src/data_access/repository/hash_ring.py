@@ -0,0 +1,27 @@
+import bisect
+import hashlib
+from typing import List
+
+
+class HashRing:
+    # Consistent hash ring over shard names. Each shard owns virtual_nodes points on the ring, so
+    # adding or removing one shard only moves about 1/N of the keys.
+    def __init__(self, nodes: List[str], virtual_nodes: int = 128):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes = list(nodes)
+        points = sorted(
+            (self._hash(f"{node}#{replica}"), index)
+            for index, node in enumerate(self.nodes)
+            for replica in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [index for _, index in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    def node_index(self, key: str) -> int:
+        position = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[position]
@@ -0,0 +1,87 @@
+import asyncio
+from typing import List, Optional
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import HexagonConfig
+from data_access import get_logger
+from data_access.repository.cache_repository import CacheRepository
+from utils.metrics import HEXAGON_DENSITY_DRIFT_CELLS, HEXAGON_DENSITY_REPAIRS
+
+
+class HexagonDensityReconciler:
+    # Per-cell online/available counters are maintained incrementally by the write paths, which
+    # cannot see every membership change (sweeps, expiries, re-asserted availability). This job
+    # recounts cells from the hexagon hashes and available sets and rewrites the ones that drifted.
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def reconcile(cls, hex_ids: Optional[List[str]] = None) -> int:
+        config = HexagonConfig()
+        hexagon_cache = CacheRepository.get_cache(config.cache_key)
+        available_cache = CacheRepository.get_cache(config.available_drivers_cache_key)
+        density_cache = CacheRepository.get_cache(config.density_cache_key)
+        if hex_ids is None:
+            hex_ids = sorted(set(await hexagon_cache.scan_keys()) | set(await density_cache.scan_keys()))
+
+        drifted = 0
+        for start in range(0, len(hex_ids), config.sweep_batch_size):
+            batch = hex_ids[start:start + config.sweep_batch_size]
+            results = await CacheRepository.execute([
+                command
+                for hex_id in batch
+                for command in (
+                    hexagon_cache.command("hlen", hex_id),
+                    available_cache.command("scard", hex_id),
+                    density_cache.command("hgetall", hex_id),
+                )
+            ])
+            commands = []
+            for index, hex_id in enumerate(batch):
+                online, available, counters = results[3 * index:3 * index + 3]
+                counters = counters or {}
+                if int(counters.get("online") or 0) == online and int(counters.get("available") or 0) == available:
+                    continue
+                drifted += 1
+                # An increment landing between the two pipelines is lost until the next run.
+                if not online and not available:
+                    commands.append(density_cache.command("delete", hex_id))
+                    continue
+                commands.append(density_cache.command("hset", hex_id, "online", online))
+                commands.append(density_cache.command("hset", hex_id, "available", available))
+                commands.append(density_cache.command("expire", hex_id, config.cache_ttl))
+            if commands:
+                await CacheRepository.execute(commands)
+
+        HEXAGON_DENSITY_DRIFT_CELLS.set(drifted)
+        HEXAGON_DENSITY_REPAIRS.inc(drifted)
+        return drifted
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(HexagonConfig().density_reconcile_interval_s)
+            try:
+                drifted = await cls.reconcile()
+                if drifted:
+                    get_logger().info("Repaired hexagon density counters", payload={"cells": drifted})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload={"error": str(e)})
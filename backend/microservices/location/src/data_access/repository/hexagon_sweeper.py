@@ -0,0 +1,97 @@
+import asyncio
+import time
+from typing import Optional
+
+import h3
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import HexagonConfig
+from data_access import get_logger
+from data_access.repository.cache_repository import CacheRepository
+from data_access.repository.hexagon_density_reconciler import HexagonDensityReconciler
+from data_access.repository.spatial_index_replica import SpatialIndexReplica
+from utils.metrics import HEXAGON_GHOSTS_PRUNED, HEXAGON_SWEEP_CELLS, HEXAGON_SWEEP_GHOSTS
+
+
+class HexagonSweeper:
+    # Removes drivers that stopped reporting (crashed app, lost connectivity) from every
+    # hexagon structure once their last-seen score is older than HexagonConfig.cache_ttl.
+    # Queries already ignore them after freshness_s; this only reclaims the space.
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def sweep(cls, now: Optional[float] = None) -> int:
+        config = HexagonConfig()
+        cutoff = (now or time.time()) - config.cache_ttl
+        last_seen_cache = CacheRepository.get_cache(config.last_seen_cache_key)
+        hexagon_cache = CacheRepository.get_cache(config.cache_key)
+        available_cache = CacheRepository.get_cache(config.available_drivers_cache_key)
+
+        hex_ids = await last_seen_cache.scan_keys()
+        ghosts_found = set()
+        swept_cells = []
+        for start in range(0, len(hex_ids), config.sweep_batch_size):
+            batch = hex_ids[start:start + config.sweep_batch_size]
+            stale_members = await CacheRepository.execute([
+                last_seen_cache.command("zrangebyscore", hex_id, "-inf", cutoff) for hex_id in batch
+            ])
+            commands = []
+            for hex_id, ghosts in zip(batch, stale_members):
+                if not ghosts:
+                    continue
+                ghosts_found.update(ghosts)
+                swept_cells.append(hex_id)
+                # A ghost that reports again between the two pipelines loses its cell entry
+                # until its next report; the score range keeps its fresh last-seen intact.
+                commands.append(last_seen_cache.command("zremrangebyscore", hex_id, "-inf", cutoff))
+                commands.append(hexagon_cache.command("hdel", hex_id, *ghosts))
+                commands.append(available_cache.command("srem", hex_id, *ghosts))
+                # Coarser cells hold the same drivers; only the finest one is mirrored by the replica.
+                if h3.get_resolution(hex_id) == config.hexagon_resolution:
+                    commands.extend(
+                        SpatialIndexReplica.publish_command(
+                            SpatialIndexReplica.build_event(SpatialIndexReplica.REMOVE, driver_id, hex_id)
+                        )
+                        for driver_id in ghosts
+                    )
+            if commands:
+                await CacheRepository.execute(commands)
+        if swept_cells:
+            # Pruning bypasses the incremental density counters, so the touched cells are recounted.
+            await HexagonDensityReconciler.reconcile(swept_cells)
+
+        ghost_count = len(ghosts_found)
+        HEXAGON_SWEEP_CELLS.set(len(hex_ids))
+        HEXAGON_SWEEP_GHOSTS.set(ghost_count)
+        HEXAGON_GHOSTS_PRUNED.inc(ghost_count)
+        return ghost_count
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(HexagonConfig().sweep_interval_s)
+            try:
+                ghost_count = await cls.sweep()
+                if ghost_count:
+                    get_logger().info("Pruned stale drivers from hexagons", payload={"ghosts": ghost_count})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(ErrorCodes.CACHE_DELETE_ERROR.value, payload={"error": str(e)})
@@ -0,0 +1,252 @@
+import asyncio
+import os
+import posixpath
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from ftgo_utils.errors import ErrorCodes
+from ftgo_utils.uuid_gen import uuid4
+
+from config import ArchiveConfig
+from data_access import get_logger
+from data_access.repository.db_repository import DatabaseRepository
+from dto import DriverLocationDTO
+from utils import handle_exception
+from utils.metrics import LOCATION_ARCHIVE_EXPORTED_ROWS
+from utils.provinces import ProvinceGrid
+
+# (timestamp, latitude, longitude)
+Point = Tuple[float, float, float]
+
+
+class LocationArchive:
+    # Parquet copy of driver_location for days past the retention window, laid out as
+    # <path>/day=YYYY-MM-DD/province=<name>/part-0.parquet. Rows are exported ordered by driver
+    # and time, so row-group statistics let a trajectory read skip most of every file. Reads go
+    # through memory-mapped files and only decode the columns and row groups they need.
+    # The archive lives on storage shared by every replica and the maintenance job: an object
+    # store URI (s3://bucket/prefix) or a path on a shared volume.
+    COLUMNS = ["id", "driver_id", "latitude", "longitude", "accuracy", "speed", "bearing", "timestamp"]
+    SCHEMA = pa.schema([
+        ("id", pa.string()),
+        ("driver_id", pa.string()),
+        ("latitude", pa.float32()),
+        ("longitude", pa.float32()),
+        ("accuracy", pa.float32()),
+        ("speed", pa.float32()),
+        ("bearing", pa.float32()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+    ])
+    UNKNOWN_PROVINCE = "unknown"
+    FILE_NAME = "part-0.parquet"
+
+    @classmethod
+    def filesystem(cls) -> Tuple[pafs.FileSystem, str]:
+        path = ArchiveConfig().path
+        if "://" in path:
+            return pafs.FileSystem.from_uri(path)
+        return pafs.LocalFileSystem(use_mmap=True), os.path.abspath(path)
+
+    @classmethod
+    def day_path(cls, day: date, root: Optional[str] = None) -> str:
+        return posixpath.join(root or cls.filesystem()[1], f"day={day.isoformat()}")
+
+    @classmethod
+    def days(cls, start_time: float, end_time: float) -> List[date]:
+        first = datetime.fromtimestamp(start_time, tz=timezone.utc).date()
+        last = datetime.fromtimestamp(end_time, tz=timezone.utc).date()
+        return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+    @classmethod
+    async def export_day(cls, day: date) -> int:
+        config = ArchiveConfig()
+        lower = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        rows = DatabaseRepository.stream(
+            DriverLocationDTO,
+            columns=cls.COLUMNS,
+            query={},
+            range_query={"timestamp": (lower, lower + timedelta(days=1))},
+            order_by=["driver_id", "timestamp"],
+            batch_size=config.export_batch_size,
+        )
+        return await cls.write_day(day, cls._chunks(rows, config.export_batch_size))
+
+    @classmethod
+    async def write_day(cls, day: date, batches: AsyncIterator[List[Tuple]]) -> int:
+        # Written to a staging directory next to the day and swapped in at the end, so a failed
+        # export never touches the previous copy and re-running an export replaces it.
+        config = ArchiveConfig()
+        fs, root = cls.filesystem()
+        day_path = cls.day_path(day, root)
+        staging_path = f"{day_path}.staging-{uuid4()}"
+        writers: Dict[str, pq.ParquetWriter] = {}
+        pending: Dict[str, List[pa.Table]] = {}
+        row_count = 0
+        try:
+            async for batch in batches:
+                row_count += await asyncio.to_thread(cls._write_batch, fs, staging_path, batch, writers, pending, config)
+            await asyncio.to_thread(cls._flush_pending, fs, staging_path, writers, pending, config, 0)
+            for writer in writers.values():
+                writer.close()
+            writers = {}
+            await asyncio.to_thread(cls._publish, fs, staging_path, day_path)
+            LOCATION_ARCHIVE_EXPORTED_ROWS.inc(row_count)
+            get_logger().info("Archived driver locations", payload={"day": day.isoformat(), "rows": row_count})
+            return row_count
+        except Exception as e:
+            for writer in writers.values():
+                writer.close()
+            cls._delete_dir(fs, staging_path)
+            payload = {"day": day.isoformat(), "rows": row_count, "error": str(e)}
+            get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.LOCATION_SAVE_ERROR, payload=payload)
+
+    @staticmethod
+    def _delete_dir(fs: pafs.FileSystem, path: str) -> None:
+        if fs.get_file_info(path).type != pafs.FileType.NotFound:
+            fs.delete_dir(path)
+
+    @classmethod
+    def _publish(cls, fs: pafs.FileSystem, staging_path: str, day_path: str) -> None:
+        fs.create_dir(staging_path, recursive=True)
+        cls._delete_dir(fs, day_path)
+        if isinstance(fs, pafs.LocalFileSystem):
+            fs.move(staging_path, day_path)
+            return
+        # Object stores cannot rename a directory, so each file is moved under the day.
+        for info in fs.get_file_info(pafs.FileSelector(staging_path, recursive=True)):
+            if info.type == pafs.FileType.File:
+                fs.move(info.path, day_path + info.path[len(staging_path):])
+        cls._delete_dir(fs, staging_path)
+
+    @staticmethod
+    async def _chunks(rows: AsyncIterator[Tuple], size: int) -> AsyncIterator[List[Tuple]]:
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @classmethod
+    def _write_batch(
+        cls,
+        fs: pafs.FileSystem,
+        staging_path: str,
+        batch: List[Tuple],
+        writers: Dict[str, pq.ParquetWriter],
+        pending: Dict[str, List[pa.Table]],
+        config: ArchiveConfig,
+    ) -> int:
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*batch), cls.SCHEMA)],
+            schema=cls.SCHEMA,
+        )
+        provinces = ProvinceGrid.provinces(
+            table.column("latitude").to_numpy(zero_copy_only=False),
+            table.column("longitude").to_numpy(zero_copy_only=False),
+        )
+        provinces = np.array([province or cls.UNKNOWN_PROVINCE for province in provinces], dtype=object)
+        for province in sorted(set(provinces)):
+            pending.setdefault(province, []).append(table.take(np.flatnonzero(provinces == province)))
+        # Rows are buffered per province until a full row group is ready, so files get few,
+        # large row groups instead of one per export batch.
+        cls._flush_pending(fs, staging_path, writers, pending, config, config.row_group_size)
+        return table.num_rows
+
+    @classmethod
+    def _flush_pending(
+        cls,
+        fs: pafs.FileSystem,
+        staging_path: str,
+        writers: Dict[str, pq.ParquetWriter],
+        pending: Dict[str, List[pa.Table]],
+        config: ArchiveConfig,
+        min_rows: int,
+    ) -> None:
+        for province, tables in list(pending.items()):
+            if not tables or sum(table.num_rows for table in tables) < max(min_rows, 1):
+                continue
+            writer = writers.get(province)
+            if writer is None:
+                province_path = posixpath.join(staging_path, f"province={province}")
+                fs.create_dir(province_path, recursive=True)
+                writer = pq.ParquetWriter(
+                    posixpath.join(province_path, cls.FILE_NAME), cls.SCHEMA, compression=config.compression, filesystem=fs
+                )
+                writers[province] = writer
+            writer.write_table(pa.concat_tables(tables), row_group_size=config.row_group_size)
+            pending[province] = []
+
+    @classmethod
+    def files(cls, fs: pafs.FileSystem, root: str, days: List[date], province: Optional[str] = None) -> List[str]:
+        paths = []
+        for day in days:
+            selector = pafs.FileSelector(cls.day_path(day, root), allow_not_found=True, recursive=True)
+            for info in fs.get_file_info(selector):
+                directory, name = posixpath.split(info.path)
+                if name != cls.FILE_NAME or not posixpath.basename(directory).startswith("province="):
+                    continue
+                if province is None or posixpath.basename(directory) == f"province={province}":
+                    paths.append(info.path)
+        return sorted(paths)
+
+    @classmethod
+    def scan(
+        cls,
+        start_time: float,
+        end_time: float,
+        columns: Optional[List[str]] = None,
+        driver_id: Optional[str] = None,
+        province: Optional[str] = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[pa.RecordBatch]:
+        # Streams matching rows in record batches; only the days in range are opened, and only
+        # the requested columns of row groups whose statistics can match are read.
+        fs, root = cls.filesystem()
+        paths = cls.files(fs, root, cls.days(start_time, end_time), province)
+        if not paths:
+            return
+        dataset = ds.dataset(paths, schema=cls.SCHEMA, format="parquet", filesystem=fs)
+        timestamp = ds.field("timestamp")
+        expression = (
+            (timestamp >= pa.scalar(datetime.fromtimestamp(start_time, tz=timezone.utc), type=cls.SCHEMA.field("timestamp").type))
+            & (timestamp < pa.scalar(datetime.fromtimestamp(end_time, tz=timezone.utc), type=cls.SCHEMA.field("timestamp").type))
+        )
+        if driver_id is not None:
+            expression = expression & (ds.field("driver_id") == driver_id)
+        yield from dataset.to_batches(columns=columns or cls.COLUMNS, filter=expression, batch_size=batch_size)
+
+    @classmethod
+    def read_day_trajectory(cls, driver_id: str, day: date, start_time: float, end_time: float) -> List[Point]:
+        # One driver-day is small; it is sorted here because a day's points span province files.
+        lower = max(start_time, datetime.combine(day, time.min, tzinfo=timezone.utc).timestamp())
+        upper = min(end_time, datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc).timestamp())
+        points = []
+        for batch in cls.scan(lower, upper, columns=["timestamp", "latitude", "longitude"], driver_id=driver_id):
+            timestamps = batch.column(0).cast(pa.int64()).to_numpy() / 1_000_000
+            points.extend(zip(
+                timestamps.tolist(),
+                batch.column(1).to_numpy(zero_copy_only=False).tolist(),
+                batch.column(2).to_numpy(zero_copy_only=False).tolist(),
+            ))
+        return sorted(points)
+
+    @classmethod
+    async def stream_trajectory(cls, driver_id: str, start_time: float, end_time: float) -> AsyncIterator[Point]:
+        try:
+            for day in cls.days(start_time, end_time):
+                for point in await asyncio.to_thread(cls.read_day_trajectory, driver_id, day, start_time, end_time):
+                    yield point
+        except Exception as e:
+            payload = {"driver_id": driver_id, "start_time": start_time, "end_time": end_time, "error": str(e)}
+            get_logger().error(ErrorCodes.LOCATION_LOAD_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.LOCATION_LOAD_ERROR, payload=payload)
@@ -0,0 +1,194 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import text
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import ArchiveConfig, PartitionConfig
+from data_access import get_logger
+from data_access.models import DriverLocation
+from data_access.repository.db_repository import DatabaseRepository
+from data_access.repository.location_archive import LocationArchive
+from utils.metrics import LOCATION_ARCHIVE_FAILED_DAYS
+
+
+class LocationPartitions:
+    # Keeps the daily RANGE partitions of driver_location in step with the calendar: partitions
+    # are created ahead of time so inserts never hit a missing range, and days older than the
+    # retention window are dropped, or only detached when something else archives them. With the
+    # archive enabled, a day is exported to Parquet first and kept in Postgres if that fails.
+    # Every service replica keeps creating the upcoming partitions on its own loop, so inserts
+    # never depend on an external scheduler; all partition DDL is serialized by an advisory lock.
+    # Only the maintenance command expires and archives, holding a second lock for the whole run
+    # so overlapping runs never work on the same archive day.
+    TABLE_NAME = DriverLocation.__tablename__
+    PARTITION_PREFIX = f"{TABLE_NAME}_p"
+    DAY_FORMAT = "%Y%m%d"
+    # Arbitrary advisory lock keys: one held for a whole maintenance run, one around each DDL
+    # transaction that attaches or removes partitions.
+    MAINTENANCE_LOCK_KEY = 4_271_935_021
+    DDL_LOCK_KEY = 4_271_935_022
+
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def partition_name(cls, day: date) -> str:
+        return f"{cls.PARTITION_PREFIX}{day.strftime(cls.DAY_FORMAT)}"
+
+    @classmethod
+    def partition_day(cls, name: str) -> Optional[date]:
+        if not name.startswith(cls.PARTITION_PREFIX):
+            return None
+        try:
+            return datetime.strptime(name[len(cls.PARTITION_PREFIX):], cls.DAY_FORMAT).date()
+        except ValueError:
+            return None
+
+    @classmethod
+    def create_partition_statement(cls, day: date) -> str:
+        lower = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        upper = lower + timedelta(days=1)
+        return (
+            f"CREATE TABLE IF NOT EXISTS {cls.partition_name(day)} PARTITION OF {cls.TABLE_NAME} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+
+    @classmethod
+    def expire_partition_statement(cls, name: str, detach: bool) -> str:
+        if detach:
+            return f"ALTER TABLE {cls.TABLE_NAME} DETACH PARTITION {name}"
+        return f"DROP TABLE IF EXISTS {name}"
+
+    @classmethod
+    def days_to_create(cls, today: date, precreate_days: int) -> List[date]:
+        # Yesterday is included for late reports that are still inside the accepted delay.
+        return [today + timedelta(days=offset) for offset in range(-1, precreate_days + 1)]
+
+    @classmethod
+    def expired_partitions(cls, names: List[str], today: date, retention_days: int) -> List[str]:
+        cutoff = today - timedelta(days=retention_days)
+        return sorted(
+            name for name in names
+            if (day := cls.partition_day(name)) is not None and day < cutoff
+        )
+
+    @classmethod
+    def retention_cutoff(cls, today: Optional[date] = None) -> float:
+        # Start of the oldest day still kept in Postgres; anything before it lives in the archive.
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = today - timedelta(days=PartitionConfig().retention_days)
+        return datetime.combine(cutoff, time.min, tzinfo=timezone.utc).timestamp()
+
+    @classmethod
+    async def archive_partitions(cls, names: List[str]) -> List[str]:
+        if not ArchiveConfig().enabled:
+            return names
+        archived = []
+        for name in names:
+            try:
+                await LocationArchive.export_day(cls.partition_day(name))
+                archived.append(name)
+            except Exception as e:
+                LOCATION_ARCHIVE_FAILED_DAYS.inc()
+                get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload={"partition": name, "error": str(e)})
+        return archived
+
+    @classmethod
+    async def list_partitions(cls) -> List[str]:
+        async with DatabaseRepository._data_access.get_or_create_session() as session:
+            result = await session.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                    "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                    "WHERE parent.relname = :table_name"
+                ),
+                {"table_name": cls.TABLE_NAME},
+            )
+            return [row[0] for row in result.all()]
+
+    @classmethod
+    @asynccontextmanager
+    async def maintenance_lock(cls) -> AsyncIterator[bool]:
+        # Session-level lock, held on one connection for the whole run; yields False when
+        # another maintenance run already holds it.
+        async with DatabaseRepository._data_access.get_or_create_session() as session:
+            result = await session.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": cls.MAINTENANCE_LOCK_KEY})
+            acquired = bool(result.scalar())
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    await session.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": cls.MAINTENANCE_LOCK_KEY})
+
+    @classmethod
+    async def execute_ddl(cls, statements: List[str]) -> None:
+        # CREATE TABLE IF NOT EXISTS still fails when two sessions attach the same partition at
+        # once, so partition DDL is serialized for the length of its transaction.
+        async with DatabaseRepository._data_access.get_or_create_session() as session:
+            await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": cls.DDL_LOCK_KEY})
+            for statement in statements:
+                await session.execute(text(statement))
+            await session.commit()
+
+    @classmethod
+    async def ensure_partitions(cls, days: List[date]) -> None:
+        await cls.execute_ddl([cls.create_partition_statement(day) for day in days])
+
+    @classmethod
+    async def precreate_partitions(cls, today: Optional[date] = None) -> None:
+        today = today or datetime.now(timezone.utc).date()
+        await cls.ensure_partitions(cls.days_to_create(today, PartitionConfig().precreate_days))
+
+    @classmethod
+    async def run_maintenance(cls, today: Optional[date] = None) -> List[str]:
+        config = PartitionConfig()
+        today = today or datetime.now(timezone.utc).date()
+        async with cls.maintenance_lock() as acquired:
+            if not acquired:
+                get_logger().info("Skipped driver location maintenance", payload={"table": cls.TABLE_NAME, "reason": "locked"})
+                return []
+            expired = cls.expired_partitions(await cls.list_partitions(), today, config.retention_days)
+            expired = await cls.archive_partitions(expired)
+            await cls.execute_ddl(
+                [cls.create_partition_statement(day) for day in cls.days_to_create(today, config.precreate_days)]
+                + [cls.expire_partition_statement(name, config.detach_expired) for name in expired]
+            )
+        if expired:
+            get_logger().info(
+                "Expired driver location partitions",
+                payload={"partitions": expired, "detached": config.detach_expired},
+            )
+        return expired
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if not PartitionConfig().enabled or cls._task is not None:
+            return
+        # The first run happens inline so today's partition exists before any insert is flushed.
+        await cls.precreate_partitions()
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(PartitionConfig().precreate_interval_s)
+            try:
+                await cls.precreate_partitions()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(ErrorCodes.DB_UPDATE_ERROR.value, payload={"table": cls.TABLE_NAME, "error": str(e)})
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import WriteBufferConfig
+from data_access import get_logger
+from data_access.repository.db_repository import DatabaseRepository
+from dto import DriverLocationDTO
+from utils.metrics import (
+    LOCATION_WRITE_BUFFER_DEPTH,
+    LOCATION_WRITE_BUFFER_FAILED_ROWS,
+    LOCATION_WRITE_BUFFER_FLUSH_LATENCY,
+    LOCATION_WRITE_BUFFER_FLUSH_SIZE,
+)
+
+
+class LocationWriteBuffer:
+    # Write-behind queue for the location history table. Submissions return once their rows are
+    # queued; a single flusher drains the queue into multi-row INSERTs every flush_interval_ms or
+    # flush_batch_size rows, whichever comes first. The queue is bounded so a slow database pushes
+    # back on submitters instead of growing memory without limit.
+    _STOP = None
+
+    _queue: Optional[asyncio.Queue] = None
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def initialize(cls) -> None:
+        config = WriteBufferConfig()
+        if not config.enabled or cls._task is not None:
+            return
+        cls._queue = asyncio.Queue(maxsize=config.max_buffered_rows)
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            # Stop through the queue rather than cancelling so an in-flight INSERT always completes.
+            await cls._queue.put(cls._STOP)
+            await cls._task
+            cls._task = None
+        if cls._queue is not None:
+            await cls.drain()
+            cls._queue = None
+
+    @classmethod
+    async def enqueue(cls, locations: List[DriverLocationDTO]) -> None:
+        if not locations:
+            return
+        if cls._queue is None:
+            await DatabaseRepository.bulk_insert(locations)
+            return
+        for location in locations:
+            await cls._queue.put(location)
+        LOCATION_WRITE_BUFFER_DEPTH.set(cls._queue.qsize())
+
+    @classmethod
+    async def drain(cls) -> None:
+        batch_size = WriteBufferConfig().flush_batch_size
+        while cls._queue is not None and not cls._queue.empty():
+            batch = []
+            while len(batch) < batch_size and not cls._queue.empty():
+                location = cls._queue.get_nowait()
+                if location is not cls._STOP:
+                    batch.append(location)
+            await cls.flush(batch)
+
+    @classmethod
+    async def flush(cls, batch: List[DriverLocationDTO]) -> None:
+        if not batch:
+            return
+        started_at = time.perf_counter()
+        try:
+            await DatabaseRepository.bulk_insert(batch)
+        except Exception as e:
+            # The cache already holds the latest position, so a lost batch only leaves a gap in history.
+            LOCATION_WRITE_BUFFER_FAILED_ROWS.inc(len(batch))
+            get_logger().error(ErrorCodes.DB_INSERT_ERROR.value, payload={"rows": len(batch), "error": str(e)})
+        finally:
+            LOCATION_WRITE_BUFFER_FLUSH_LATENCY.observe(time.perf_counter() - started_at)
+            LOCATION_WRITE_BUFFER_FLUSH_SIZE.observe(len(batch))
+            LOCATION_WRITE_BUFFER_DEPTH.set(cls._queue.qsize() if cls._queue is not None else 0)
+
+    @classmethod
+    async def _collect_batch(cls) -> Tuple[List[DriverLocationDTO], bool]:
+        config = WriteBufferConfig()
+        loop = asyncio.get_running_loop()
+        batch = []
+        location = await cls._queue.get()
+        deadline = loop.time() + config.flush_interval_ms / 1000
+        while location is not cls._STOP:
+            batch.append(location)
+            if len(batch) >= config.flush_batch_size:
+                return batch, False
+            if not cls._queue.empty():
+                location = cls._queue.get_nowait()
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return batch, False
+            try:
+                location = await asyncio.wait_for(cls._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return batch, False
+        return batch, True
+
+    @classmethod
+    async def _run(cls) -> None:
+        stopped = False
+        while not stopped:
+            batch, stopped = await cls._collect_batch()
+            await cls.flush(batch)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import PresenceConfig
+from data_access import get_logger
+from data_access.repository.cache_repository import CacheRepository
+from utils.metrics import PRESENCE_EVENTS_CONSUMED, PRESENCE_EVENTS_PUBLISHED
+
+
+class PresenceFeed:
+    # Durable stream of driver status/availability changes. Writers append an event in the same
+    # pipeline as the status write itself, so publishing never costs an extra round-trip; readers
+    # follow it through consumer groups (see PresenceConsumer) instead of polling each driver.
+    STREAM_NAME = "events"
+    STATUS = "status"
+    AVAILABILITY = "availability"
+
+    @classmethod
+    def get_stream(cls) -> CacheRepository:
+        return CacheRepository.get_cache(PresenceConfig().stream_key)
+
+    @classmethod
+    def build_event(
+        cls,
+        change: str,
+        driver_id: str,
+        status: str,
+        availability: str,
+        previous_status: Optional[str] = None,
+        previous_availability: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "change": change,
+            "driver_id": driver_id,
+            "status": status,
+            "availability": availability,
+            "previous_status": previous_status or "",
+            "previous_availability": previous_availability or "",
+            "changed_at": time.time(),
+        }
+
+    @classmethod
+    def publish_command(cls, event: Dict[str, Any]) -> Optional[Tuple[str, str, tuple, dict]]:
+        config = PresenceConfig()
+        if not config.enabled:
+            return None
+        PRESENCE_EVENTS_PUBLISHED.labels(change=event["change"]).inc()
+        return cls.get_stream().command(
+            "xadd", cls.STREAM_NAME, fields=event, maxlen=config.stream_maxlen, approximate=True
+        )
+
+
+class PresenceConsumer:
+    # One member of a consumer group on the presence stream. The group's offset lives in Redis,
+    # so a restarted consumer resumes where it stopped: entries it received but never
+    # acknowledged are delivered again before anything new.
+    def __init__(self, group: str, consumer: str, start_id: str = "$"):
+        self.group = group
+        self.consumer = consumer
+        self.start_id = start_id
+        self._recovered = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def ensure_group(self) -> None:
+        await PresenceFeed.get_stream().stream_create_group(PresenceFeed.STREAM_NAME, self.group, self.start_id)
+
+    async def read(self, count: Optional[int] = None, block_ms: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        stream = PresenceFeed.get_stream()
+        if not self._recovered:
+            entries = await stream.stream_read_group(PresenceFeed.STREAM_NAME, self.group, self.consumer, "0", count=count)
+            if entries:
+                return entries
+            self._recovered = True
+        return await stream.stream_read_group(
+            PresenceFeed.STREAM_NAME, self.group, self.consumer, ">", count=count, block_ms=block_ms
+        )
+
+    async def ack(self, entry_ids: List[str]) -> int:
+        acknowledged = await PresenceFeed.get_stream().stream_ack(PresenceFeed.STREAM_NAME, self.group, entry_ids)
+        PRESENCE_EVENTS_CONSUMED.labels(group=self.group).inc(acknowledged or 0)
+        return acknowledged
+
+    async def poll(self, handler: Callable[[List[Dict[str, Any]]], Awaitable[None]]) -> int:
+        # Entries are acknowledged only after the handler returns, so a failing handler sees
+        # the same batch again on the next poll.
+        config = PresenceConfig()
+        entries = await self.read(count=config.read_batch_size, block_ms=config.read_block_ms)
+        if not entries:
+            return 0
+        await handler([event for _, event in entries])
+        await self.ack([entry_id for entry_id, _ in entries])
+        return len(entries)
+
+    async def start(self, handler: Callable[[List[Dict[str, Any]]], Awaitable[None]]) -> None:
+        if self._task is not None:
+            return
+        await self.ensure_group()
+        self._task = asyncio.create_task(self._run(handler))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, handler: Callable[[List[Dict[str, Any]]], Awaitable[None]]) -> None:
+        while True:
+            try:
+                await self.poll(handler)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(
+                    ErrorCodes.CACHE_FETCH_ERROR.value,
+                    payload={"group": self.group, "consumer": self.consumer, "error": str(e)},
+                )
+                # Pending entries are retried from the start of this consumer's backlog.
+                self._recovered = False
+                await asyncio.sleep(1)
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import h3
+
+from ftgo_utils.errors import ErrorCodes
+
+from config import HexagonConfig, SpatialIndexConfig
+from data_access import get_logger
+from data_access.repository.cache_repository import CacheRepository
+from utils.metrics import (
+    SPATIAL_INDEX_REPLICA_DRIVERS,
+    SPATIAL_INDEX_REPLICA_LAG,
+    SPATIAL_INDEX_REPLICA_READY,
+    SPATIAL_INDEX_REPLICA_STALENESS,
+)
+
+
+class SpatialIndexReplica:
+    # In-process copy of the hexagon -> driver positions kept in Redis, with each driver's
+    # last-seen time and availability so eligibility is decided without a Redis read. Writers
+    # publish every membership, last-seen and availability change to a stream that each process
+    # tails after bootstrapping from the hashes, sorted sets and sets.
+    ADD = "add"
+    REMOVE = "remove"
+    TOUCH = "touch"
+    AVAILABILITY = "availability"
+    STREAM_NAME = "events"
+
+    _cells: Dict[str, Dict[str, Tuple[float, float]]] = {}
+    _driver_cells: Dict[str, str] = {}
+    _last_seen: Dict[str, float] = {}
+    _available: Set[str] = set()
+    _last_id: str = "0-0"
+    _warm: bool = False
+    _last_read_at: float = 0.0
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_stream(cls) -> CacheRepository:
+        return CacheRepository.get_cache(SpatialIndexConfig().change_stream_key)
+
+    @classmethod
+    def build_event(
+        cls,
+        op: str,
+        driver_id: str,
+        hex_id: str,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        seen_at: Optional[float] = None,
+        available: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        event = {"op": op, "driver_id": driver_id, "hex_id": hex_id, "published_at": time.time()}
+        if latitude is not None and longitude is not None:
+            event["latitude"] = latitude
+            event["longitude"] = longitude
+        if seen_at is not None:
+            event["seen_at"] = seen_at
+        # Stream fields are strings; availability travels as 1/0 and is omitted when unknown.
+        if available is not None:
+            event["available"] = 1 if available else 0
+        return event
+
+    @classmethod
+    def publish_command(cls, event: Dict[str, Any]) -> Optional[Tuple[str, str, tuple, dict]]:
+        config = SpatialIndexConfig()
+        if not config.enabled:
+            return None
+        return cls.get_stream().command(
+            "xadd", cls.STREAM_NAME, fields=event, maxlen=config.change_stream_maxlen, approximate=True
+        )
+
+    @classmethod
+    async def publish(cls, event: Dict[str, Any]) -> None:
+        config = SpatialIndexConfig()
+        if not config.enabled:
+            return
+        await cls.get_stream().stream_add(cls.STREAM_NAME, event, maxlen=config.change_stream_maxlen)
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if not SpatialIndexConfig().enabled or cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+        cls.reset()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._cells = {}
+        cls._driver_cells = {}
+        cls._last_seen = {}
+        cls._available = set()
+        cls._last_id = "0-0"
+        cls._warm = False
+        cls._last_read_at = 0.0
+        SPATIAL_INDEX_REPLICA_READY.set(0)
+        SPATIAL_INDEX_REPLICA_DRIVERS.set(0)
+
+    @classmethod
+    async def bootstrap(cls) -> None:
+        # Remember the stream position first: anything published while the hashes
+        # are being copied is replayed afterwards, and replaying is idempotent.
+        cls.reset()
+        last_id = await cls.get_stream().stream_last_id(cls.STREAM_NAME)
+        config = HexagonConfig()
+        hexagon_cache = CacheRepository.get_cache(config.cache_key)
+        last_seen_cache = CacheRepository.get_cache(config.last_seen_cache_key)
+        available_cache = CacheRepository.get_cache(config.available_drivers_cache_key)
+        # Coarser resolutions share the hash; the replica mirrors the finest one only.
+        hex_ids = [hex_id for hex_id in await hexagon_cache.scan_keys() if h3.get_resolution(hex_id) == config.hexagon_resolution]
+        batch_size = SpatialIndexConfig().read_batch_size
+        for start in range(0, len(hex_ids), batch_size):
+            batch = hex_ids[start:start + batch_size]
+            cells = await hexagon_cache.fetch(batch, data_type="hash")
+            states = await CacheRepository.execute([
+                command
+                for hex_id in batch
+                for command in (
+                    last_seen_cache.command("zrange", hex_id, 0, -1, withscores=True),
+                    available_cache.command("smembers", hex_id),
+                )
+            ])
+            for index, (hex_id, drivers) in enumerate(zip(batch, cells)):
+                last_seen = dict(states[2 * index] or [])
+                available = states[2 * index + 1] or set()
+                for driver_id, location in (drivers or {}).items():
+                    if isinstance(location, dict):
+                        cls._move(driver_id, hex_id, (location["latitude"], location["longitude"]))
+                        cls._last_seen[driver_id] = float(last_seen.get(driver_id, 0.0))
+                        cls._set_available(driver_id, driver_id in available)
+        cls._last_id = last_id
+        cls._last_read_at = time.time()
+        cls._warm = True
+        SPATIAL_INDEX_REPLICA_DRIVERS.set(len(cls._driver_cells))
+
+    @classmethod
+    async def consume(cls) -> int:
+        config = SpatialIndexConfig()
+        entries = await cls.get_stream().stream_read(
+            cls.STREAM_NAME,
+            cls._last_id,
+            count=config.read_batch_size,
+            block_ms=config.read_block_ms,
+        )
+        for entry_id, event in entries:
+            cls.apply(event)
+            cls._last_id = entry_id
+        if entries:
+            SPATIAL_INDEX_REPLICA_LAG.set(max(0.0, time.time() - float(entries[-1][1].get("published_at", 0))))
+        else:
+            SPATIAL_INDEX_REPLICA_LAG.set(0)
+        cls._last_read_at = time.time()
+        SPATIAL_INDEX_REPLICA_STALENESS.set(0)
+        SPATIAL_INDEX_REPLICA_DRIVERS.set(len(cls._driver_cells))
+        SPATIAL_INDEX_REPLICA_READY.set(1 if cls.is_ready() else 0)
+        return len(entries)
+
+    @classmethod
+    async def _run(cls) -> None:
+        logger = get_logger()
+        while True:
+            try:
+                if not cls._warm:
+                    await cls.bootstrap()
+                    logger.info("Spatial index replica bootstrapped", payload={"drivers": len(cls._driver_cells)})
+                await cls.consume()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A gap in the stream cannot be detected reliably, so rebuild from scratch.
+                logger.error(ErrorCodes.CACHE_FETCH_ERROR.value, payload={"error": str(e), "last_id": cls._last_id})
+                cls._warm = False
+                SPATIAL_INDEX_REPLICA_READY.set(0)
+                await asyncio.sleep(1)
+
+    @classmethod
+    def apply(cls, event: Dict[str, Any]) -> None:
+        op = event.get("op")
+        driver_id = event.get("driver_id")
+        hex_id = event.get("hex_id")
+        available = event.get("available")
+        if op == cls.ADD:
+            moved = cls._driver_cells.get(driver_id) != hex_id
+            cls._move(driver_id, hex_id, (float(event["latitude"]), float(event["longitude"])))
+            cls._last_seen[driver_id] = float(event.get("seen_at", event.get("published_at", 0.0)))
+            # Without an explicit availability, a driver entering a cell is not in its available set.
+            if available is not None or moved:
+                cls._set_available(driver_id, str(available) == "1")
+            return
+        if cls._driver_cells.get(driver_id) != hex_id:
+            # Touches, availability changes and removals for a cell the driver already left are stale.
+            return
+        if op == cls.REMOVE:
+            cls._discard(driver_id)
+        elif op == cls.TOUCH:
+            cls._last_seen[driver_id] = float(event["seen_at"])
+        elif op == cls.AVAILABILITY:
+            cls._set_available(driver_id, str(available) == "1")
+
+    @classmethod
+    def _set_available(cls, driver_id: str, available: bool) -> None:
+        if available:
+            cls._available.add(driver_id)
+        else:
+            cls._available.discard(driver_id)
+
+    @classmethod
+    def _move(cls, driver_id: str, hex_id: str, position: Tuple[float, float]) -> None:
+        previous_hex_id = cls._driver_cells.get(driver_id)
+        if previous_hex_id is not None and previous_hex_id != hex_id:
+            cls._discard(driver_id)
+        cls._cells.setdefault(hex_id, {})[driver_id] = position
+        cls._driver_cells[driver_id] = hex_id
+
+    @classmethod
+    def _discard(cls, driver_id: str) -> None:
+        hex_id = cls._driver_cells.pop(driver_id, None)
+        cls._last_seen.pop(driver_id, None)
+        cls._available.discard(driver_id)
+        cell = cls._cells.get(hex_id)
+        if cell is None:
+            return
+        cell.pop(driver_id, None)
+        if not cell:
+            del cls._cells[hex_id]
+
+    @classmethod
+    def staleness(cls) -> float:
+        if not cls._warm:
+            return float("inf")
+        return time.time() - cls._last_read_at
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        staleness = cls.staleness()
+        if staleness != float("inf"):
+            SPATIAL_INDEX_REPLICA_STALENESS.set(staleness)
+        return cls._warm and staleness <= SpatialIndexConfig().max_staleness_s
+
+    @classmethod
+    def get_cell_drivers(cls, hex_id: str) -> Dict[str, Tuple[float, float]]:
+        return dict(cls._cells.get(hex_id, {}))
+
+    @classmethod
+    def get_cells_eligible_drivers(cls, hex_ids: List[str], seen_since: float, available_only: bool = False) -> Set[str]:
+        return {
+            driver_id
+            for hex_id in hex_ids
+            for driver_id in cls._cells.get(hex_id, {})
+            if cls._last_seen.get(driver_id, 0.0) >= seen_since and (not available_only or driver_id in cls._available)
+        }
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional
+
+import h3
+
+from config import HexagonConfig
+from ftgo_utils.logger import get_logger
+from domain.hexagon import Hexagon
+from ftgo_utils.constants import SIUnits
+from ftgo_utils.errors import BaseError, ErrorCodes
+from ftgo_utils.geo import haversine
+from utils import handle_exception
+
+
+class DensityMap:
+    # Driver supply per hexagon over a bounding box, read from the incrementally maintained
+    # density counters in one pipelined fetch instead of walking every cell's drivers.
+    def __init__(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        resolution: Optional[int] = None,
+    ):
+        self.min_latitude = min_latitude
+        self.min_longitude = min_longitude
+        self.max_latitude = max_latitude
+        self.max_longitude = max_longitude
+        self.resolution = resolution
+
+    @property
+    def config(self) -> HexagonConfig:
+        return HexagonConfig()
+
+    def area_km2(self) -> float:
+        middle_latitude = (self.min_latitude + self.max_latitude) / 2
+        width = haversine(middle_latitude, self.min_longitude, middle_latitude, self.max_longitude, unit=SIUnits.LENGTH.M)
+        height = haversine(self.min_latitude, self.min_longitude, self.max_latitude, self.min_longitude, unit=SIUnits.LENGTH.M)
+        return width * height / 1e6
+
+    def estimated_cells(self, resolution: int) -> int:
+        return int(self.area_km2() / h3.average_hexagon_area(resolution, unit="km^2")) + 1
+
+    def plan_resolution(self) -> Optional[int]:
+        # The finest indexed resolution whose cells over the box fit heatmap_max_cells.
+        resolutions = [self.resolution] if self.resolution is not None else Hexagon.resolutions()
+        for resolution in resolutions:
+            if self.estimated_cells(resolution) <= self.config.heatmap_max_cells:
+                return resolution
+        return None
+
+    def validate(self) -> int:
+        errors = []
+        if not (-90 <= self.min_latitude < self.max_latitude <= 90):
+            errors.append("latitudes must satisfy -90 <= min_latitude < max_latitude <= 90")
+        if not (-180 <= self.min_longitude < self.max_longitude <= 180):
+            errors.append("longitudes must satisfy -180 <= min_longitude < max_longitude <= 180")
+        if self.resolution is not None and self.resolution not in Hexagon.resolutions():
+            errors.append(f"resolution must be one of {', '.join(map(str, Hexagon.resolutions()))}")
+        resolution = self.plan_resolution() if not errors else None
+        if not errors and resolution is None:
+            errors.append(f"bounding box needs more than {self.config.heatmap_max_cells} cells")
+        if errors:
+            raise BaseError(
+                error_code=ErrorCodes.INVALID_LOCATION_ERROR,
+                message="; ".join(errors),
+                payload={
+                    "bounding_box": [self.min_latitude, self.min_longitude, self.max_latitude, self.max_longitude],
+                    "resolution": self.resolution,
+                },
+            )
+        return resolution
+
+    def cells(self, resolution: int) -> List[str]:
+        polygon = h3.LatLngPoly([
+            (self.min_latitude, self.min_longitude),
+            (self.min_latitude, self.max_longitude),
+            (self.max_latitude, self.max_longitude),
+            (self.max_latitude, self.min_longitude),
+        ])
+        return sorted(h3.polygon_to_cells(polygon, resolution))
+
+    async def load(self) -> Dict[str, Any]:
+        resolution = self.validate()
+        try:
+            hex_ids = self.cells(resolution)
+            counters = await Hexagon.get_density_cache().fetch(hex_ids, data_type="hash") if hex_ids else []
+            cells = []
+            for hex_id, counter in zip(hex_ids, counters):
+                # Counters can dip below zero between a missed update and its reconciliation.
+                online = max(int((counter or {}).get("online") or 0), 0)
+                available = max(int((counter or {}).get("available") or 0), 0)
+                if not online:
+                    continue
+                latitude, longitude = h3.cell_to_latlng(hex_id)
+                cells.append({
+                    "hex_id": hex_id,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "online": online,
+                    "available": available,
+                })
+            return {
+                "resolution": resolution,
+                "cells": cells,
+                "online": sum(cell["online"] for cell in cells),
+                "available": sum(cell["available"] for cell in cells),
+            }
+        except Exception as e:
+            payload = {
+                "bounding_box": [self.min_latitude, self.min_longitude, self.max_latitude, self.max_longitude],
+                "resolution": resolution,
+                "error": str(e),
+            }
+            get_logger().error(ErrorCodes.CACHE_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.CACHE_FETCH_ERROR, payload=payload)
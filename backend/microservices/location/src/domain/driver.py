@@ -1,11 +1,11 @@
-import asyncio
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import DriverStatusConfig
-from data_access.repository import DatabaseRepository, CacheRepository
+from data_access.repository import DatabaseRepository, CacheRepository, PresenceFeed
 from domain.geo_location import GeoLocation
 from domain.driver_location import DriverLocation
 from domain.hexagon import Hexagon
+from domain.reporting_cadence import ReportingCadence
 from ftgo_utils.enums import DriverStatus, DriverAvailabilityStatus
 from ftgo_utils.errors import ErrorCodes, BaseError
 from ftgo_utils.logger import get_logger
@@ -48,6 +48,32 @@ class Driver:
             get_logger().error(ErrorCodes.DRIVER_STATUS_LOAD_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.DRIVER_STATUS_LOAD_ERROR, payload=payload)
 
+    @staticmethod
+    async def load_many(driver_ids: List[str]) -> Dict[str, "Driver"]:
+        # Read-only batch counterpart of load: one pipelined fetch, and drivers without a
+        # cached status are treated as offline instead of having a default written back.
+        if not driver_ids:
+            return {}
+        try:
+            status_dicts = await Driver.get_status_cache().fetch(list(driver_ids))
+            drivers = {}
+            for driver_id, status_dict in zip(driver_ids, status_dicts):
+                if not isinstance(status_dict, dict) or 'status' not in status_dict:
+                    status_dict = {
+                        "status": DriverStatus.OFFLINE.value,
+                        "availability": DriverAvailabilityStatus.AVAILABLE.value,
+                    }
+                drivers[driver_id] = Driver(
+                    driver_id=driver_id,
+                    status=status_dict['status'],
+                    availability=status_dict.get('availability'),
+                )
+            return drivers
+        except Exception as e:
+            payload = {"driver_ids": driver_ids, "error": str(e)}
+            get_logger().error(ErrorCodes.DRIVER_STATUS_LOAD_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.DRIVER_STATUS_LOAD_ERROR, payload=payload)
+
     @staticmethod
     async def get_nearest_drivers(
         latitude: float,
@@ -56,54 +82,95 @@ class Driver:
         max_driver_count: Optional[int] = None,
     ) -> List[str]:
         try:
-            nearest_drivers = await Hexagon.get_nearest_drivers(latitude, longitude, radius_m)
+            nearest_drivers = await Hexagon.get_nearest_drivers(latitude, longitude, radius_m, available_only=True)
+            # The per-cell sets already excluded unavailable drivers; the status check guards
+            # against entries that outlived their driver's status.
+            drivers = await Driver.load_many([driver_data["driver_id"] for driver_data in nearest_drivers])
+            nearest_available_drivers = [
+                driver_data for driver_data in nearest_drivers
+                if drivers[driver_data["driver_id"]].is_available()
+            ]
             if max_driver_count:
-                nearest_drivers = nearest_drivers[:max_driver_count]
-                
-            driver_ids = [driver_data["driver_id"] for driver_data in nearest_drivers]
-            drivers = await asyncio.gather(*[Driver.load(driver_id) for driver_id in driver_ids])
-            nearest_available_drivers = []
-            for driver, driver_data in zip(drivers, nearest_drivers):
-                if driver and driver.is_available():
-                    nearest_available_drivers.append(driver_data)
+                nearest_available_drivers = nearest_available_drivers[:max_driver_count]
             return nearest_available_drivers
         except Exception as e:
             payload = {"latitude": latitude, "longitude": longitude, "error": str(e)}
             get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
     
-    async def submit_locations(self, locations: List[dict]):
+    @staticmethod
+    async def get_nearest_drivers_many(
+        locations: List[Tuple[float, float]],
+        radius_m: int = 100,
+        max_driver_count: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        try:
+            nearest_per_location = await Hexagon.get_nearest_drivers_many(locations, radius_m, available_only=True)
+            drivers = await Driver.load_many(sorted({
+                driver_data["driver_id"] for nearest_drivers in nearest_per_location for driver_data in nearest_drivers
+            }))
+            results = []
+            for nearest_drivers in nearest_per_location:
+                nearest_available_drivers = [
+                    driver_data for driver_data in nearest_drivers
+                    if drivers[driver_data["driver_id"]].is_available()
+                ]
+                if max_driver_count:
+                    nearest_available_drivers = nearest_available_drivers[:max_driver_count]
+                results.append(nearest_available_drivers)
+            return results
+        except Exception as e:
+            payload = {"locations": len(locations), "error": str(e)}
+            get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
+    async def submit_locations(self, locations: List[dict]) -> float:
         try:
             geo_locations = [GeoLocation.from_dict(loc) for loc in locations]
-            driver_location = DriverLocation(driver_id=self.driver_id, locations=geo_locations)
+            available = self.availability == DriverAvailabilityStatus.AVAILABLE.value
+            driver_location = DriverLocation(
+                driver_id=self.driver_id,
+                locations=geo_locations,
+                available=available,
+            )
             if self.status == DriverStatus.OFFLINE.value:
                 await driver_location.delete_locations()
-                status_cache = Driver.get_status_cache()
-                await status_cache.insert(
-                    self.driver_id, 
-                    {'status': DriverStatus.ONLINE.value, 'availability': self.availability},
-                    ttl=self.config.cache_ttl
-                )
+                await CacheRepository.execute(self._status_commands(PresenceFeed.STATUS, DriverStatus.ONLINE.value, self.availability))
                 self.status = DriverStatus.ONLINE.value
             else:
                 await driver_location.save_locations()
+            return ReportingCadence.next_interval(
+                driver_location.latest_location,
+                driver_location.previous_location,
+                available,
+            )
         except Exception as e:
             payload = {"driver_id": self.driver_id, "locations": [location.to_dict() for location in locations], "error": str(e)}
             get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.LOCATION_SAVE_ERROR, payload=payload)
 
-    async def _update_cache(self, status: Optional[str] = None, availability: Optional[str] = None):
+    def _status_commands(self, change: str, status: str, availability: str) -> List[tuple]:
+        # The status write and its presence event go out in the same pipeline.
         status_cache = Driver.get_status_cache()
-        cache_data = {'status': status or self.status, 'availability': availability or self.availability}
-        await status_cache.insert(self.driver_id, cache_data, ttl=self.config.cache_ttl)
+        return [
+            status_cache.command(
+                "set",
+                self.driver_id,
+                {'status': status, 'availability': availability},
+                ex=self.config.cache_ttl,
+            ),
+            PresenceFeed.publish_command(PresenceFeed.build_event(
+                change, self.driver_id, status, availability, self.status, self.availability
+            )),
+        ]
 
     async def change_status(self, status: str):
         try:
             if status == self.status:
                 return
-            driver_location = DriverLocation(driver_id=self.driver_id)
+            driver_location = DriverLocation(driver_id=self.driver_id, available=self.is_available())
             await driver_location.delete_locations()
-            await self._update_cache(status=status)
+            await CacheRepository.execute(self._status_commands(PresenceFeed.STATUS, status, self.availability))
             self.status = status
             self.availability = DriverAvailabilityStatus.AVAILABLE.value
         except Exception as e:
@@ -111,17 +178,54 @@ class Driver:
             get_logger().error(ErrorCodes.DRIVER_CHANGE_STATUS_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.DRIVER_CHANGE_STATUS_ERROR, payload=payload)
 
+    def _availability_commands(self, availability: str, hex_id: Optional[str]) -> List[tuple]:
+        commands = self._status_commands(PresenceFeed.AVAILABILITY, self.status, availability)
+        if hex_id and self.is_online():
+            available = availability == DriverAvailabilityStatus.AVAILABLE.value
+            commands.extend(Hexagon.availability_commands(self.driver_id, hex_id, available))
+        return commands
+
     async def change_availability(self, availability: str):
         try:
             if availability == self.availability:
                 return
-            await self._update_cache(availability=availability)
+            hex_id = await Hexagon.get_last_hexagon_for_driver(self.driver_id)
+            await CacheRepository.execute(self._availability_commands(availability, hex_id))
             self.availability = availability
         except Exception as e:
             payload = {"driver_id": self.driver_id, "availability": availability, "error": str(e)}
             get_logger().error(ErrorCodes.DRIVER_CHANGE_STATUS_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.DRIVER_CHANGE_STATUS_ERROR, payload=payload)
 
+    @staticmethod
+    async def change_availability_many(driver_ids: List[str], availability: str) -> None:
+        # Batch counterpart of change_availability: the statuses and last cells of every driver
+        # are read in one pipeline, and all status, presence and availability writes go out in another.
+        if not driver_ids:
+            return
+        try:
+            status_cache = Driver.get_status_cache()
+            values = await CacheRepository.execute(
+                [status_cache.command("get", driver_id) for driver_id in driver_ids]
+                + [Hexagon.get_last_hexagon_command(driver_id) for driver_id in driver_ids]
+            )
+            commands = []
+            for driver_id, status_dict, hex_id in zip(driver_ids, values[:len(driver_ids)], values[len(driver_ids):]):
+                if not isinstance(status_dict, dict) or 'status' not in status_dict:
+                    status_dict = {
+                        "status": DriverStatus.OFFLINE.value,
+                        "availability": DriverAvailabilityStatus.AVAILABLE.value,
+                    }
+                driver = Driver(driver_id=driver_id, status=status_dict['status'], availability=status_dict.get('availability'))
+                if availability != driver.availability:
+                    commands.extend(driver._availability_commands(availability, hex_id))
+            if commands:
+                await CacheRepository.execute(commands)
+        except Exception as e:
+            payload = {"driver_ids": driver_ids, "availability": availability, "error": str(e)}
+            get_logger().error(ErrorCodes.DRIVER_CHANGE_STATUS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.DRIVER_CHANGE_STATUS_ERROR, payload=payload)
+
     async def get_location(self) -> GeoLocation:
         try:
             driver_location = DriverLocation(driver_id=self.driver_id)
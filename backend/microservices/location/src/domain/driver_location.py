@@ -1,34 +1,78 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from config import LocationConfig
-from data_access.repository import DatabaseRepository, CacheRepository
+from data_access.repository import CacheRepository, LocationWriteBuffer
 from ftgo_utils.logger import get_logger
 from ftgo_utils.errors import ErrorCodes, BaseError
 from utils import handle_exception
 from domain.geo_location import GeoLocation
 from domain.hexagon import Hexagon
+from domain.location_validator import LocationValidator
+from ftgo_utils.constants import SIUnits
+from ftgo_utils.geo import haversine
+from utils.metrics import LOCATION_POINTS_KEPT, LOCATION_POINTS_THINNED
 from dto import DriverLocationDTO
 
 class DriverLocation:
-    def __init__(self, driver_id: str, locations: List[GeoLocation] = []):
+    def __init__(self, driver_id: str, locations: List[GeoLocation] = [], available: Optional[bool] = None):
         self.driver_id: str = driver_id
         self.locations: List[GeoLocation] = locations
+        self.available: Optional[bool] = available
+        self.latest_location: Optional[GeoLocation] = None
+        self.previous_location: Optional[GeoLocation] = None
 
     @property
     def config(self) -> LocationConfig:
         return LocationConfig()
 
-    async def get_valid_locations(self) -> List[GeoLocation]:
-        valid_locations = [loc for loc in self.locations if loc.is_valid()]
-        last_location = await self.load_last_location()
+    def get_valid_locations(self, last_location: Optional[GeoLocation] = None) -> List[GeoLocation]:
+        validation = LocationValidator.validate(self.locations) if self.locations else None
+        valid_locations = [loc for loc, valid in zip(self.locations, validation.valid) if valid] if validation else []
         if last_location:
             valid_locations.append(last_location)
         sorted_locations = sorted(valid_locations, key=lambda x: x.timestamp, reverse=True)
         return sorted_locations[:self.config.keep_last_locations_count]
 
-    async def persist_locations(self):
+    def thin_locations(self, locations: List[GeoLocation], reference: Optional[GeoLocation]) -> List[GeoLocation]:
+        # Walks the points in time order and keeps one only when it adds information over the
+        # previously kept point: it moved or enough time passed, and it is not a less accurate
+        # fix whose error radius covers the whole displacement.
+        config = self.config
+        kept = []
+        for location in sorted(locations, key=lambda x: x.timestamp):
+            if config.thinning_enabled and reference is not None:
+                distance_m = haversine(
+                    reference.latitude,
+                    reference.longitude,
+                    location.latitude,
+                    location.longitude,
+                    unit=SIUnits.LENGTH.M,
+                )
+                elapsed_s = abs(location.timestamp - reference.timestamp)
+                if distance_m < config.thinning_min_distance_m and elapsed_s < config.thinning_min_interval_s:
+                    LOCATION_POINTS_THINNED.labels(reason="redundant").inc()
+                    continue
+                if (
+                    location.accuracy is not None
+                    and reference.accuracy is not None
+                    and location.accuracy > reference.accuracy
+                    and distance_m < location.accuracy
+                ):
+                    LOCATION_POINTS_THINNED.labels(reason="accuracy").inc()
+                    continue
+            kept.append(location)
+            reference = location
+        LOCATION_POINTS_KEPT.inc(len(kept))
+        return kept
+
+    def state_commands(self) -> List[Tuple[str, str, tuple, dict]]:
+        cache = CacheRepository.get_cache(self.config.cache_key)
+        return [cache.command("get", self.driver_id), Hexagon.get_last_hexagon_command(self.driver_id)]
+
+    async def persist_locations(self, locations: List[GeoLocation]):
         try:
-            locations = await self.get_valid_locations()
+            if not locations:
+                return
             locations_dto = [
                 DriverLocationDTO(
                     driver_id=self.driver_id,
@@ -41,42 +85,25 @@ class DriverLocation:
                 )
                 for location in locations
             ]
-            await DatabaseRepository.insert(locations_dto)
+            await LocationWriteBuffer.enqueue(locations_dto)
         except Exception as e:
             payload = {"driver_id": self.driver_id, "error": str(e)}
             get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.LOCATION_SAVE_ERROR, payload=payload)
 
-    async def update_hexagon_cache(self) -> None:
-        try:
-            locations = await self.get_valid_locations()
-            if not locations:
-                return
-            most_recent_location = locations[0]
-            last_hex_id = await Hexagon.get_last_hexagon_for_driver(self.driver_id)
-            current_hex_id = Hexagon.from_location(most_recent_location).hex_id
-            if not last_hex_id or last_hex_id != current_hex_id:
-                await Hexagon.invalidate_driver_cache(self.driver_id)
-                await Hexagon.set_last_hexagon_for_driver(self.driver_id, most_recent_location)
-                await Hexagon.add_driver_to_hexagon(self.driver_id, most_recent_location)
-        except Exception as e:
-            payload = {"driver_id": self.driver_id, "error": str(e)}
-            get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
-            await handle_exception(e, ErrorCodes.LOCATION_SAVE_ERROR, payload=payload)
+    def touch_commands(self, last_hex_id: Optional[str] = None) -> List[Tuple[str, str, tuple, dict]]:
+        cache = CacheRepository.get_cache(self.config.cache_key)
+        commands = [cache.command("expire", self.driver_id, self.config.cache_ttl)]
+        if last_hex_id:
+            commands.extend(Hexagon.touch_driver_commands(self.driver_id, last_hex_id))
+        return commands
 
-    async def cache_locations(self):
-        try:
-            locations = await self.get_valid_locations()
-            if not locations:
-                return
-            most_recent_location = locations[0]
-            cache_key = self.config.cache_key
-            cache = CacheRepository.get_cache(cache_key)
-            await cache.insert(self.driver_id, most_recent_location.to_dict(), ttl=self.config.cache_ttl)
-        except Exception as e:
-            payload = {"driver_id": self.driver_id, "error": str(e)}
-            get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
-            await handle_exception(e, ErrorCodes.LOCATION_SAVE_ERROR, payload=payload)
+    def cache_commands(self, most_recent_location: GeoLocation, last_hex_id: Optional[str] = None) -> List[Tuple[str, str, tuple, dict]]:
+        cache = CacheRepository.get_cache(self.config.cache_key)
+        return [
+            cache.command("set", self.driver_id, most_recent_location.to_dict(), ex=self.config.cache_ttl),
+            *Hexagon.move_driver_commands(self.driver_id, last_hex_id, most_recent_location, self.available),
+        ]
 
     async def load_last_location(self, raise_error_on_missing: Optional[bool] = False) -> Optional[GeoLocation]:
         try:
@@ -101,9 +128,33 @@ class DriverLocation:
 
     async def save_locations(self):
         try:
-            await self.persist_locations()
-            await self.cache_locations()
-            await self.update_hexagon_cache()
+            kept_locations: List[GeoLocation] = []
+
+            def plan(state: List[Any]) -> List[Tuple[str, str, tuple, dict]]:
+                # Runs inside a WATCH on the driver's cached location and cell, and again with fresh
+                # state if a concurrent submit for the same driver commits first, so two submits
+                # never both move the driver out of the same cell.
+                nonlocal kept_locations
+                location_dict, last_hex_id = state
+                last_location = GeoLocation.from_dict(location_dict) if isinstance(location_dict, dict) else None
+                locations = self.get_valid_locations(last_location)
+                if not locations:
+                    kept_locations = []
+                    return []
+                self.latest_location = locations[0]
+                self.previous_location = locations[1] if len(locations) > 1 else None
+                new_locations = [location for location in locations if location is not last_location]
+                kept_locations = self.thin_locations(new_locations, last_location)
+                # The cache and the hexagon index follow the newest kept point, so the next submit thins
+                # against what was persisted; a batch with nothing kept only refreshes last-seen and TTLs.
+                if kept_locations:
+                    return self.cache_commands(max(kept_locations, key=lambda x: x.timestamp), last_hex_id)
+                return self.touch_commands(last_hex_id)
+
+            await CacheRepository.execute_watched(self.state_commands(), plan)
+            # The points to persist come from the plan that committed, so the insert (or its enqueue
+            # into the write buffer) waits for EXEC rather than running alongside a plan that may be retried.
+            await self.persist_locations(kept_locations)
         except Exception as e:
             payload = {"driver_id": self.driver_id, "error": str(e)}
             get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
@@ -111,7 +162,7 @@ class DriverLocation:
 
     async def delete_locations(self):
         try:
-            await Hexagon.invalidate_driver_cache(self.driver_id)
+            await Hexagon.invalidate_driver_cache(self.driver_id, self.available)
             cache_key = self.config.cache_key
             cache = CacheRepository.get_cache(cache_key)
             await cache.delete(self.driver_id)
@@ -1,13 +1,17 @@
-from typing import List, Optional, Dict, Any
-from data_access.repository import DatabaseRepository, CacheRepository
+import math
+import time
+from typing import List, Optional, Dict, Any, Set, Tuple
+from data_access.repository import DatabaseRepository, CacheRepository, SpatialIndexReplica
 from ftgo_utils.logger import get_logger
 from ftgo_utils.constants import SIUnits
 from ftgo_utils.errors import ErrorCodes
 from domain.geo_location import GeoLocation
 from utils import handle_exception
-from ftgo_utils.geo import get_hexagon_neighbors, haversine
+from ftgo_utils.geo import haversine
+import h3
 from config import HexagonConfig
 from ftgo_utils.constants import RadiusLengthConfig
+from utils.metrics import HEXAGON_QUERY_CELLS, SPATIAL_INDEX_QUERIES
 
 class Hexagon:
     def __init__(self, hex_id: str, resolution: int):
@@ -19,10 +23,82 @@ class Hexagon:
         return HexagonConfig()
 
     @classmethod
-    def from_location(cls, location: GeoLocation) -> 'Hexagon':
+    def from_location(cls, location: GeoLocation, resolution: Optional[int] = None) -> 'Hexagon':
+        resolution = resolution or HexagonConfig().hexagon_resolution
+        hex_id = location.get_hexagon_index(resolution=resolution)
+        return cls(hex_id, resolution)
+
+    @classmethod
+    def resolutions(cls) -> List[int]:
+        # Finest first. Only the finest cell is stored per driver; the coarser ones are its parents.
+        config = HexagonConfig()
+        coarser = (resolution for resolution in config.hexagon_resolutions if resolution < config.hexagon_resolution)
+        return sorted({config.hexagon_resolution, *coarser}, reverse=True)
+
+    @classmethod
+    def cell_hierarchy(cls, hex_id: str) -> List[str]:
+        return [h3.cell_to_parent(hex_id, resolution) for resolution in cls.resolutions()]
+
+    @staticmethod
+    def disk_size(k: int) -> int:
+        return 1 + 3 * k * (k + 1)
+
+    @classmethod
+    def plan_query(cls, radius_m: float, resolutions: Optional[List[int]] = None) -> Tuple[int, int]:
+        # Walks from the finest resolution up and takes the first whose k-ring covering the radius
+        # stays within max_query_cells; the coarsest one is the fallback for very large radii.
         config = HexagonConfig()
-        hex_id = location.get_hexagon_index(resolution=config.hexagon_resolution)
-        return cls(hex_id, config.hexagon_resolution)
+        resolutions = resolutions or cls.resolutions()
+        for resolution in resolutions:
+            edge_m = h3.average_hexagon_edge_length(resolution, unit="m")
+            # Coarse cells hold drivers by the parent of their finest cell, which can sit up to
+            # an edge outside the parent's outline.
+            slack_m = edge_m if resolution < config.hexagon_resolution else 0.0
+            # A k-ring reaches at least (k + 1/2) * sqrt(3) * edge from its centre, minus the
+            # query point's own offset from that centre.
+            k = max(config.k_ring_radius, math.ceil((radius_m + slack_m + edge_m) / (math.sqrt(3) * edge_m) - 0.5))
+            if cls.disk_size(k) <= config.max_query_cells:
+                return resolution, k
+        return resolution, k
+
+    @classmethod
+    def get_available_drivers_cache(cls) -> CacheRepository:
+        return CacheRepository.get_cache(HexagonConfig().available_drivers_cache_key)
+
+    @classmethod
+    def get_last_seen_cache(cls) -> CacheRepository:
+        return CacheRepository.get_cache(HexagonConfig().last_seen_cache_key)
+
+    @classmethod
+    def availability_command(cls, driver_id: str, hex_id: str, available: bool) -> Tuple[str, str, tuple, dict]:
+        return cls.get_available_drivers_cache().command("sadd" if available else "srem", hex_id, driver_id)
+
+    @classmethod
+    def availability_commands(cls, driver_id: str, hex_id: str, available: bool) -> List[Tuple[str, str, tuple, dict]]:
+        # For an actual availability change of a driver sitting in hex_id.
+        commands = []
+        for cell_id in cls.cell_hierarchy(hex_id):
+            commands.append(cls.availability_command(driver_id, cell_id, available))
+            commands.extend(cls.density_commands(cell_id, available=1 if available else -1))
+        commands.append(SpatialIndexReplica.publish_command(SpatialIndexReplica.build_event(
+            SpatialIndexReplica.AVAILABILITY, driver_id, hex_id, available=available
+        )))
+        return commands
+
+    @classmethod
+    def get_density_cache(cls) -> CacheRepository:
+        return CacheRepository.get_cache(HexagonConfig().density_cache_key)
+
+    @classmethod
+    def density_commands(cls, hex_id: str, online: int = 0, available: int = 0) -> List[Tuple[str, str, tuple, dict]]:
+        # Per-cell counters, moved only on membership transitions the caller knows about.
+        # Anything they miss (sweeps, lost updates) is repaired by HexagonDensityReconciler.
+        density_cache = cls.get_density_cache()
+        return [
+            density_cache.command("hincrby", hex_id, field, delta)
+            for field, delta in (("online", online), ("available", available))
+            if delta
+        ]
 
     @classmethod
     async def get_last_hexagon_for_driver(cls, driver_id: str) -> Optional[str]:
@@ -57,22 +133,109 @@ class Hexagon:
             get_logger().info(ErrorCodes.LOCATION_DELETE_ERROR.value, payload=payload)
 
     @classmethod
-    async def remove_driver_from_hexagon(cls, driver_id: str, hex_id: str) -> None:
+    async def remove_driver_from_hexagon(cls, driver_id: str, hex_id: str, available: Optional[bool] = None) -> None:
         try:
             cache_key = HexagonConfig().cache_key
             hexagon_cache = CacheRepository.get_cache(cache_key)
-            await hexagon_cache.delete(keys=hex_id, fields=driver_id, data_type="hash")
+            await CacheRepository.execute([
+                command
+                for cell_id in cls.cell_hierarchy(hex_id)
+                for command in (
+                    hexagon_cache.command("hdel", cell_id, driver_id),
+                    cls.get_last_seen_cache().command("zrem", cell_id, driver_id),
+                    cls.availability_command(driver_id, cell_id, available=False),
+                    *cls.density_commands(cell_id, online=-1, available=-1 if available else 0),
+                )
+            ])
+            await SpatialIndexReplica.publish(SpatialIndexReplica.build_event(SpatialIndexReplica.REMOVE, driver_id, hex_id))
         except Exception as e:
             payload = {"driver_id": driver_id, "hex_id": hex_id}
             get_logger().info(ErrorCodes.LOCATION_DELETE_ERROR.value, payload=payload)
 
     @classmethod
-    async def invalidate_driver_cache(cls, driver_id: str) -> None:
+    async def invalidate_driver_cache(cls, driver_id: str, available: Optional[bool] = None) -> None:
         last_hexagon_id = await cls.get_last_hexagon_for_driver(driver_id)
         if last_hexagon_id:
-            await cls.remove_driver_from_hexagon(driver_id, last_hexagon_id)
+            await cls.remove_driver_from_hexagon(driver_id, last_hexagon_id, available)
         await cls.remove_last_hexagon_for_driver(driver_id)
 
+    @classmethod
+    def get_last_hexagon_command(cls, driver_id: str) -> Tuple[str, str, tuple, dict]:
+        driver_cache = CacheRepository.get_cache(HexagonConfig().driver_hexagon_cache_key)
+        return driver_cache.command("get", driver_id)
+
+    @classmethod
+    def move_driver_commands(
+        cls,
+        driver_id: str,
+        last_hex_id: Optional[str],
+        location: GeoLocation,
+        available: Optional[bool] = None,
+    ) -> List[Tuple[str, str, tuple, dict]]:
+        hexagon = cls.from_location(location)
+        hexagon_cache = CacheRepository.get_cache(hexagon.config.cache_key)
+        driver_cache = CacheRepository.get_cache(hexagon.config.driver_hexagon_cache_key)
+        last_seen_cache = cls.get_last_seen_cache()
+        cell_ids = cls.cell_hierarchy(hexagon.hex_id)
+        last_cell_ids = cls.cell_hierarchy(last_hex_id) if last_hex_id else [None] * len(cell_ids)
+        location_data = location.to_dict()
+        seen_at = time.time()
+        commands = []
+        if last_hex_id and last_hex_id != hexagon.hex_id:
+            commands.append(SpatialIndexReplica.publish_command(
+                SpatialIndexReplica.build_event(SpatialIndexReplica.REMOVE, driver_id, last_hex_id)
+            ))
+        commands.append(driver_cache.command("set", driver_id, hexagon.hex_id, ex=hexagon.config.driver_hexagon_cache_ttl))
+        # Every resolution is written in the same pipeline, so they never disagree about a driver.
+        for cell_id, last_cell_id in zip(cell_ids, last_cell_ids):
+            if last_cell_id != cell_id:
+                counted_available = 1 if available else 0
+                if last_cell_id:
+                    commands.append(hexagon_cache.command("hdel", last_cell_id, driver_id))
+                    commands.append(last_seen_cache.command("zrem", last_cell_id, driver_id))
+                    commands.append(cls.availability_command(driver_id, last_cell_id, available=False))
+                    commands.extend(cls.density_commands(last_cell_id, online=-1, available=-counted_available))
+                commands.extend(cls.density_commands(cell_id, online=1, available=counted_available))
+            commands.append(hexagon_cache.command("hset", cell_id, driver_id, location_data))
+            commands.append(last_seen_cache.command("zadd", cell_id, mapping={driver_id: seen_at}))
+            if available is not None:
+                # Re-asserted on every report so the per-cell set heals if an update was ever missed.
+                commands.append(cls.availability_command(driver_id, cell_id, available))
+            commands.extend(cls.refresh_cell_commands(cell_id))
+        commands.append(SpatialIndexReplica.publish_command(SpatialIndexReplica.build_event(
+            SpatialIndexReplica.ADD, driver_id, hexagon.hex_id, location.latitude, location.longitude, seen_at, available
+        )))
+        return commands
+
+    @classmethod
+    def refresh_cell_commands(cls, hex_id: str) -> List[Tuple[str, str, tuple, dict]]:
+        # A cell nobody reports into disappears as a whole after cache_ttl.
+        config = HexagonConfig()
+        return [
+            cache.command("expire", hex_id, config.cache_ttl)
+            for cache in (
+                CacheRepository.get_cache(config.cache_key),
+                cls.get_last_seen_cache(),
+                cls.get_available_drivers_cache(),
+                cls.get_density_cache(),
+            )
+        ]
+
+    @classmethod
+    def touch_driver_commands(cls, driver_id: str, hex_id: str) -> List[Tuple[str, str, tuple, dict]]:
+        # Marks the driver as seen in its current cell without moving its stored position.
+        config = HexagonConfig()
+        driver_cache = CacheRepository.get_cache(config.driver_hexagon_cache_key)
+        seen_at = time.time()
+        commands = [driver_cache.command("expire", driver_id, config.driver_hexagon_cache_ttl)]
+        for cell_id in cls.cell_hierarchy(hex_id):
+            commands.append(cls.get_last_seen_cache().command("zadd", cell_id, mapping={driver_id: seen_at}))
+            commands.extend(cls.refresh_cell_commands(cell_id))
+        commands.append(SpatialIndexReplica.publish_command(SpatialIndexReplica.build_event(
+            SpatialIndexReplica.TOUCH, driver_id, hex_id, seen_at=seen_at
+        )))
+        return commands
+
     @classmethod
     async def add_driver_to_hexagon(cls, driver_id: str, location: GeoLocation) -> None:
         try:
@@ -83,6 +246,9 @@ class Hexagon:
                 values={driver_id: location.to_dict()}, 
                 data_type='hash'
             )
+            await SpatialIndexReplica.publish(SpatialIndexReplica.build_event(
+                SpatialIndexReplica.ADD, driver_id, hexagon.hex_id, location.latitude, location.longitude
+            ))
         except Exception as e:
             payload = {"driver_id": driver_id, "location": location.to_dict()}
             get_logger().error(ErrorCodes.LOCATION_SAVE_ERROR.value, payload=payload)
@@ -99,39 +265,153 @@ class Hexagon:
             payload = {"hex_id": self.hex_id}
             get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
-    
+
+    async def get_driver_positions(self) -> Dict[str, Tuple[float, float]]:
+        return await self.get_cells_driver_positions([self.hex_id])
+
+    @classmethod
+    async def get_cells_driver_positions(cls, hex_ids: List[str]) -> Dict[str, Tuple[float, float]]:
+        config = HexagonConfig()
+        # The replica only mirrors the finest resolution.
+        if SpatialIndexReplica.is_ready() and all(h3.get_resolution(hex_id) == config.hexagon_resolution for hex_id in hex_ids):
+            SPATIAL_INDEX_QUERIES.labels(source="replica").inc()
+            positions = {}
+            for hex_id in hex_ids:
+                positions.update(SpatialIndexReplica.get_cell_drivers(hex_id))
+            return positions
+        SPATIAL_INDEX_QUERIES.labels(source="redis").inc()
+        try:
+            hexagon_cache = CacheRepository.get_cache(config.cache_key)
+            cells = await hexagon_cache.fetch(hex_ids, data_type='hash')
+            return {
+                driver_id: (value["latitude"], value["longitude"])
+                for drivers_cached_data in cells if drivers_cached_data
+                for driver_id, value in drivers_cached_data.items()
+            }
+        except Exception as e:
+            payload = {"hex_ids": hex_ids}
+            get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
+    async def get_available_drivers(self) -> Set[str]:
+        try:
+            return await self.get_available_drivers_cache().fetch(self.hex_id, data_type="set")
+        except Exception as e:
+            payload = {"hex_id": self.hex_id}
+            get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
+    async def get_eligible_drivers(self, available_only: bool = False) -> Set[str]:
+        return await self.get_cells_eligible_drivers([self.hex_id], available_only)
+
+    @classmethod
+    async def get_cells_eligible_drivers(cls, hex_ids: List[str], available_only: bool = False) -> Set[str]:
+        # Members seen within freshness_s, intersected with the available set when asked. The
+        # replica carries both for the finest resolution, so Redis is only read while it is not ready.
+        try:
+            config = HexagonConfig()
+            seen_since = time.time() - config.freshness_s
+            if SpatialIndexReplica.is_ready() and all(h3.get_resolution(hex_id) == config.hexagon_resolution for hex_id in hex_ids):
+                return SpatialIndexReplica.get_cells_eligible_drivers(hex_ids, seen_since, available_only)
+            commands = [
+                cls.get_last_seen_cache().command("zrangebyscore", hex_id, seen_since, "+inf")
+                for hex_id in hex_ids
+            ]
+            if available_only:
+                commands.extend(cls.get_available_drivers_cache().command("smembers", hex_id) for hex_id in hex_ids)
+            results = await CacheRepository.execute(commands)
+            fresh = set().union(*(result or () for result in results[:len(hex_ids)]))
+            if not available_only:
+                return fresh
+            return fresh & set().union(*(result or () for result in results[len(hex_ids):]))
+        except Exception as e:
+            payload = {"hex_ids": hex_ids}
+            get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
     @staticmethod
     async def get_nearest_drivers(
         latitude: float,
         longitude: float,
         radius_m: int = 100,
+        available_only: bool = False,
     ) -> List[Dict[str, Any]]:
         try:
-            geo_location = GeoLocation(latitude=latitude, longitude=longitude)
-            hexagon = Hexagon.from_location(geo_location)
-            drivers_data = await hexagon.get_drivers()
-            flatten_drivers = [
-                (driver_id, location, haversine(
-                    geo_location.latitude,
-                    geo_location.longitude,
-                    location.latitude,
-                    location.longitude,
-                    unit=SIUnits.LENGTH.M
-                ))
-                for driver_id, location in drivers_data.items()
-            ]
-            nearby_drivers = [
-                {
-                    "driver_id": driver_id,
-                    "latitude": location.latitude,
-                    "longitude": location.longitude,
-                    "distance": distance,
+            resolution, k = Hexagon.plan_query(radius_m)
+            hexagon = Hexagon.from_location(GeoLocation(latitude=latitude, longitude=longitude), resolution)
+            hex_ids = list(h3.grid_disk(hexagon.hex_id, k))
+            HEXAGON_QUERY_CELLS.labels(resolution=str(resolution)).observe(len(hex_ids))
+            drivers_positions = await Hexagon.get_cells_driver_positions(hex_ids)
+            if drivers_positions:
+                eligible_drivers = await Hexagon.get_cells_eligible_drivers(hex_ids, available_only)
+                drivers_positions = {
+                    driver_id: position
+                    for driver_id, position in drivers_positions.items()
+                    if driver_id in eligible_drivers
                 }
-                for driver_id, location, distance in flatten_drivers if distance <= radius_m
-            ]
-            sorted_drivers = sorted(nearby_drivers, key=lambda x: x["distance"])
-            return sorted_drivers
+            return Hexagon._nearby_drivers(latitude, longitude, drivers_positions, radius_m)
         except Exception as e:
             payload = {"latitude": latitude, "longitude": longitude, "radius_m": radius_m}
             get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
             await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
+    @staticmethod
+    async def get_nearest_drivers_many(
+        locations: List[Tuple[float, float]],
+        radius_m: int = 100,
+        available_only: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        # Batch counterpart of get_nearest_drivers: the k-rings of all locations are read as one
+        # set of cells, so a batch costs the round-trips of a single query and overlapping
+        # rings are fetched once.
+        try:
+            resolution, k = Hexagon.plan_query(radius_m)
+            hex_ids = set()
+            for latitude, longitude in locations:
+                hexagon = Hexagon.from_location(GeoLocation(latitude=latitude, longitude=longitude), resolution)
+                hex_ids.update(h3.grid_disk(hexagon.hex_id, k))
+            hex_ids = sorted(hex_ids)
+            drivers_positions = await Hexagon.get_cells_driver_positions(hex_ids) if hex_ids else {}
+            if drivers_positions:
+                eligible_drivers = await Hexagon.get_cells_eligible_drivers(hex_ids, available_only)
+                drivers_positions = {
+                    driver_id: position
+                    for driver_id, position in drivers_positions.items()
+                    if driver_id in eligible_drivers
+                }
+            return [
+                Hexagon._nearby_drivers(latitude, longitude, drivers_positions, radius_m)
+                for latitude, longitude in locations
+            ]
+        except Exception as e:
+            payload = {"locations": len(locations), "radius_m": radius_m}
+            get_logger().error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+
+    @staticmethod
+    def _nearby_drivers(
+        latitude: float,
+        longitude: float,
+        drivers_positions: Dict[str, Tuple[float, float]],
+        radius_m: float,
+    ) -> List[Dict[str, Any]]:
+        flatten_drivers = [
+            (driver_id, driver_latitude, driver_longitude, haversine(
+                latitude,
+                longitude,
+                driver_latitude,
+                driver_longitude,
+                unit=SIUnits.LENGTH.M
+            ))
+            for driver_id, (driver_latitude, driver_longitude) in drivers_positions.items()
+        ]
+        nearby_drivers = [
+            {
+                "driver_id": driver_id,
+                "latitude": driver_latitude,
+                "longitude": driver_longitude,
+                "distance": distance,
+            }
+            for driver_id, driver_latitude, driver_longitude, distance in flatten_drivers if distance <= radius_m
+        ]
+        return sorted(nearby_drivers, key=lambda x: x["distance"])
@@ -0,0 +1,102 @@
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ftgo_utils.constants import Provinces
+
+from config import LocationConfig
+from utils.metrics import LOCATION_POINTS_REJECTED
+from utils.provinces import ProvinceGrid
+
+
+class LocationValidation(NamedTuple):
+    valid: np.ndarray
+    reasons: np.ndarray
+
+
+class LocationValidator:
+    # Validates a whole batch of points at once. Numeric checks run as numpy comparisons over
+    # columns and provinces come from ProvinceGrid, one polygon lookup per grid cell.
+    ACCURACY = 1
+    SPEED = 2
+    TIMESTAMP = 4
+    LATITUDE = 8
+    LONGITUDE = 16
+    BEARING = 32
+    PROVINCE = 64
+
+    REASONS = {
+        ACCURACY: "accuracy",
+        SPEED: "speed",
+        TIMESTAMP: "timestamp",
+        LATITUDE: "latitude",
+        LONGITUDE: "longitude",
+        BEARING: "bearing",
+        PROVINCE: "province",
+    }
+
+    @staticmethod
+    def _as_float(value) -> float:
+        # Anything that is not a number is treated as missing and so fails its check.
+        try:
+            return np.nan if value is None else float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @classmethod
+    def _column(cls, locations: Sequence, field: str) -> np.ndarray:
+        return np.array([cls._as_float(getattr(location, field, None)) for location in locations], dtype=float)
+
+    @classmethod
+    def validate(cls, locations: Sequence, now: Optional[float] = None) -> LocationValidation:
+        return cls.validate_columns(
+            latitude=cls._column(locations, "latitude"),
+            longitude=cls._column(locations, "longitude"),
+            timestamp=cls._column(locations, "timestamp"),
+            accuracy=cls._column(locations, "accuracy"),
+            speed=cls._column(locations, "speed"),
+            bearing=cls._column(locations, "bearing"),
+            now=now,
+        )
+
+    @classmethod
+    def validate_columns(
+        cls,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        timestamp: np.ndarray,
+        accuracy: np.ndarray,
+        speed: np.ndarray,
+        bearing: np.ndarray,
+        now: Optional[float] = None,
+    ) -> LocationValidation:
+        # Missing values are NaN, which fails every comparison; only bearing is optional.
+        config = LocationConfig()
+        now = int(time.time()) if now is None else now
+        reasons = np.zeros(len(latitude), dtype=np.int64)
+        with np.errstate(invalid="ignore"):
+            reasons |= np.where(accuracy <= config.accuracy_threshold_m, 0, cls.ACCURACY)
+            reasons |= np.where(speed <= config.maximum_speed_threshold_m, 0, cls.SPEED)
+            reasons |= np.where(now - timestamp <= config.timestamp_maximum_delay_threshold_s, 0, cls.TIMESTAMP)
+            latitude_valid = (latitude >= -90) & (latitude <= 90)
+            longitude_valid = (longitude >= -180) & (longitude <= 180)
+            reasons |= np.where(latitude_valid, 0, cls.LATITUDE)
+            reasons |= np.where(longitude_valid, 0, cls.LONGITUDE)
+            reasons |= np.where(np.isnan(bearing) | ((bearing >= 0) & (bearing <= 360)), 0, cls.BEARING)
+
+        province_valid = np.zeros(len(latitude), dtype=bool)
+        located = latitude_valid & longitude_valid
+        if located.any():
+            province_valid[located] = np.isin(ProvinceGrid.provinces(latitude[located], longitude[located]), list(Provinces.values()))
+        reasons |= np.where(province_valid, 0, cls.PROVINCE)
+
+        for code, name in cls.REASONS.items():
+            rejected = int(np.count_nonzero(reasons & code))
+            if rejected:
+                LOCATION_POINTS_REJECTED.labels(reason=name).inc(rejected)
+        return LocationValidation(valid=reasons == 0, reasons=reasons)
+
+    @classmethod
+    def reason_names(cls, reasons: int) -> List[str]:
+        return [name for code, name in cls.REASONS.items() if reasons & code]
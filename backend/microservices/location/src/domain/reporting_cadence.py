@@ -0,0 +1,61 @@
+from typing import Optional
+
+from ftgo_utils.constants import SIUnits
+from ftgo_utils.geo import haversine
+
+from config import ReportingCadenceConfig
+from domain.geo_location import GeoLocation
+
+class ReportingCadence:
+    # Recommends how long a client should wait before its next location report: roughly the
+    # time needed to cover a fixed spacing at the current speed, tighter while the driver is
+    # on a delivery, and the configured maximum while the driver is not moving.
+
+    @staticmethod
+    def config() -> ReportingCadenceConfig:
+        return ReportingCadenceConfig()
+
+    @classmethod
+    def next_interval(
+        cls,
+        latest: Optional[GeoLocation],
+        previous: Optional[GeoLocation],
+        available: bool,
+    ) -> float:
+        if latest is None:
+            return cls.config().min_interval_s
+        implied_speed = cls.implied_speed(latest, previous)
+        speed = latest.speed if latest.speed is not None else implied_speed
+        if speed is None:
+            return cls.config().min_interval_s
+        # Reported speed jitters around a metre per second while parked; the distance actually
+        # covered since the previous point settles it.
+        moving_speeds = [value for value in (latest.speed, implied_speed) if value is not None]
+        return cls.interval_for(speed, available, stationary=min(moving_speeds) < cls.config().stationary_speed_mps)
+
+    @staticmethod
+    def implied_speed(latest: GeoLocation, previous: Optional[GeoLocation]) -> Optional[float]:
+        if previous is None or latest.timestamp is None or previous.timestamp is None:
+            return None
+        elapsed_s = latest.timestamp - previous.timestamp
+        if elapsed_s <= 0:
+            return None
+        distance_m = haversine(
+            previous.latitude,
+            previous.longitude,
+            latest.latitude,
+            latest.longitude,
+            unit=SIUnits.LENGTH.M,
+        )
+        return distance_m / elapsed_s
+
+    @classmethod
+    def interval_for(cls, speed_mps: float, available: bool, stationary: bool = False) -> float:
+        config = cls.config()
+        if available:
+            spacing_m, max_interval_s = config.available_spacing_m, config.available_max_interval_s
+        else:
+            spacing_m, max_interval_s = config.delivery_spacing_m, config.delivery_max_interval_s
+        if stationary or speed_mps < config.stationary_speed_mps:
+            return max_interval_s
+        return round(min(max(spacing_m / speed_mps, config.min_interval_s), max_interval_s), 1)
@@ -0,0 +1,191 @@
+import heapq
+import math
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import ArchiveConfig, TrajectoryConfig
+from data_access.repository import DatabaseRepository, LocationArchive, LocationPartitions
+from dto import DriverLocationDTO
+from ftgo_utils.errors import ErrorCodes, BaseError
+from ftgo_utils.logger import get_logger
+from utils import handle_exception
+
+# (timestamp, latitude, longitude)
+Point = Tuple[float, float, float]
+
+
+class Trajectory:
+    NONE = "none"
+    DOUGLAS_PEUCKER = "douglas_peucker"
+    TIME_BUCKET = "time_bucket"
+    METHODS = (NONE, DOUGLAS_PEUCKER, TIME_BUCKET)
+
+    EARTH_RADIUS_M = 6_371_000.0
+
+    def __init__(
+        self,
+        driver_id: str,
+        start_time: float,
+        end_time: float,
+        max_points: Optional[int] = None,
+        method: Optional[str] = None,
+    ):
+        self.driver_id = driver_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.max_points = max_points or self.config.default_max_points
+        self.method = method or self.DOUGLAS_PEUCKER
+
+    @property
+    def config(self) -> TrajectoryConfig:
+        return TrajectoryConfig()
+
+    def validate(self) -> None:
+        errors = []
+        if self.method not in self.METHODS:
+            errors.append(f"method must be one of {', '.join(self.METHODS)}")
+        if self.end_time <= self.start_time:
+            errors.append("end_time must be after start_time")
+        elif self.end_time - self.start_time > self.config.max_window_s:
+            errors.append(f"window must not exceed {self.config.max_window_s} seconds")
+        if not 2 <= self.max_points <= self.config.max_points_limit:
+            errors.append(f"max_points must be between 2 and {self.config.max_points_limit}")
+        if errors:
+            raise BaseError(
+                error_code=ErrorCodes.LOCATION_LOAD_ERROR,
+                message="; ".join(errors),
+                payload={"driver_id": self.driver_id, "method": self.method, "max_points": self.max_points},
+            )
+
+    async def stream_points(self) -> AsyncIterator[Point]:
+        # Days past the retention window are answered from the Parquet archive.
+        start_time = self.start_time
+        if ArchiveConfig().enabled:
+            cutoff = LocationPartitions.retention_cutoff()
+            if start_time < cutoff:
+                async for point in LocationArchive.stream_trajectory(self.driver_id, start_time, min(self.end_time, cutoff)):
+                    yield point
+                start_time = cutoff
+            if start_time >= self.end_time:
+                return
+        rows = DatabaseRepository.stream(
+            DriverLocationDTO,
+            columns=["timestamp", "latitude", "longitude"],
+            query={"driver_id": self.driver_id},
+            range_query={
+                "timestamp": (
+                    datetime.fromtimestamp(start_time, tz=timezone.utc),
+                    datetime.fromtimestamp(self.end_time, tz=timezone.utc),
+                ),
+            },
+            order_by="timestamp",
+            batch_size=self.config.fetch_batch_size,
+        )
+        async for timestamp, latitude, longitude in rows:
+            yield timestamp.timestamp(), latitude, longitude
+
+    async def load(self) -> dict:
+        self.validate()
+        try:
+            raw_point_count = 0
+            truncated = False
+
+            async def counted_points() -> AsyncIterator[Point]:
+                nonlocal raw_point_count
+                async for point in self.stream_points():
+                    raw_point_count += 1
+                    yield point
+
+            points = []
+            if self.method == self.TIME_BUCKET:
+                async for point in self.time_bucket(counted_points(), self.start_time, self.end_time, self.max_points):
+                    points.append(point)
+            else:
+                async for point in counted_points():
+                    if self.method == self.NONE and len(points) == self.max_points:
+                        truncated = True
+                        break
+                    points.append(point)
+                if self.method == self.DOUGLAS_PEUCKER:
+                    points = self.douglas_peucker(points, self.max_points)
+            return {
+                "driver_id": self.driver_id,
+                "method": self.method,
+                "raw_point_count": raw_point_count,
+                "truncated": truncated,
+                "points": [
+                    {"timestamp": timestamp, "latitude": latitude, "longitude": longitude}
+                    for timestamp, latitude, longitude in points
+                ],
+            }
+        except Exception as e:
+            payload = {"driver_id": self.driver_id, "error": str(e)}
+            get_logger().error(ErrorCodes.LOCATION_LOAD_ERROR.value, payload=payload)
+            await handle_exception(e, ErrorCodes.LOCATION_LOAD_ERROR, payload=payload)
+
+    @classmethod
+    async def time_bucket(
+        cls,
+        points: AsyncIterator[Point],
+        start_time: float,
+        end_time: float,
+        max_points: int,
+    ) -> AsyncIterator[Point]:
+        # Keeps the first point of each of max_points - 1 equal time buckets plus the final
+        # point, so memory stays constant however many rows the window holds.
+        bucket_width = (end_time - start_time) / (max_points - 1)
+        current_bucket = None
+        last_point = None
+        last_emitted = None
+        async for point in points:
+            last_point = point
+            bucket = int((point[0] - start_time) // bucket_width)
+            if bucket != current_bucket:
+                current_bucket = bucket
+                last_emitted = point
+                yield point
+        if last_point is not None and last_point is not last_emitted:
+            yield last_point
+
+    @classmethod
+    def douglas_peucker(cls, points: List[Point], max_points: int) -> List[Point]:
+        # Budgeted Douglas-Peucker: instead of a fixed tolerance, keep splitting whichever
+        # segment has the farthest outlying point until max_points points are kept.
+        if len(points) <= max_points:
+            return points
+        projected = cls._project(points)
+        keep = {0, len(points) - 1}
+        heap = []
+        cls._push_segment(heap, projected, 0, len(points) - 1)
+        while heap and len(keep) < max_points:
+            _, start, end, index = heapq.heappop(heap)
+            keep.add(index)
+            cls._push_segment(heap, projected, start, index)
+            cls._push_segment(heap, projected, index, end)
+        return [points[index] for index in sorted(keep)]
+
+    @classmethod
+    def _project(cls, points: List[Point]) -> np.ndarray:
+        # Equirectangular projection around the mean latitude, in metres; plenty for
+        # ranking deviations over the extent of one driver's trajectory.
+        coordinates = np.radians(np.asarray([(latitude, longitude) for _, latitude, longitude in points]))
+        scale = math.cos(float(coordinates[:, 0].mean()))
+        return np.column_stack((coordinates[:, 1] * scale, coordinates[:, 0])) * cls.EARTH_RADIUS_M
+
+    @classmethod
+    def _push_segment(cls, heap: list, projected: np.ndarray, start: int, end: int) -> None:
+        if end - start < 2:
+            return
+        a = projected[start]
+        ab = projected[end] - a
+        inner = projected[start + 1:end] - a
+        length_squared = float(ab @ ab)
+        if length_squared == 0:
+            distances = np.linalg.norm(inner, axis=1)
+        else:
+            t = np.clip(inner @ ab / length_squared, 0.0, 1.0)
+            distances = np.linalg.norm(inner - t[:, None] * ab, axis=1)
+        offset = int(distances.argmax())
+        heapq.heappush(heap, (-float(distances[offset]), start, end, start + 1 + offset))
@@ -18,9 +18,13 @@ async def register_events():
         'driver.status.offline': DriverService.change_status_offline,
         'driver.availability.available': DriverService.set_driver_available,
         'driver.availability.occupied': DriverService.set_driver_occupied,
+        'driver.availability.occupied_many': DriverService.set_drivers_occupied,
         'driver.location.get': DriverService.get_last_location,
         'driver.status.get': DriverService.get_driver_status,
         'location.drivers.get_nearest': TrackerService.get_nearest_drivers,
+        'location.drivers.get_nearest_many': TrackerService.get_nearest_drivers_many,
+        'driver.location.trajectory': TrackerService.get_driver_trajectory,
+        'location.density.heatmap': TrackerService.get_density_heatmap,
     }
 
     for event, _handler in events_handlers.items():
@@ -7,12 +7,14 @@ from ftgo_utils.logger import init_logging
 from config import ServiceConfig
 from data_access.events.lifecycle import setup, teardown
 from events import register_events
+from utils.metrics import start_metrics_server
 
 load_dotenv()
 
 async def setup_env():
     service_config = ServiceConfig()
     init_logging(level=service_config.log_level)
+    start_metrics_server()
 
 async def startup_event():
     await setup_env()
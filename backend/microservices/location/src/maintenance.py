@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+from datetime import date
+
+from dotenv import load_dotenv
+
+from ftgo_utils.logger import init_logging
+
+from config import ServiceConfig
+from data_access.repository import DatabaseRepository, LocationArchive, LocationPartitions
+
+load_dotenv()
+
+# Offline maintenance for the location history table, scheduled once per deployment (not per
+# replica, see location_maintenance in docker-compose.yaml); both commands hold the partition
+# maintenance lock, so overlapping runs skip (replicas create upcoming partitions themselves):
+#   python src/maintenance.py archive --day 2024-01-01 [--day ...]   export days to the Parquet archive
+#   python src/maintenance.py partitions                             create upcoming, archive and expire old partitions
+
+
+async def archive(days) -> None:
+    async with LocationPartitions.maintenance_lock() as acquired:
+        if not acquired:
+            raise SystemExit("Another location maintenance run holds the lock")
+        for day in days:
+            await LocationArchive.export_day(day)
+
+
+async def run(args: argparse.Namespace) -> None:
+    init_logging(level=ServiceConfig().log_level)
+    await DatabaseRepository.initialize()
+    try:
+        if args.command == "archive":
+            await archive(args.day)
+        else:
+            await LocationPartitions.run_maintenance()
+    finally:
+        await DatabaseRepository.terminate()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Location history maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive_parser = commands.add_parser("archive", help="Export whole UTC days to the Parquet archive")
+    archive_parser.add_argument("--day", type=date.fromisoformat, action="append", required=True)
+    commands.add_parser("partitions", help="Create upcoming partitions and archive/expire old ones")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
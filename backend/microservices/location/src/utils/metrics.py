@@ -0,0 +1,114 @@
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from config import MetricsConfig
+
+SPATIAL_INDEX_QUERIES = Counter(
+    "location_spatial_index_queries_total",
+    "Nearest-driver cell lookups, labelled by the source that served them",
+    ["source"],
+)
+SPATIAL_INDEX_REPLICA_LAG = Gauge(
+    "location_spatial_index_replica_lag_seconds",
+    "Delay between a hexagon change being published and this replica applying it",
+)
+SPATIAL_INDEX_REPLICA_STALENESS = Gauge(
+    "location_spatial_index_replica_staleness_seconds",
+    "Time since this replica last completed a read of the hexagon change stream",
+)
+SPATIAL_INDEX_REPLICA_DRIVERS = Gauge(
+    "location_spatial_index_replica_drivers",
+    "Drivers currently held in the in-memory spatial index replica",
+)
+SPATIAL_INDEX_REPLICA_READY = Gauge(
+    "location_spatial_index_replica_ready",
+    "1 when the in-memory spatial index replica is warm and within its staleness bound",
+)
+CACHE_WATCH_CONFLICTS = Counter(
+    "location_cache_watch_conflicts_total",
+    "Optimistic Redis transactions retried because a watched key changed before EXEC",
+)
+LOCATION_WRITE_BUFFER_DEPTH = Gauge(
+    "location_write_buffer_depth",
+    "Driver locations waiting in the write-behind buffer",
+)
+LOCATION_WRITE_BUFFER_FLUSH_SIZE = Histogram(
+    "location_write_buffer_flush_size",
+    "Rows written to Postgres per write-behind flush",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+LOCATION_WRITE_BUFFER_FLUSH_LATENCY = Histogram(
+    "location_write_buffer_flush_latency_seconds",
+    "Time spent writing one write-behind batch to Postgres",
+)
+LOCATION_WRITE_BUFFER_FAILED_ROWS = Counter(
+    "location_write_buffer_failed_rows_total",
+    "Driver locations dropped because their write-behind flush failed",
+)
+HEXAGON_SWEEP_GHOSTS = Gauge(
+    "location_hexagon_sweep_ghosts",
+    "Drivers pruned from hexagon cells by the last sweep because they stopped reporting",
+)
+HEXAGON_SWEEP_CELLS = Gauge(
+    "location_hexagon_sweep_cells",
+    "Hexagon cells inspected by the last sweep",
+)
+HEXAGON_GHOSTS_PRUNED = Counter(
+    "location_hexagon_ghosts_pruned_total",
+    "Drivers pruned from hexagon cells because they stopped reporting",
+)
+HEXAGON_QUERY_CELLS = Histogram(
+    "location_hexagon_query_cells",
+    "Cells read by one nearest-driver query, labelled by the H3 resolution the planner chose",
+    ["resolution"],
+    buckets=(1, 7, 19, 37, 61, 91, 127, 169),
+)
+HEXAGON_DENSITY_DRIFT_CELLS = Gauge(
+    "location_hexagon_density_drift_cells",
+    "Cells whose density counters disagreed with the hexagon index at the last reconciliation",
+)
+HEXAGON_DENSITY_REPAIRS = Counter(
+    "location_hexagon_density_repairs_total",
+    "Cell density counters rewritten from the hexagon index because they had drifted",
+)
+LOCATION_ARCHIVE_EXPORTED_ROWS = Counter(
+    "location_archive_exported_rows_total",
+    "Driver location rows copied to the Parquet archive before their partition expired",
+)
+LOCATION_ARCHIVE_FAILED_DAYS = Counter(
+    "location_archive_failed_days_total",
+    "Expired partitions kept in Postgres because their archive export failed",
+)
+PRESENCE_EVENTS_PUBLISHED = Counter(
+    "location_presence_events_published_total",
+    "Driver presence changes appended to the presence stream, labelled by what changed",
+    ["change"],
+)
+PRESENCE_EVENTS_CONSUMED = Counter(
+    "location_presence_events_consumed_total",
+    "Presence events handled and acknowledged, labelled by consumer group",
+    ["group"],
+)
+LOCATION_POINTS_KEPT = Counter(
+    "location_points_kept_total",
+    "Submitted location points kept for persistence after thinning",
+)
+LOCATION_POINTS_THINNED = Counter(
+    "location_points_thinned_total",
+    "Submitted location points dropped as redundant before persistence",
+    ["reason"],
+)
+LOCATION_POINTS_REJECTED = Counter(
+    "location_points_rejected_total",
+    "Submitted location points rejected by validation, by failed check",
+    ["reason"],
+)
+
+_metrics_server_started = False
+
+def start_metrics_server() -> None:
+    global _metrics_server_started
+    metrics_config = MetricsConfig()
+    if not metrics_config.enabled or _metrics_server_started:
+        return
+    start_http_server(metrics_config.port)
+    _metrics_server_started = True
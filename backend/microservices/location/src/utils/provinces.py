@@ -0,0 +1,44 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ftgo_utils.geo import get_province
+
+from config import LocationConfig
+
+
+class ProvinceGrid:
+    # Resolves provinces for whole batches of points. Points are snapped to a coarse lat/lng grid
+    # and the polygon lookup runs once per cell, cached for the life of the process, since almost
+    # every point lands in a cell seen before.
+    _cells: Dict[Tuple[int, int], Optional[str]] = {}
+
+    @classmethod
+    def provinces(cls, latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+        cell_size_deg = LocationConfig().province_cell_size_deg
+        cells = np.column_stack((
+            np.floor(np.asarray(latitude, dtype=float) / cell_size_deg),
+            np.floor(np.asarray(longitude, dtype=float) / cell_size_deg),
+        )).astype(np.int64)
+        if not len(cells):
+            return np.array([], dtype=object)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        cell_provinces = np.array(
+            [cls._cell_province(int(row), int(column), cell_size_deg) for row, column in unique_cells],
+            dtype=object,
+        )
+        return cell_provinces[inverse.reshape(-1)]
+
+    @classmethod
+    def _cell_province(cls, row: int, column: int, cell_size_deg: float) -> Optional[str]:
+        if (row, column) not in cls._cells:
+            if len(cls._cells) >= LocationConfig().province_cache_size:
+                cls._cells.clear()
+            cls._cells[(row, column)] = get_province(
+                (row + 0.5) * cell_size_deg, (column + 0.5) * cell_size_deg, return_closest=True
+            )
+        return cls._cells[(row, column)]
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cells = {}
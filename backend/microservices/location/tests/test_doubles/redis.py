@@ -1,13 +1,44 @@
 import asyncio
+import copy
+import fnmatch
 import time
 from contextlib import asynccontextmanager
-from typing import Optional, Dict, List, Tuple, Callable
+from contextvars import ContextVar
+from typing import Any, Optional, Dict, List, Tuple, Callable
+
+from redis.exceptions import WatchError
+
+# Set by callers (e.g. the fleet benchmark) to attribute traffic to the operation a task runs.
+current_operation: ContextVar[Optional[str]] = ContextVar("fake_redis_operation", default=None)
+
+
+def _record(stats: Optional[Dict[str, Any]], commands: int) -> None:
+    if stats is None:
+        return
+    stats["round_trips"] += 1
+    stats["commands"] += commands
+    operation = current_operation.get()
+    if operation is not None:
+        operation_stats = stats["operations"].setdefault(operation, {"round_trips": 0, "commands": 0})
+        operation_stats["round_trips"] += 1
+        operation_stats["commands"] += commands
+
 
 class FakeAsyncRedisSession:
-    def __init__(self, store: Dict[str, str], expiry_store: Dict[str, float], time_provider: Callable = time.time):
+    def __init__(
+        self,
+        store: Dict[str, str],
+        expiry_store: Dict[str, float],
+        time_provider: Callable = time.time,
+        stats: Optional[Dict[str, Any]] = None,
+    ):
         self.store = store
         self.expiry_store = expiry_store
         self.time_provider = time_provider
+        self.stats = stats
+
+    def _count_round_trip(self):
+        _record(self.stats, 1)
 
     async def __aenter__(self):
         return self
@@ -16,41 +47,150 @@ class FakeAsyncRedisSession:
         pass
 
     async def get(self, key: str) -> Optional[str]:
+        self._count_round_trip()
         current_time = self.time_provider()
         if key in self.expiry_store and self.expiry_store[key] < current_time:
-            await self.delete(key)
+            self.store.pop(key, None)
+            self.expiry_store.pop(key, None)
             return None
         return self.store.get(key)
 
     async def set(self, key: str, value: str, ex: Optional[int] = None):
+        self._count_round_trip()
         self.store[key] = value
         if ex is not None:
             self.expiry_store[key] = self.time_provider() + ex
 
     async def delete(self, key: str):
+        self._count_round_trip()
         self.store.pop(key, None)
         self.expiry_store.pop(key, None)
 
     async def expire(self, key: str, ttl: int):
+        self._count_round_trip()
         if key in self.store:
             self.expiry_store[key] = self.time_provider() + ttl
 
     async def flushdb(self):
+        self._count_round_trip()
         self.store.clear()
         self.expiry_store.clear()
 
-    def pipeline(self):
-        return FakeRedisPipeline(self.store, self.expiry_store, self.time_provider)
+    async def hset(self, key: str, field: str, value: str):
+        self._count_round_trip()
+        self.store.setdefault(key, {})[field] = value
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        self._count_round_trip()
+        return dict(self.store.get(key) or {})
+
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        self._count_round_trip()
+        for key in list(self.store.keys()):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def xadd(self, key: str, fields: Dict[str, Any], maxlen: Optional[int] = None, approximate: bool = True) -> str:
+        self._count_round_trip()
+        stream = self.store.setdefault(key, [])
+        entry_id = f"{len(stream) + 1}-0" if not stream else f"{int(stream[-1][0].split('-')[0]) + 1}-0"
+        stream.append((entry_id, {field: str(value) for field, value in fields.items()}))
+        if maxlen is not None:
+            del stream[:-maxlen]
+        return entry_id
+
+    async def xread(self, streams: Dict[str, str], count: Optional[int] = None, block: Optional[int] = None):
+        self._count_round_trip()
+        response = []
+        for key, last_id in streams.items():
+            last_sequence = int(last_id.split('-')[0]) if last_id != "$" else float("inf")
+            entries = [entry for entry in self.store.get(key, []) if int(entry[0].split('-')[0]) > last_sequence]
+            if count is not None:
+                entries = entries[:count]
+            if entries:
+                response.append([key, entries])
+        return response
+
+    async def xrevrange(self, key: str, max: str = "+", min: str = "-", count: Optional[int] = None):
+        self._count_round_trip()
+        entries = list(reversed(self.store.get(key, [])))
+        return entries[:count] if count is not None else entries
+
+    def _stream_groups(self, key: str) -> Dict[str, Dict[str, Any]]:
+        return self.store.setdefault(f"__stream_groups__:{key}", {})
+
+    @staticmethod
+    def _sequence(entry_id: str) -> int:
+        return int(entry_id.split('-')[0])
+
+    async def xgroup_create(self, name: str, groupname: str, id: str = "$", mkstream: bool = False):
+        self._count_round_trip()
+        groups = self._stream_groups(name)
+        if groupname in groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        stream = self.store.setdefault(name, []) if mkstream else self.store[name]
+        last_sequence = (self._sequence(stream[-1][0]) if stream else 0) if id == "$" else self._sequence(id)
+        groups[groupname] = {"last_sequence": last_sequence, "pending": {}}
+        return True
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+    ):
+        self._count_round_trip()
+        response = []
+        for key, last_id in streams.items():
+            group = self._stream_groups(key)[groupname]
+            stream = self.store.get(key, [])
+            if last_id == ">":
+                entries = [entry for entry in stream if self._sequence(entry[0]) > group["last_sequence"]]
+                entries = entries[:count] if count is not None else entries
+                for entry_id, _ in entries:
+                    group["pending"][entry_id] = consumername
+                if entries:
+                    group["last_sequence"] = self._sequence(entries[-1][0])
+            else:
+                entries = [
+                    entry for entry in stream
+                    if group["pending"].get(entry[0]) == consumername and self._sequence(entry[0]) > self._sequence(last_id)
+                ]
+                entries = entries[:count] if count is not None else entries
+            response.append([key, entries])
+        return response
+
+    async def xack(self, name: str, groupname: str, *ids: str) -> int:
+        self._count_round_trip()
+        pending = self._stream_groups(name)[groupname]["pending"]
+        return sum(1 for entry_id in ids if pending.pop(entry_id, None) is not None)
+
+    def pipeline(self, transaction: bool = True):
+        return FakeRedisPipeline(self.store, self.expiry_store, self.time_provider, self.stats)
 
 class FakeAsyncRedis:
     def __init__(self):
         self.store = {}
         self.expiry_store = {}
         self.time_provider = time.time
+        self.stats = {"round_trips": 0, "commands": 0, "operations": {}}
+
+    @property
+    def round_trips(self) -> int:
+        return self.stats["round_trips"]
+
+    @property
+    def commands(self) -> int:
+        return self.stats["commands"]
+
+    def reset_round_trips(self):
+        self.stats.update(round_trips=0, commands=0, operations={})
 
     @asynccontextmanager
     async def get_or_create_session(self):
-        session = FakeAsyncRedisSession(self.store, self.expiry_store, self.time_provider)
+        session = FakeAsyncRedisSession(self.store, self.expiry_store, self.time_provider, self.stats)
         yield session
 
     async def disconnect(self):
@@ -71,13 +211,39 @@ class FakeAsyncRedis:
         return instance
 
 class FakeRedisPipeline:
-    def __init__(self, store: Dict[str, str], expiry_store: Dict[str, float], time_provider: Callable = time.time):
+    def __init__(
+        self,
+        store: Dict[str, str],
+        expiry_store: Dict[str, float],
+        time_provider: Callable = time.time,
+        stats: Optional[Dict[str, Any]] = None,
+    ):
         self.store = store
         self.expiry_store = expiry_store
         self.time_provider = time_provider
+        self.stats = stats
         self.commands: List[Tuple[Callable, Tuple]] = []
+        # Commands queued on a pipeline are replayed without counting; the execute call is the round-trip.
+        self._session = FakeAsyncRedisSession(store, expiry_store, time_provider)
+        self._watched: Optional[Dict[str, Any]] = None
+
+    async def watch(self, *keys: str):
+        _record(self.stats, 1)
+        self._watched = {key: copy.deepcopy(self.store.get(key)) for key in keys}
+
+    def multi(self):
+        return self
+
+    async def reset(self):
+        self._watched = None
+        self.commands = []
 
     async def execute(self):
+        _record(self.stats, len(self.commands))
+        watched, self._watched = self._watched, None
+        if watched is not None and any(self.store.get(key) != value for key, value in watched.items()):
+            self.commands = []
+            raise WatchError("Watched variable changed.")
         results = []
         for method, args in self.commands:
             result = await method(*args)
@@ -120,3 +286,141 @@ class FakeRedisPipeline:
     async def _expire_key(self, key: str, ttl: int):
         if key in self.store:
             self.expiry_store[key] = self.time_provider() + ttl
+
+    def hset(self, key: str, field: str, value: str):
+        self.commands.append((self._hset, (key, field, value)))
+        return self
+
+    async def _hset(self, key: str, field: str, value: str):
+        self.store.setdefault(key, {})[field] = value
+
+    def hget(self, key: str, field: str):
+        self.commands.append((self._hget, (key, field)))
+        return self
+
+    async def _hget(self, key: str, field: str):
+        return (self.store.get(key) or {}).get(field)
+
+    def hgetall(self, key: str):
+        self.commands.append((self._hgetall, (key,)))
+        return self
+
+    async def _hgetall(self, key: str):
+        return dict(self.store.get(key) or {})
+
+    def hdel(self, key: str, *fields: str):
+        self.commands.append((self._hdel, (key, *fields)))
+        return self
+
+    async def _hdel(self, key: str, *fields: str):
+        hash_value = self.store.get(key) or {}
+        removed = sum(1 for field in fields if hash_value.pop(field, None) is not None)
+        if key in self.store and not hash_value:
+            await self._delete_key(key)
+        return removed
+
+    def sadd(self, key: str, *members: str):
+        self.commands.append((self._sadd, (key, *members)))
+        return self
+
+    async def _sadd(self, key: str, *members: str):
+        members_set = self.store.setdefault(key, set())
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+
+    def srem(self, key: str, *members: str):
+        self.commands.append((self._srem, (key, *members)))
+        return self
+
+    async def _srem(self, key: str, *members: str):
+        members_set = self.store.get(key) or set()
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        if key in self.store and not members_set:
+            await self._delete_key(key)
+        return removed
+
+    def smembers(self, key: str):
+        self.commands.append((self._smembers, (key,)))
+        return self
+
+    async def _smembers(self, key: str):
+        return set(self.store.get(key) or set())
+
+    def scard(self, key: str):
+        self.commands.append((self._scard, (key,)))
+        return self
+
+    async def _scard(self, key: str):
+        return len(self.store.get(key) or set())
+
+    def hlen(self, key: str):
+        self.commands.append((self._hlen, (key,)))
+        return self
+
+    async def _hlen(self, key: str):
+        return len(self.store.get(key) or {})
+
+    def hincrby(self, key: str, field: str, amount: int = 1):
+        self.commands.append((self._hincrby, (key, field, amount)))
+        return self
+
+    async def _hincrby(self, key: str, field: str, amount: int = 1):
+        hash_value = self.store.setdefault(key, {})
+        value = int(hash_value.get(field) or 0) + int(amount)
+        hash_value[field] = str(value)
+        return value
+
+    def zadd(self, key: str, mapping: Dict[str, float]):
+        self.commands.append((self._zadd, (key, mapping)))
+        return self
+
+    async def _zadd(self, key: str, mapping: Dict[str, float]):
+        sorted_set = self.store.setdefault(key, {})
+        added = len(set(mapping) - set(sorted_set))
+        sorted_set.update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    def zrem(self, key: str, *members: str):
+        self.commands.append((self._zrem, (key, *members)))
+        return self
+
+    async def _zrem(self, key: str, *members: str):
+        sorted_set = self.store.get(key) or {}
+        removed = sum(1 for member in members if sorted_set.pop(member, None) is not None)
+        if key in self.store and not sorted_set:
+            await self._delete_key(key)
+        return removed
+
+    def zrangebyscore(self, key: str, min: Any, max: Any):
+        self.commands.append((self._zrangebyscore, (key, min, max)))
+        return self
+
+    async def _zrangebyscore(self, key: str, min: Any, max: Any):
+        sorted_set = self.store.get(key) or {}
+        return [
+            member for member, score in sorted(sorted_set.items(), key=lambda item: item[1])
+            if float(min) <= score <= float(max)
+        ]
+
+    def zrange(self, key: str, start: int, end: int, withscores: bool = False):
+        self.commands.append((self._zrange, (key, start, end, withscores)))
+        return self
+
+    async def _zrange(self, key: str, start: int, end: int, withscores: bool = False):
+        members = sorted((self.store.get(key) or {}).items(), key=lambda item: item[1])
+        members = members[start:None if end == -1 else end + 1]
+        return members if withscores else [member for member, _ in members]
+
+    def zremrangebyscore(self, key: str, min: Any, max: Any):
+        self.commands.append((self._zremrangebyscore, (key, min, max)))
+        return self
+
+    async def _zremrangebyscore(self, key: str, min: Any, max: Any):
+        members = await self._zrangebyscore(key, min, max)
+        return await self._zrem(key, *members)
+
+    def xadd(self, key: str, fields: Dict[str, Any], maxlen: Optional[int] = None, approximate: bool = True):
+        self.commands.append((self._session.xadd, (key, fields, maxlen, approximate)))
+        return self
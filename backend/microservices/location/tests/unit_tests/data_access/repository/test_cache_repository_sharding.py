@@ -0,0 +1,95 @@
+import random
+import time
+
+import h3
+import pytest
+import pytest_asyncio
+
+from config import HexagonConfig
+from data_access.repository.cache_repository import CacheRepository
+from data_access.repository.hash_ring import HashRing
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+from ftgo_utils.geo import haversine
+from test_doubles.redis import FakeAsyncRedis
+
+SHARD_RESOLUTION = 7
+
+
+@pytest_asyncio.fixture
+async def shards(time_machine):
+    connections = [
+        await FakeAsyncRedis.create(host=f"redis-{index}", port=6379, db=0, time_provider=time_machine.current_timestamp)
+        for index in range(3)
+    ]
+    CacheRepository.use_shards(
+        connections,
+        names=[f"redis-{index}:6379/0" for index in range(3)],
+        shard_resolution=SHARD_RESOLUTION,
+    )
+    yield connections
+    CacheRepository.use_shards([connections[0]], shard_resolution=5)
+
+
+def shard_holding(shards, key: str) -> int:
+    return next(index for index, shard in enumerate(shards) if key in shard.store)
+
+
+def test_ring_moves_only_the_removed_shards_keys():
+    keys = [f"driver_{index}" for index in range(3_000)]
+    full = HashRing(["a", "b", "c"])
+    reduced = HashRing(["a", "b"])
+
+    owners = [full.nodes[full.node_index(key)] for key in keys]
+    moved = [key for key, owner in zip(keys, owners) if owner != "c" and reduced.nodes[reduced.node_index(key)] != owner]
+
+    assert {owner: owners.count(owner) for owner in "abc"}.keys() == {"a", "b", "c"}
+    assert min(owners.count(owner) for owner in "abc") > 600
+    assert moved == []
+
+
+@pytest.mark.asyncio
+async def test_keys_follow_region_and_driver_shards(shards):
+    config = HexagonConfig()
+    location = GeoLocation(latitude=35.70, longitude=51.40, timestamp=time.time(), accuracy=5, speed=3)
+    await CacheRepository.execute(Hexagon.move_driver_commands("driver_1", None, location, available=True))
+
+    hex_id = Hexagon.from_location(location).hex_id
+    region_shard = CacheRepository._shard_index(f"{config.cache_key}:{hex_id}")
+    for cell_id in Hexagon.cell_hierarchy(hex_id):
+        if h3.get_resolution(cell_id) >= SHARD_RESOLUTION:
+            assert shard_holding(shards, f"{config.cache_key}:{cell_id}") == region_shard
+            assert shard_holding(shards, f"{config.last_seen_cache_key}:{cell_id}") == region_shard
+    driver_key = f"{config.driver_hexagon_cache_key}:driver_1"
+    assert shard_holding(shards, driver_key) == CacheRepository._ring.node_index("driver_1")
+    assert await CacheRepository.get_cache(config.driver_hexagon_cache_key).fetch("driver_1") == hex_id
+
+
+@pytest.mark.asyncio
+async def test_multi_cell_queries_fan_out_once_per_shard(shards):
+    rng = random.Random(3)
+    drivers = {
+        f"driver_{index}": (35.70 + rng.uniform(-0.05, 0.05), 51.40 + rng.uniform(-0.05, 0.05))
+        for index in range(200)
+    }
+    commands = []
+    for driver_id, (latitude, longitude) in drivers.items():
+        location = GeoLocation(latitude=latitude, longitude=longitude, timestamp=time.time(), accuracy=5, speed=3)
+        commands.extend(Hexagon.move_driver_commands(driver_id, None, location, available=True))
+    await CacheRepository.execute(commands)
+    assert all(shard.store for shard in shards)
+
+    for shard in shards:
+        shard.reset_round_trips()
+    nearest = await Hexagon.get_nearest_drivers(35.70, 51.40, radius_m=3_000, available_only=True)
+
+    assert {driver["driver_id"] for driver in nearest} == {
+        driver_id for driver_id, (latitude, longitude) in drivers.items()
+        if haversine(35.70, 51.40, latitude, longitude) <= 3_000
+    }
+    # Positions, then last-seen and available sets: at most one pipeline per shard for each.
+    assert all(shard.round_trips <= 2 for shard in shards)
+    assert sum(shard.round_trips for shard in shards) > 2
+    assert len(await CacheRepository.get_cache(HexagonConfig().cache_key).scan_keys()) == sum(
+        len([key for key in shard.store if key.startswith(f"{HexagonConfig().cache_key}:")]) for shard in shards
+    )
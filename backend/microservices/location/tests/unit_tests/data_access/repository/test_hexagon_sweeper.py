@@ -0,0 +1,49 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from config import HexagonConfig
+from data_access.repository import CacheRepository, DatabaseRepository, HexagonSweeper
+from domain.driver_location import DriverLocation
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+async def report(driver_id: str, time_machine, latitude: float = 35.70, longitude: float = 51.40):
+    location = GeoLocation(
+        latitude=latitude,
+        longitude=longitude,
+        timestamp=time_machine.current_timestamp(),
+        accuracy=5,
+        speed=3,
+    )
+    await DriverLocation(driver_id, [location], available=True).save_locations()
+
+
+@pytest.mark.asyncio
+async def test_stale_drivers_are_hidden_then_pruned(mock_db_insert, time_machine):
+    config = HexagonConfig()
+    await report("ghost", time_machine)
+    await report("driver_1", time_machine, latitude=35.7001)
+
+    time_machine.advance_time(config.freshness_s)
+    await report("driver_1", time_machine, latitude=35.7001)
+
+    nearest = await Hexagon.get_nearest_drivers(35.70, 51.40, radius_m=500, available_only=True)
+    assert [driver["driver_id"] for driver in nearest] == ["driver_1"]
+
+    time_machine.advance_time(config.cache_ttl - config.freshness_s)
+    await report("driver_1", time_machine, latitude=35.7001)
+
+    assert await HexagonSweeper.sweep() == 1
+    hex_id = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40)).hex_id
+    cell = await CacheRepository.get_cache(config.cache_key).fetch(hex_id, data_type="hash")
+    assert set(cell) == {"driver_1"}
+    assert await CacheRepository.get_cache(config.available_drivers_cache_key).fetch(hex_id, data_type="set") == {"driver_1"}
+    assert await HexagonSweeper.sweep() == 0
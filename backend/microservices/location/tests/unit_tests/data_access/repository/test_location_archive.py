@@ -0,0 +1,101 @@
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import pyarrow.parquet as pq
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from data_access.repository import DatabaseRepository, LocationArchive, LocationPartitions
+from domain.trajectory import Trajectory
+
+DAY = date(2023, 12, 30)
+DAY_START = datetime(2023, 12, 30, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def archive_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCATION_ARCHIVE_PATH", str(tmp_path))
+    monkeypatch.setenv("LOCATION_ARCHIVE_ROW_GROUP_SIZE", "50")
+    return tmp_path
+
+
+def row(index: int, driver_id: str, latitude: float, longitude: float, offset_s: float) -> tuple:
+    timestamp = datetime.fromtimestamp(DAY_START + offset_s, tz=timezone.utc)
+    return f"location_{index}", driver_id, latitude, longitude, 5.0, 3.0, None, timestamp
+
+
+async def batches(rows, size: int = 40):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def day_rows():
+    # driver_1 crosses from Tehran into an unmapped area halfway through the day.
+    rows = [row(index, "driver_1", 35.70, 51.40, index * 60) for index in range(100)]
+    rows += [row(100 + index, "driver_1", 48.85, 2.35, 6_000 + index * 60) for index in range(100)]
+    rows += [row(200 + index, "driver_2", 35.71, 51.41, index * 60) for index in range(100)]
+    return sorted(rows, key=lambda values: (values[1], values[7]))
+
+
+@pytest.mark.asyncio
+async def test_day_is_split_by_province_and_read_back_in_order(archive_path):
+    assert await LocationArchive.write_day(DAY, batches(day_rows())) == 300
+
+    day_path = archive_path / "day=2023-12-30"
+    assert sorted(os.listdir(day_path)) == ["province=Tehran", "province=unknown"]
+    tehran = pq.ParquetFile(day_path / "province=Tehran" / LocationArchive.FILE_NAME)
+    assert tehran.metadata.num_rows == 200
+    assert tehran.metadata.num_row_groups > 1
+
+    points = [
+        point async for point in LocationArchive.stream_trajectory("driver_1", DAY_START, DAY_START + 86_400)
+    ]
+    assert len(points) == 200
+    assert [point[0] for point in points] == sorted(point[0] for point in points)
+    assert points[0] == (DAY_START, pytest.approx(35.70), pytest.approx(51.40))
+
+
+@pytest.mark.asyncio
+async def test_scans_prune_columns_and_time(archive_path):
+    await LocationArchive.write_day(DAY, batches(day_rows()))
+
+    scanned = list(LocationArchive.scan(DAY_START, DAY_START + 3_000, columns=["driver_id"]))
+
+    assert all(batch.schema.names == ["driver_id"] for batch in scanned)
+    assert sum(batch.num_rows for batch in scanned) == 100
+    assert list(LocationArchive.scan(DAY_START - 86_400, DAY_START - 1)) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_export_leaves_previous_copy_and_keeps_partition(archive_path):
+    await LocationArchive.write_day(DAY, batches(day_rows()))
+
+    async def broken_batches():
+        yield day_rows()[:10]
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(Exception):
+        await LocationArchive.write_day(DAY, broken_batches())
+    assert os.listdir(archive_path) == ["day=2023-12-30"]
+    assert sum(batch.num_rows for batch in LocationArchive.scan(DAY_START, DAY_START + 86_400)) == 300
+
+    names = [LocationPartitions.partition_name(DAY), LocationPartitions.partition_name(DAY + timedelta(days=1))]
+    with patch.object(LocationArchive, "export_day", AsyncMock(side_effect=[RuntimeError("disk full"), 0])):
+        assert await LocationPartitions.archive_partitions(names) == names[1:]
+
+
+@pytest.mark.asyncio
+async def test_trajectory_reads_expired_days_from_archive(archive_path, time_machine, monkeypatch):
+    monkeypatch.setenv("LOCATION_RETENTION_DAYS", "1")
+    await LocationArchive.write_day(DAY, batches(day_rows()))
+
+    async def recent_points(*args, **kwargs):
+        yield datetime.fromtimestamp(time_machine.current_timestamp() - 60, tz=timezone.utc), 35.72, 51.42
+
+    with patch.object(DatabaseRepository, "stream", recent_points):
+        trajectory = await Trajectory(
+            "driver_1", DAY_START, time_machine.current_timestamp(), max_points=1_000, method=Trajectory.NONE
+        ).load()
+
+    assert trajectory["raw_point_count"] == 201
+    assert trajectory["points"][-1]["latitude"] == 35.72
@@ -0,0 +1,113 @@
+from contextlib import asynccontextmanager
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from data_access.repository import DatabaseRepository, LocationPartitions
+
+
+class RecordingPostgres:
+    # Records every statement; the maintenance lock is granted only when lock_free is set.
+    def __init__(self, lock_free: bool):
+        self.lock_free = lock_free
+        self.statements = []
+
+    @asynccontextmanager
+    async def get_or_create_session(self):
+        yield self
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        result = MagicMock()
+        result.scalar.return_value = self.lock_free
+        result.all.return_value = [(LocationPartitions.partition_name(date(2024, 1, 1)),)]
+        return result
+
+    async def commit(self):
+        self.statements.append("COMMIT")
+
+
+@pytest.fixture
+def recording_postgres(monkeypatch):
+    def install(lock_free: bool) -> RecordingPostgres:
+        postgres = RecordingPostgres(lock_free)
+        monkeypatch.setattr(DatabaseRepository, "_data_access", postgres)
+        monkeypatch.setenv("LOCATION_ARCHIVE_ENABLED", "false")
+        return postgres
+    return install
+
+
+def test_partition_name_round_trips_to_day():
+    name = LocationPartitions.partition_name(date(2024, 1, 31))
+
+    assert name == "driver_location_p20240131"
+    assert LocationPartitions.partition_day(name) == date(2024, 1, 31)
+    assert LocationPartitions.partition_day("driver_location_default") is None
+
+
+def test_partition_bounds_cover_one_utc_day():
+    statement = LocationPartitions.create_partition_statement(date(2024, 2, 28))
+
+    assert "PARTITION OF driver_location" in statement
+    assert "FROM ('2024-02-28T00:00:00+00:00') TO ('2024-02-29T00:00:00+00:00')" in statement
+
+
+def test_partitions_are_created_ahead_and_expired_after_retention():
+    today = date(2024, 1, 10)
+    names = [LocationPartitions.partition_name(date(2024, 1, day)) for day in range(1, 11)]
+
+    assert LocationPartitions.days_to_create(today, 2) == [date(2024, 1, day) for day in (9, 10, 11, 12)]
+    assert LocationPartitions.expired_partitions(names + ["driver_location_default"], today, 7) == [
+        "driver_location_p20240101",
+        "driver_location_p20240102",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_skipped_while_another_run_holds_the_lock(recording_postgres):
+    postgres = recording_postgres(lock_free=False)
+
+    assert await LocationPartitions.run_maintenance(date(2024, 3, 1)) == []
+    assert postgres.statements == ["SELECT pg_try_advisory_lock(:key)"]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_changes_partitions_in_one_locked_transaction(recording_postgres):
+    postgres = recording_postgres(lock_free=True)
+
+    assert await LocationPartitions.run_maintenance(date(2024, 3, 1)) == ["driver_location_p20240101"]
+
+    ddl_start = postgres.statements.index("SELECT pg_advisory_xact_lock(:key)")
+    ddl = postgres.statements[ddl_start + 1:postgres.statements.index("COMMIT")]
+    assert any(statement.startswith("CREATE TABLE IF NOT EXISTS driver_location_p20240301") for statement in ddl)
+    assert ddl[-1] == "DROP TABLE IF EXISTS driver_location_p20240101"
+    assert postgres.statements[-1] == "SELECT pg_advisory_unlock(:key)"
+
+
+@pytest.mark.asyncio
+async def test_replicas_only_create_upcoming_partitions_under_the_ddl_lock(recording_postgres, monkeypatch):
+    postgres = recording_postgres(lock_free=True)
+    monkeypatch.setenv("LOCATION_PARTITION_PRECREATE_DAYS", "2")
+
+    await LocationPartitions.precreate_partitions(date(2024, 3, 1))
+
+    assert postgres.statements[0] == "SELECT pg_advisory_xact_lock(:key)"
+    assert postgres.statements[-1] == "COMMIT"
+    assert [statement.split()[5] for statement in postgres.statements[1:-1]] == [
+        "driver_location_p20240229", "driver_location_p20240301", "driver_location_p20240302", "driver_location_p20240303",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_initialize_creates_partitions_inline_and_keeps_creating_on_a_loop(recording_postgres, monkeypatch):
+    postgres = recording_postgres(lock_free=True)
+    monkeypatch.setenv("LOCATION_PARTITION_PRECREATE_INTERVAL_S", "3600")
+
+    await LocationPartitions.initialize()
+    try:
+        assert postgres.statements.count("COMMIT") == 1
+        assert LocationPartitions._task is not None and not LocationPartitions._task.done()
+    finally:
+        await LocationPartitions.terminate()
+    assert LocationPartitions._task is None
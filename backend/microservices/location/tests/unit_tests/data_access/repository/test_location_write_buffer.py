@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from data_access.repository import DatabaseRepository, LocationWriteBuffer
+from dto import DriverLocationDTO
+
+
+def make_locations(count: int, driver_id: str = "driver_1"):
+    return [
+        DriverLocationDTO(driver_id=driver_id, latitude=35.7, longitude=51.4, timestamp=1704067200 + i)
+        for i in range(count)
+    ]
+
+
+@pytest_asyncio.fixture
+async def bulk_insert(monkeypatch):
+    monkeypatch.setenv("LOCATION_WRITE_BUFFER_FLUSH_BATCH_SIZE", "10")
+    monkeypatch.setenv("LOCATION_WRITE_BUFFER_FLUSH_INTERVAL_MS", "50")
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_bulk_insert:
+        await LocationWriteBuffer.initialize()
+        yield mock_bulk_insert
+        await LocationWriteBuffer.terminate()
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_flushed_together(bulk_insert):
+    await LocationWriteBuffer.enqueue(make_locations(25))
+    await asyncio.sleep(0.1)
+
+    assert [len(call.args[0]) for call in bulk_insert.await_args_list] == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_waits_for_flush_interval(bulk_insert):
+    await LocationWriteBuffer.enqueue(make_locations(3))
+    await asyncio.sleep(0)
+    bulk_insert.assert_not_awaited()
+
+    await asyncio.sleep(0.1)
+    bulk_insert.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_terminate_drains_buffered_rows(bulk_insert):
+    await LocationWriteBuffer.enqueue(make_locations(7))
+    await LocationWriteBuffer.terminate()
+
+    assert sum(len(call.args[0]) for call in bulk_insert.await_args_list) == 7
@@ -0,0 +1,76 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from data_access.repository import DatabaseRepository, PresenceConsumer
+from domain.driver import Driver
+from ftgo_utils.enums import DriverAvailabilityStatus, DriverStatus
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+async def submit(driver: Driver, timestamp: float) -> None:
+    await driver.submit_locations([
+        {"latitude": 35.70, "longitude": 51.40, "timestamp": timestamp, "accuracy": 5, "speed": 3}
+    ])
+
+
+@pytest.mark.asyncio
+async def test_presence_changes_reach_each_group_once(fake_redis, mock_db_insert, time_machine):
+    dispatch = PresenceConsumer("dispatch", "dispatch-1")
+    dashboard = PresenceConsumer("dashboard", "dashboard-1")
+    await dispatch.ensure_group()
+    await dashboard.ensure_group()
+
+    driver = await Driver.load("driver_1")
+    await submit(driver, time_machine.current_timestamp())
+    await submit(driver, time_machine.current_timestamp())
+    fake_redis.reset_round_trips()
+    await driver.change_availability(DriverAvailabilityStatus.OCCUPIED.value)
+    # Last hexagon lookup plus the single status pipeline, as before the feed existed.
+    assert fake_redis.round_trips == 2
+    await driver.change_status(DriverStatus.OFFLINE.value)
+
+    received = []
+
+    async def handle(events):
+        received.extend(events)
+
+    assert await dispatch.poll(handle) == 3
+    assert [(event["change"], event["status"], event["availability"]) for event in received] == [
+        ("status", DriverStatus.ONLINE.value, DriverAvailabilityStatus.AVAILABLE.value),
+        ("availability", DriverStatus.ONLINE.value, DriverAvailabilityStatus.OCCUPIED.value),
+        ("status", DriverStatus.OFFLINE.value, DriverAvailabilityStatus.OCCUPIED.value),
+    ]
+    assert received[0]["previous_status"] == DriverStatus.OFFLINE.value
+    assert await dispatch.poll(handle) == 0
+    assert len((await dashboard.read())) == 3
+
+
+@pytest.mark.asyncio
+async def test_unacknowledged_events_are_redelivered_after_restart(mock_db_insert, time_machine):
+    consumer = PresenceConsumer("dispatch", "dispatch-1")
+    await consumer.ensure_group()
+    driver = await Driver.load("driver_1")
+    await submit(driver, time_machine.current_timestamp())
+
+    async def crash(events):
+        raise RuntimeError("handler crashed")
+
+    with pytest.raises(RuntimeError):
+        await consumer.poll(crash)
+
+    restarted = PresenceConsumer("dispatch", "dispatch-1")
+    await restarted.ensure_group()
+    received = []
+
+    async def handle(events):
+        received.extend(events)
+
+    assert await restarted.poll(handle) == 1
+    assert received[0]["driver_id"] == "driver_1"
+    assert await restarted.poll(handle) == 0
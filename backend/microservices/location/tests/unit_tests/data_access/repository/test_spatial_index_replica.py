@@ -0,0 +1,108 @@
+import h3
+import pytest
+import pytest_asyncio
+
+from config import HexagonConfig
+from data_access.repository.cache_repository import CacheRepository
+from data_access.repository.spatial_index_replica import SpatialIndexReplica
+
+
+@pytest_asyncio.fixture
+async def replica(cache_repository, setup_and_teardown_cache):
+    SpatialIndexReplica.reset()
+    yield SpatialIndexReplica
+    SpatialIndexReplica.reset()
+
+
+@pytest.mark.asyncio
+async def test_replica_is_not_ready_before_bootstrap(replica):
+    assert replica.is_ready() is False
+
+
+@pytest.mark.asyncio
+async def test_replica_bootstraps_from_hexagon_hashes(replica, time_machine):
+    config = HexagonConfig()
+    hex_a = h3.latlng_to_cell(35.7, 51.4, config.hexagon_resolution)
+    hex_b = h3.latlng_to_cell(35.8, 51.5, config.hexagon_resolution)
+    coarse_hex = h3.cell_to_parent(hex_a, config.hexagon_resolution - 1)
+    hexagon_cache = CacheRepository.get_cache(config.cache_key)
+    await hexagon_cache.insert(hex_a, {"driver_1": {"latitude": 35.7, "longitude": 51.4}}, data_type="hash")
+    await hexagon_cache.insert(hex_b, {"driver_2": {"latitude": 35.8, "longitude": 51.5}}, data_type="hash")
+    await hexagon_cache.insert(coarse_hex, {"driver_1": {"latitude": 35.7, "longitude": 51.4}}, data_type="hash")
+
+    await replica.bootstrap()
+
+    assert replica.is_ready() is True
+    assert replica.get_cell_drivers(hex_a) == {"driver_1": (35.7, 51.4)}
+    assert replica.get_cell_drivers(hex_b) == {"driver_2": (35.8, 51.5)}
+    assert replica.get_cell_drivers(coarse_hex) == {}
+
+
+@pytest.mark.asyncio
+async def test_replica_bootstraps_last_seen_and_availability(replica, time_machine):
+    config = HexagonConfig()
+    hex_a = h3.latlng_to_cell(35.7, 51.4, config.hexagon_resolution)
+    now = time_machine.current_timestamp()
+    drivers = {"driver_1": {"latitude": 35.7, "longitude": 51.4}, "driver_2": {"latitude": 35.7, "longitude": 51.4}}
+    await CacheRepository.get_cache(config.cache_key).insert(hex_a, drivers, data_type="hash")
+    await CacheRepository.execute([
+        CacheRepository.get_cache(config.last_seen_cache_key).command("zadd", hex_a, mapping={"driver_1": now, "driver_2": now - 600}),
+        CacheRepository.get_cache(config.available_drivers_cache_key).command("sadd", hex_a, "driver_1", "driver_2"),
+    ])
+
+    await replica.bootstrap()
+
+    assert replica.get_cells_eligible_drivers([hex_a], now - 60, available_only=True) == {"driver_1"}
+    await replica.publish(replica.build_event(replica.AVAILABILITY, "driver_1", hex_a, available=False))
+    await replica.publish(replica.build_event(replica.TOUCH, "driver_2", hex_a, seen_at=now))
+    await replica.consume()
+    assert replica.get_cells_eligible_drivers([hex_a], now - 60) == {"driver_1", "driver_2"}
+    assert replica.get_cells_eligible_drivers([hex_a], now - 60, available_only=True) == {"driver_2"}
+
+
+@pytest.mark.asyncio
+async def test_replica_applies_published_moves(replica, time_machine):
+    await replica.bootstrap()
+
+    await replica.publish(replica.build_event(replica.ADD, "driver_1", "hex_a", 35.7, 51.4))
+    await replica.publish(replica.build_event(replica.ADD, "driver_1", "hex_b", 35.8, 51.5))
+    applied = await replica.consume()
+
+    assert applied == 2
+    assert replica.get_cell_drivers("hex_a") == {}
+    assert replica.get_cell_drivers("hex_b") == {"driver_1": (35.8, 51.5)}
+
+
+@pytest.mark.asyncio
+async def test_replica_ignores_removal_from_a_stale_cell(replica, time_machine):
+    await replica.bootstrap()
+
+    await replica.publish(replica.build_event(replica.ADD, "driver_1", "hex_b", 35.8, 51.5))
+    await replica.publish(replica.build_event(replica.REMOVE, "driver_1", "hex_a"))
+    await replica.consume()
+
+    assert replica.get_cell_drivers("hex_b") == {"driver_1": (35.8, 51.5)}
+
+
+@pytest.mark.asyncio
+async def test_replica_replays_events_published_during_bootstrap(replica, time_machine, monkeypatch):
+    hexagon_cache = CacheRepository.get_cache(HexagonConfig().cache_key)
+    scan_keys = hexagon_cache.scan_keys
+
+    async def scan_keys_while_a_driver_moves(*args, **kwargs):
+        # Published after the stream position is taken but before the hashes are copied.
+        keys = await scan_keys(*args, **kwargs)
+        await replica.publish(replica.build_event(replica.ADD, "driver_1", "hex_a", 35.7, 51.4))
+        return keys
+
+    monkeypatch.setattr(hexagon_cache, "scan_keys", scan_keys_while_a_driver_moves)
+    await replica.bootstrap()
+    assert replica.get_cell_drivers("hex_a") == {}
+
+    await replica.consume()
+    assert replica.get_cell_drivers("hex_a") == {"driver_1": (35.7, 51.4)}
+
+    await replica.publish(replica.build_event(replica.REMOVE, "driver_1", "hex_a"))
+    await replica.consume()
+
+    assert replica.get_cell_drivers("hex_a") == {}
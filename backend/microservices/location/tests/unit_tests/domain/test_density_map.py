@@ -0,0 +1,92 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from config import HexagonConfig
+from data_access.repository import CacheRepository, DatabaseRepository, HexagonDensityReconciler, HexagonSweeper
+from domain.density_map import DensityMap
+from domain.driver import Driver
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+from ftgo_utils.enums import DriverAvailabilityStatus, DriverStatus
+from ftgo_utils.errors import BaseError
+
+TEHRAN = DensityMap(35.60, 51.20, 35.85, 51.60)
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+async def go_online(driver_id: str, latitude: float, longitude: float, timestamp: float) -> Driver:
+    driver = await Driver.load(driver_id)
+    await driver.change_status(DriverStatus.ONLINE.value)
+    driver = await Driver.load(driver_id)
+    await submit(driver, latitude, longitude, timestamp)
+    return driver
+
+
+async def submit(driver: Driver, latitude: float, longitude: float, timestamp: float) -> None:
+    await driver.submit_locations([
+        {"latitude": latitude, "longitude": longitude, "timestamp": timestamp, "accuracy": 5, "speed": 3}
+    ])
+
+
+async def counters(latitude: float, longitude: float) -> list:
+    hex_id = Hexagon.from_location(GeoLocation(latitude=latitude, longitude=longitude)).hex_id
+    values = await Hexagon.get_density_cache().fetch(Hexagon.cell_hierarchy(hex_id), data_type="hash")
+    return [(int((value or {}).get("online") or 0), int((value or {}).get("available") or 0)) for value in values]
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_moves_and_status_changes(mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    first = await go_online("driver_1", 35.70, 51.40, now)
+    await go_online("driver_2", 35.70005, 51.40005, now)
+    assert await counters(35.70, 51.40) == [(2, 2)] * len(Hexagon.resolutions())
+
+    await first.change_availability(DriverAvailabilityStatus.OCCUPIED.value)
+    assert await counters(35.70, 51.40) == [(2, 1)] * len(Hexagon.resolutions())
+
+    # Moves far enough to change every resolution, then goes offline.
+    await submit(first, 35.80, 51.55, now + 60)
+    assert await counters(35.70, 51.40) == [(1, 1)] * len(Hexagon.resolutions())
+    assert await counters(35.80, 51.55) == [(1, 0)] * len(Hexagon.resolutions())
+    await first.change_status(DriverStatus.OFFLINE.value)
+    assert await counters(35.80, 51.55) == [(0, 0)] * len(Hexagon.resolutions())
+
+    heatmap = await TEHRAN.load()
+    assert heatmap["resolution"] == HexagonConfig().hexagon_resolution
+    assert (heatmap["online"], heatmap["available"]) == (1, 1)
+    coarse = await DensityMap(35.60, 51.20, 35.85, 51.60, resolution=Hexagon.resolutions()[-1]).load()
+    assert [(cell["online"], cell["available"]) for cell in coarse["cells"]] == [(1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_repairs_drift_and_sweeps_stay_counted(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await go_online("driver_1", 35.70, 51.40, now)
+    await go_online("driver_2", 35.75, 51.45, now)
+    hex_id = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40)).hex_id
+    await CacheRepository.execute(Hexagon.density_commands(hex_id, online=5, available=-1))
+
+    assert await HexagonDensityReconciler.reconcile() == 1
+    assert await counters(35.70, 51.40) == [(1, 1)] * len(Hexagon.resolutions())
+    assert await HexagonDensityReconciler.reconcile() == 0
+
+    # driver_2 stops reporting; the sweep prunes it and recounts the cells it touched.
+    time_machine.advance_time(HexagonConfig().cache_ttl - 10)
+    await submit(await Driver.load("driver_1"), 35.70, 51.40, time_machine.current_timestamp())
+    time_machine.advance_time(20)
+    assert await HexagonSweeper.sweep() == 1
+    assert await counters(35.75, 51.45) == [(0, 0)] * len(Hexagon.resolutions())
+    assert (await TEHRAN.load())["online"] == 1
+
+
+def test_heatmap_rejects_boxes_too_large_for_the_coarsest_cells():
+    with pytest.raises(BaseError):
+        DensityMap(25.0, 44.0, 40.0, 63.0).validate()
+    with pytest.raises(BaseError):
+        DensityMap(35.60, 51.20, 35.85, 51.60, resolution=3).validate()
@@ -0,0 +1,105 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from data_access.repository import DatabaseRepository
+from domain.driver import Driver
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+from ftgo_utils.enums import DriverAvailabilityStatus, DriverStatus
+
+# One pipeline for the positions of the queried cells, one for their last-seen and available sets and one
+# batched status read, however many cells and candidates.
+NEAREST_ROUND_TRIPS = 3
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+async def go_online(driver_id: str, latitude: float, longitude: float, timestamp: float) -> Driver:
+    driver = await Driver.load(driver_id)
+    await driver.change_status(DriverStatus.ONLINE.value)
+    driver = await Driver.load(driver_id)
+    await driver.submit_locations([
+        {"latitude": latitude, "longitude": longitude, "timestamp": timestamp, "accuracy": 5, "speed": 3}
+    ])
+    return driver
+
+
+@pytest.mark.asyncio
+async def test_nearest_drivers_skip_unavailable_with_constant_round_trips(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await go_online("driver_1", 35.70000, 51.40000, now)
+    await go_online("driver_2", 35.70010, 51.40010, now)
+    occupied = await go_online("driver_3", 35.70005, 51.40005, now)
+    await occupied.change_availability(DriverAvailabilityStatus.OCCUPIED.value)
+
+    hexagon = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40))
+    assert await hexagon.get_available_drivers() == {"driver_1", "driver_2"}
+
+    fake_redis.reset_round_trips()
+    nearest = await Driver.get_nearest_drivers(35.70, 51.40, radius_m=500)
+
+    assert [driver["driver_id"] for driver in nearest] == ["driver_1", "driver_2"]
+    assert fake_redis.round_trips == NEAREST_ROUND_TRIPS
+
+
+@pytest.mark.asyncio
+async def test_batched_nearest_drivers_match_single_queries_in_one_pass(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await go_online("driver_1", 35.70000, 51.40000, now)
+    await go_online("driver_2", 35.70010, 51.40010, now)
+    await go_online("driver_3", 35.75000, 51.45000, now)
+    locations = [(35.70, 51.40), (35.7501, 51.4501), (35.90, 51.60)]
+
+    single = [await Driver.get_nearest_drivers(latitude, longitude, radius_m=500) for latitude, longitude in locations]
+    fake_redis.reset_round_trips()
+    batched = await Driver.get_nearest_drivers_many(locations, radius_m=500)
+
+    assert batched == single
+    assert [[driver["driver_id"] for driver in drivers] for drivers in batched] == [["driver_1", "driver_2"], ["driver_3"], []]
+    assert fake_redis.round_trips == NEAREST_ROUND_TRIPS
+
+
+@pytest.mark.asyncio
+async def test_going_offline_leaves_available_set(mock_db_insert, time_machine):
+    driver = await go_online("driver_1", 35.70, 51.40, time_machine.current_timestamp())
+    hexagon = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40))
+
+    await driver.change_status(DriverStatus.OFFLINE.value)
+
+    assert await hexagon.get_available_drivers() == set()
+
+
+@pytest.mark.asyncio
+async def test_load_many_does_not_write_defaults(fake_redis, mock_db_insert):
+    fake_redis.reset_round_trips()
+
+    drivers = await Driver.load_many(["unknown_1", "unknown_2"])
+
+    assert not any(driver.is_available() for driver in drivers.values())
+    assert fake_redis.round_trips == 1
+    assert await Driver.get_status_cache().fetch(["unknown_1", "unknown_2"]) == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_batch_occupy_uses_two_round_trips(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    driver_ids = [f"driver_{index}" for index in range(5)]
+    for index, driver_id in enumerate(driver_ids):
+        await go_online(driver_id, 35.70 + index * 0.00005, 51.40, now)
+    hexagon = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40))
+    assert await hexagon.get_available_drivers() == set(driver_ids)
+
+    fake_redis.reset_round_trips()
+    await Driver.change_availability_many(driver_ids[:3] + ["unknown_1"], DriverAvailabilityStatus.OCCUPIED.value)
+
+    assert fake_redis.round_trips == 2
+    assert await hexagon.get_available_drivers() == set(driver_ids[3:])
+    drivers = await Driver.load_many(driver_ids)
+    assert [driver.availability for driver in drivers.values()] == [DriverAvailabilityStatus.OCCUPIED.value] * 3 + [
+        DriverAvailabilityStatus.AVAILABLE.value
+    ] * 2
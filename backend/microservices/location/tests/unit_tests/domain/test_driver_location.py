@@ -0,0 +1,166 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from config import HexagonConfig, LocationConfig
+from data_access.repository import CacheRepository, DatabaseRepository
+from domain.driver_location import DriverLocation
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+
+# Round-trips one submit cost before its reads and writes were batched.
+UNBATCHED_ROUND_TRIPS = {"first": 10, "same_cell": 5, "cell_move": 12}
+# WATCH, one read of the driver's state, one EXEC of every write; the Postgres insert follows the EXEC.
+SUBMIT_ROUND_TRIPS = 3
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+def make_location(latitude: float, longitude: float, timestamp: float) -> GeoLocation:
+    return GeoLocation(latitude=latitude, longitude=longitude, timestamp=timestamp, accuracy=5, speed=3)
+
+
+@pytest.mark.asyncio
+async def test_first_submit_is_one_watched_transaction(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    location = make_location(35.70, 51.40, now)
+    fake_redis.reset_round_trips()
+    round_trips_at_insert = []
+    mock_db_insert.side_effect = lambda *args, **kwargs: round_trips_at_insert.append(fake_redis.round_trips)
+
+    await DriverLocation("driver_1", [location]).save_locations()
+
+    assert fake_redis.round_trips == SUBMIT_ROUND_TRIPS < UNBATCHED_ROUND_TRIPS["first"]
+    assert round_trips_at_insert == [SUBMIT_ROUND_TRIPS]
+    hex_id = Hexagon.from_location(location).hex_id
+    assert await CacheRepository.get_cache(HexagonConfig().driver_hexagon_cache_key).fetch("driver_1") == hex_id
+    hexagon_drivers = await CacheRepository.get_cache(HexagonConfig().cache_key).fetch(hex_id, data_type="hash")
+    assert set(hexagon_drivers) == {"driver_1"}
+    mock_db_insert.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cell_move_is_one_watched_transaction(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    first_location = make_location(35.70, 51.40, now)
+    second_location = make_location(35.80, 51.40, now + 5)
+    await DriverLocation("driver_1", [first_location]).save_locations()
+    fake_redis.reset_round_trips()
+
+    await DriverLocation("driver_1", [second_location]).save_locations()
+
+    assert fake_redis.round_trips == SUBMIT_ROUND_TRIPS < UNBATCHED_ROUND_TRIPS["cell_move"]
+    hexagon_cache = CacheRepository.get_cache(HexagonConfig().cache_key)
+    old_hex_id = Hexagon.from_location(first_location).hex_id
+    new_hex_id = Hexagon.from_location(second_location).hex_id
+    assert await hexagon_cache.fetch(old_hex_id, data_type="hash") is None
+    assert set(await hexagon_cache.fetch(new_hex_id, data_type="hash")) == {"driver_1"}
+    cached_location = await CacheRepository.get_cache(LocationConfig().cache_key).fetch("driver_1")
+    assert cached_location["latitude"] == 35.80
+
+
+@pytest.mark.asyncio
+async def test_cached_location_is_not_persisted_again(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await DriverLocation("driver_1", [make_location(35.70, 51.40, now)]).save_locations()
+    mock_db_insert.reset_mock()
+
+    await DriverLocation("driver_1", [make_location(35.70, 51.41, now + 5)]).save_locations()
+
+    persisted = mock_db_insert.await_args.args[0]
+    assert [dto.longitude for dto in persisted] == [51.41]
+
+
+@pytest.mark.asyncio
+async def test_idle_points_are_thinned_but_refresh_last_seen(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await DriverLocation("driver_1", [make_location(35.70, 51.40, now)]).save_locations()
+    mock_db_insert.reset_mock()
+    time_machine.advance_time(10)
+    later = time_machine.current_timestamp()
+
+    idle_points = [make_location(35.70 + i * 1e-5, 51.40, later - 4 + i) for i in range(5)]
+    fake_redis.reset_round_trips()
+    await DriverLocation("driver_1", idle_points).save_locations()
+
+    assert fake_redis.round_trips == SUBMIT_ROUND_TRIPS < UNBATCHED_ROUND_TRIPS["same_cell"]
+    mock_db_insert.assert_not_awaited()
+    cached_location = await CacheRepository.get_cache(LocationConfig().cache_key).fetch("driver_1")
+    assert cached_location["timestamp"] == now
+    hex_id = Hexagon.from_location(idle_points[0]).hex_id
+    async with fake_redis.get_or_create_session() as session:
+        last_seen = session.store[f"{HexagonConfig().last_seen_cache_key}:{hex_id}"]
+    assert last_seen["driver_1"] == pytest.approx(later)
+
+
+@pytest.mark.asyncio
+async def test_newest_kept_point_is_cached_when_the_latest_one_is_thinned(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    first_location = make_location(35.70, 51.40, now - 30)
+    await DriverLocation("driver_1", [first_location]).save_locations()
+    mock_db_insert.reset_mock()
+
+    moved = make_location(35.72, 51.40, now - 2)
+    # Redundant after the move, so only the moved point is kept.
+    settled = make_location(35.72 + 1e-6, 51.40, now)
+    await DriverLocation("driver_1", [moved, settled]).save_locations()
+
+    persisted = mock_db_insert.await_args.args[0]
+    assert [dto.latitude for dto in persisted] == [35.72]
+    cached_location = await CacheRepository.get_cache(LocationConfig().cache_key).fetch("driver_1")
+    assert cached_location["latitude"] == 35.72
+    new_hex_id = Hexagon.from_location(moved).hex_id
+    assert await CacheRepository.get_cache(HexagonConfig().driver_hexagon_cache_key).fetch("driver_1") == new_hex_id
+    hexagon_cache = CacheRepository.get_cache(HexagonConfig().cache_key)
+    assert await hexagon_cache.fetch(Hexagon.from_location(first_location).hex_id, data_type="hash") is None
+    assert set(await hexagon_cache.fetch(new_hex_id, data_type="hash")) == {"driver_1"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submit_between_read_and_write_is_retried(fake_redis, mock_db_insert, time_machine, monkeypatch):
+    now = time_machine.current_timestamp()
+    start = make_location(35.70, 51.40, now - 20)
+    other = make_location(35.80, 51.40, now - 10)
+    latest = make_location(35.90, 51.40, now)
+    await DriverLocation("driver_1", [start]).save_locations()
+    execute = CacheRepository.execute
+    interleaved = []
+
+    async def execute_with_a_concurrent_submit(commands):
+        values = await execute(commands)
+        if not interleaved:
+            # Another submit for the same driver commits right after this one read its state.
+            interleaved.append(True)
+            await DriverLocation("driver_1", [other]).save_locations()
+        return values
+
+    monkeypatch.setattr(CacheRepository, "execute", execute_with_a_concurrent_submit)
+    mock_db_insert.reset_mock()
+    await DriverLocation("driver_1", [latest]).save_locations()
+
+    # The aborted attempt persisted nothing: one insert for the interleaved submit, one for the retry.
+    assert [[dto.latitude for dto in call.args[0]] for call in mock_db_insert.await_args_list] == [[35.80], [35.90]]
+
+    hexagon_cache = CacheRepository.get_cache(HexagonConfig().cache_key)
+    members = {
+        location.latitude: await hexagon_cache.fetch(Hexagon.from_location(location).hex_id, data_type="hash")
+        for location in (start, other, latest)
+    }
+    assert members[35.70] is None and members[35.80] is None
+    assert set(members[35.90]) == {"driver_1"}
+    assert await CacheRepository.get_cache(HexagonConfig().driver_hexagon_cache_key).fetch("driver_1") == Hexagon.from_location(latest).hex_id
+
+
+@pytest.mark.asyncio
+async def test_less_accurate_fix_within_its_error_is_thinned(mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    driver_location = DriverLocation("driver_1")
+    reference = GeoLocation(latitude=35.70, longitude=51.40, timestamp=now - 120, accuracy=5, speed=0)
+    blurry = GeoLocation(latitude=35.7002, longitude=51.40, timestamp=now - 60, accuracy=40, speed=0)
+    moved = GeoLocation(latitude=35.7010, longitude=51.40, timestamp=now, accuracy=8, speed=3)
+
+    assert driver_location.thin_locations([moved, blurry], reference) == [moved]
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from config import HexagonConfig
+from data_access.repository import CacheRepository, DatabaseRepository, SpatialIndexReplica
+from domain.driver_location import DriverLocation
+from domain.geo_location import GeoLocation
+from domain.hexagon import Hexagon
+from ftgo_utils.geo import haversine
+
+
+@pytest_asyncio.fixture
+async def mock_db_insert(cache_repository, setup_and_teardown_cache):
+    with patch.object(DatabaseRepository, "bulk_insert", new_callable=AsyncMock) as mock_insert:
+        yield mock_insert
+
+
+async def report(driver_id: str, latitude: float, longitude: float, timestamp: float) -> None:
+    location = GeoLocation(latitude=latitude, longitude=longitude, timestamp=timestamp, accuracy=5, speed=3)
+    await DriverLocation(driver_id, [location], available=True).save_locations()
+
+
+async def cell_members(hex_id: str) -> set:
+    cell = await CacheRepository.get_cache(HexagonConfig().cache_key).fetch(hex_id, data_type="hash")
+    return set(cell or ())
+
+
+def test_planner_prefers_fine_cells_for_short_radii():
+    config = HexagonConfig()
+    resolutions = Hexagon.resolutions()
+
+    assert Hexagon.plan_query(300) == (config.hexagon_resolution, 1)
+    for radius_m in (300, 1_000, 3_000, 5_000):
+        resolution, k = Hexagon.plan_query(radius_m)
+        assert resolution in resolutions
+        assert Hexagon.disk_size(k) <= config.max_query_cells
+    assert Hexagon.plan_query(5_000)[0] < config.hexagon_resolution
+    # Beyond what the coarsest resolution covers within budget, it still answers.
+    assert Hexagon.plan_query(50_000)[0] == resolutions[-1]
+
+
+@pytest.mark.asyncio
+async def test_every_resolution_follows_the_driver(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    await report("driver_1", 35.70, 51.40, now)
+    first_cells = Hexagon.cell_hierarchy(Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40)).hex_id)
+    assert len(first_cells) == len(Hexagon.resolutions())
+    for hex_id in first_cells:
+        assert await cell_members(hex_id) == {"driver_1"}
+
+    fake_redis.reset_round_trips()
+    await report("driver_1", 35.80, 51.50, now + 60)
+    second_cells = Hexagon.cell_hierarchy(Hexagon.from_location(GeoLocation(latitude=35.80, longitude=51.50)).hex_id)
+
+    # WATCH, read, EXEC: every resolution moves in the same transaction.
+    assert fake_redis.round_trips == 3
+    for old_hex_id, new_hex_id in zip(first_cells, second_cells):
+        assert await cell_members(new_hex_id) == {"driver_1"}
+        if old_hex_id != new_hex_id:
+            assert await cell_members(old_hex_id) == set()
+
+
+@pytest.mark.asyncio
+async def test_nearest_drivers_match_brute_force_across_radii(fake_redis, mock_db_insert, time_machine):
+    now = time_machine.current_timestamp()
+    rng = random.Random(7)
+    drivers = {
+        f"driver_{index}": (35.70 + rng.uniform(-0.1, 0.1), 51.40 + rng.uniform(-0.1, 0.1))
+        for index in range(300)
+    }
+    for driver_id, (latitude, longitude) in drivers.items():
+        await report(driver_id, latitude, longitude, now)
+
+    for radius_m in (300, 1_000, 3_000, 8_000):
+        expected = {
+            driver_id for driver_id, (latitude, longitude) in drivers.items()
+            if haversine(35.70, 51.40, latitude, longitude) <= radius_m
+        }
+        fake_redis.reset_round_trips()
+        nearest = await Hexagon.get_nearest_drivers(35.70, 51.40, radius_m=radius_m, available_only=True)
+
+        assert {driver["driver_id"] for driver in nearest} == expected
+        assert fake_redis.round_trips <= 2
+
+
+@pytest.mark.asyncio
+async def test_ready_replica_filters_eligibility_without_redis(fake_redis, mock_db_insert, time_machine):
+    SpatialIndexReplica.reset()
+    await SpatialIndexReplica.bootstrap()
+    for driver_id in ("driver_stale", "driver_idle"):
+        await report(driver_id, 35.7001, 51.4001, time_machine.current_timestamp())
+    time_machine.advance_time(HexagonConfig().freshness_s + 1)
+    now = time_machine.current_timestamp()
+    for driver_id in ("driver_1", "driver_2"):
+        await report(driver_id, 35.70, 51.40, now)
+    hex_id = Hexagon.from_location(GeoLocation(latitude=35.70, longitude=51.40)).hex_id
+    await CacheRepository.execute(Hexagon.availability_commands("driver_2", hex_id, available=False))
+    # driver_idle's thinned reports only refresh its last-seen; driver_stale fell out of the window.
+    await CacheRepository.execute(Hexagon.touch_driver_commands("driver_idle", hex_id))
+    from_redis = await Hexagon.get_nearest_drivers(35.70, 51.40, radius_m=300, available_only=False)
+
+    await SpatialIndexReplica.consume()
+    fake_redis.reset_round_trips()
+    eligible = await Hexagon.get_cells_eligible_drivers([hex_id], available_only=False)
+    eligible_available = await Hexagon.get_cells_eligible_drivers([hex_id], available_only=True)
+
+    assert fake_redis.round_trips == 0
+    assert eligible == {driver["driver_id"] for driver in from_redis} == {"driver_1", "driver_2", "driver_idle"}
+    assert eligible_available == {"driver_1", "driver_idle"}
+    SpatialIndexReplica.reset()
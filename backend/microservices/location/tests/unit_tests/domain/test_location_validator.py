@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+
+from ftgo_utils.geo import get_province
+
+from domain.geo_location import GeoLocation
+from domain.location_validator import LocationValidator
+from utils.provinces import ProvinceGrid
+
+NOW = 1_700_000_000
+
+
+@pytest.fixture(autouse=True)
+def clear_province_cells():
+    ProvinceGrid.clear()
+    yield
+    ProvinceGrid.clear()
+
+
+def make_location(**overrides) -> GeoLocation:
+    fields = {"latitude": 35.70, "longitude": 51.40, "timestamp": NOW, "accuracy": 5, "speed": 3, "bearing": 90}
+    fields.update(overrides)
+    return GeoLocation(**fields)
+
+
+def test_batch_reports_a_reason_per_point():
+    locations = [
+        make_location(),
+        make_location(accuracy=5_000),
+        make_location(speed=None),
+        make_location(timestamp=NOW - 3_600),
+        make_location(latitude=120),
+        make_location(bearing=400),
+        make_location(latitude=48.85, longitude=2.35),
+        make_location(accuracy="bad", bearing=None),
+    ]
+
+    validation = LocationValidator.validate(locations, now=NOW)
+
+    assert validation.valid.tolist() == [True, False, False, False, False, False, False, False]
+    assert [LocationValidator.reason_names(int(reasons)) for reasons in validation.reasons] == [
+        [],
+        ["accuracy"],
+        ["speed"],
+        ["timestamp"],
+        ["latitude", "province"],
+        ["bearing"],
+        ["province"],
+        ["accuracy"],
+    ]
+
+
+def test_province_is_resolved_once_per_grid_cell():
+    # 1,000 points scattered within a few hundred metres fall into a handful of cells.
+    locations = [
+        make_location(latitude=35.701 + (index % 10) * 0.0005, longitude=51.401 + (index // 100) * 0.0005)
+        for index in range(1_000)
+    ]
+
+    with patch("utils.provinces.get_province", side_effect=get_province) as province_lookup:
+        first = LocationValidator.validate(locations, now=NOW)
+        lookups = province_lookup.call_count
+        second = LocationValidator.validate(locations, now=NOW)
+
+    assert first.valid.all() and second.valid.all()
+    assert 1 <= lookups <= 4
+    assert province_lookup.call_count == lookups
+
+
+def test_is_valid_rejects_bad_points(time_machine):
+    now = time_machine.current_timestamp()
+
+    assert make_location(timestamp=now).is_valid()
+    assert not make_location(timestamp=now, accuracy=None).is_valid()
+    assert not make_location(timestamp=now - 3_600).is_valid()
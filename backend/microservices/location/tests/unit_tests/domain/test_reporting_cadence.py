@@ -0,0 +1,68 @@
+import math
+import random
+
+from config import ReportingCadenceConfig
+from domain.geo_location import GeoLocation
+from domain.reporting_cadence import ReportingCadence
+
+FIXED_CLIENT_INTERVAL_S = 3
+SHIFT_S = 60 * 60
+METERS_PER_DEGREE = 111_320
+
+
+def make_location(latitude: float, longitude: float, timestamp: float, speed: float) -> GeoLocation:
+    return GeoLocation(latitude=latitude, longitude=longitude, timestamp=timestamp, accuracy=5, speed=speed)
+
+
+def test_parked_driver_backs_off_to_maximum():
+    config = ReportingCadenceConfig()
+    previous = make_location(35.70, 51.40, 0, 0.9)
+    # GPS jitter: a metre per second of reported speed but only a few metres covered in 30 s.
+    latest = make_location(35.70003, 51.40, 30, 1.1)
+
+    assert ReportingCadence.next_interval(latest, previous, available=True) == config.available_max_interval_s
+    assert ReportingCadence.next_interval(latest, previous, available=False) == config.delivery_max_interval_s
+
+
+def test_faster_and_delivering_drivers_report_more_often():
+    city = ReportingCadence.interval_for(8, available=True)
+    highway = ReportingCadence.interval_for(25, available=True)
+    delivering = ReportingCadence.interval_for(8, available=False)
+
+    assert highway < city
+    assert delivering < city
+    assert ReportingCadence.interval_for(500, available=True) == ReportingCadenceConfig().min_interval_s
+
+
+def simulate_driver(rng: random.Random, adaptive: bool) -> int:
+    # Alternates parked, city and arterial legs; a third of the fleet is on a delivery.
+    available = rng.random() > 0.33
+    heading = rng.uniform(0, 2 * math.pi)
+    latitude, longitude = 35.70, 51.40
+    previous = None
+    now = 0.0
+    submits = 0
+    while now < SHIFT_S:
+        phase = int(now // 600) % 3
+        speed = (0.0, rng.uniform(5, 10), rng.uniform(12, 20))[phase]
+        latest = make_location(latitude, longitude, now, speed + rng.uniform(0, 0.8))
+        submits += 1
+        if adaptive:
+            interval = ReportingCadence.next_interval(latest, previous, available)
+        else:
+            interval = FIXED_CLIENT_INTERVAL_S
+        previous = latest
+        step_m = speed * interval
+        latitude += step_m * math.cos(heading) / METERS_PER_DEGREE
+        longitude += step_m * math.sin(heading) / METERS_PER_DEGREE
+        now += interval
+    return submits
+
+
+def test_synthetic_fleet_submits_far_less_often():
+    fleet_size = 100
+    fixed = sum(simulate_driver(random.Random(seed), adaptive=False) for seed in range(fleet_size))
+    adaptive = sum(simulate_driver(random.Random(seed), adaptive=True) for seed in range(fleet_size))
+
+    # Roughly two thirds fewer submits than a fixed 3 s client timer.
+    assert 1 - adaptive / fixed > 0.6
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+import pytest
+from unittest.mock import patch
+
+from data_access.repository import DatabaseRepository
+from domain.trajectory import Trajectory
+from ftgo_utils.errors import BaseError
+
+START_TIME = 1704067200
+
+
+def straight_line(count: int, step_s: float = 1.0):
+    return [(START_TIME + i * step_s, 35.70 + i * 1e-5, 51.40) for i in range(count)]
+
+
+async def aiter(points):
+    for point in points:
+        yield point
+
+
+def fake_stream(points):
+    async def stream(*args, **kwargs):
+        for timestamp, latitude, longitude in points:
+            yield datetime.fromtimestamp(timestamp, tz=timezone.utc), latitude, longitude
+    return stream
+
+
+def test_douglas_peucker_keeps_corners_within_budget():
+    leg_one = straight_line(50)
+    corner = leg_one[-1]
+    leg_two = [(corner[0] + i, corner[1], corner[2] + i * 1e-5) for i in range(1, 51)]
+    points = leg_one + leg_two
+
+    simplified = Trajectory.douglas_peucker(points, max_points=3)
+
+    assert simplified == [points[0], corner, points[-1]]
+
+
+@pytest.mark.asyncio
+async def test_time_bucket_returns_at_most_max_points():
+    points = straight_line(1000)
+
+    sampled = [point async for point in Trajectory.time_bucket(aiter(points), START_TIME, START_TIME + 1000, 11)]
+
+    assert len(sampled) == 11
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+
+
+@pytest.mark.asyncio
+async def test_load_streams_and_downsamples(time_machine):
+    points = straight_line(600)
+    with patch.object(DatabaseRepository, "stream", fake_stream(points)):
+        trajectory = await Trajectory("driver_1", START_TIME, START_TIME + 600, max_points=50).load()
+
+    assert trajectory["raw_point_count"] == 600
+    assert len(trajectory["points"]) == 50
+    assert trajectory["points"][0]["timestamp"] == START_TIME
+
+
+@pytest.mark.asyncio
+async def test_load_rejects_inverted_window():
+    with pytest.raises(BaseError):
+        await Trajectory("driver_1", START_TIME, START_TIME - 1).load()
@@ -0,0 +1,108 @@
+import argparse
+import math
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from domain.dispatch import Assignments, Candidates, DispatchAssignment
+
+# Driver dispatch simulated in memory: deliveries arrive every tick at random pickups in a square
+# city and idle drivers are matched to them either one delivery at a time (a nearest-driver query
+# per delivery, first come first served) or once per tick over the whole batch with the greedy or
+# Hungarian solver. Assigned drivers leave the pool for a few ticks. No services are needed.
+#
+#   PYTHONPATH=src python -m benchmarks.dispatch --drivers 400 --deliveries-per-tick 60 --ticks 200
+
+Point = Tuple[float, float]
+
+
+def distance(a: Point, b: Point) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def nearest(pickup: Point, drivers: Dict[str, Point], radius: float, limit: int) -> List[Tuple[str, float]]:
+    found = sorted(
+        (driver_distance, driver_id)
+        for driver_id, position in drivers.items()
+        if (driver_distance := distance(pickup, position)) <= radius
+    )
+    return [(driver_id, driver_distance) for driver_distance, driver_id in found[:limit]]
+
+
+def one_at_a_time(pickups: Dict[str, Point], drivers: Dict[str, Point], radius: float, limit: int) -> Tuple[Assignments, int]:
+    assignments: Assignments = {}
+    idle = dict(drivers)
+    for delivery_id, pickup in pickups.items():
+        candidates = nearest(pickup, idle, radius, limit)
+        if candidates:
+            assignments[delivery_id] = candidates[0]
+            idle.pop(candidates[0][0])
+    return assignments, len(pickups)
+
+
+def batched(solver: Callable[[Candidates], Assignments]):
+    def dispatch(pickups: Dict[str, Point], drivers: Dict[str, Point], radius: float, limit: int) -> Tuple[Assignments, int]:
+        candidates = {delivery_id: nearest(pickup, drivers, radius, limit) for delivery_id, pickup in pickups.items()}
+        return solver(candidates), 1
+    return dispatch
+
+
+def simulate(strategy: Callable, args: argparse.Namespace) -> Dict[str, float]:
+    rng = random.Random(args.seed)
+    point = lambda: (rng.uniform(0, args.city_m), rng.uniform(0, args.city_m))
+    drivers = {f"driver_{index}": point() for index in range(args.drivers)}
+    busy_until: Dict[str, int] = {}
+    pending: Dict[str, Point] = {}
+    assigned, queries, total_distance, solve_time, waited = 0, 0, 0.0, 0.0, 0
+    for tick in range(args.ticks):
+        for driver_id in [driver_id for driver_id, until in busy_until.items() if until <= tick]:
+            busy_until.pop(driver_id)
+            drivers[driver_id] = point()
+        for _ in range(args.deliveries_per_tick):
+            pending[f"delivery_{tick}_{len(pending)}"] = point()
+        idle = {driver_id: position for driver_id, position in drivers.items() if driver_id not in busy_until}
+        started_at = time.perf_counter()
+        assignments, tick_queries = strategy(pending, idle, args.radius_m, args.candidates)
+        solve_time += time.perf_counter() - started_at
+        queries += tick_queries
+        for delivery_id, (driver_id, pickup_distance) in assignments.items():
+            pending.pop(delivery_id)
+            busy_until[driver_id] = tick + rng.randint(3, 8)
+            total_distance += pickup_distance
+        assigned += len(assignments)
+        waited += len(pending)
+    return {
+        "assigned": assigned,
+        "avg_pickup_m": total_distance / assigned if assigned else 0.0,
+        "avg_waiting": waited / args.ticks,
+        "location_queries": queries,
+        "assignments_per_s": assigned / solve_time if solve_time else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Driver dispatch: one delivery at a time vs batched greedy/Hungarian")
+    parser.add_argument("--drivers", type=int, default=400)
+    parser.add_argument("--deliveries-per-tick", type=int, default=60)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--city-m", type=float, default=10_000)
+    parser.add_argument("--radius-m", type=float, default=3_000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    strategies = {
+        "single": one_at_a_time,
+        "greedy": batched(DispatchAssignment.greedy),
+        "hungarian": batched(DispatchAssignment.hungarian),
+    }
+    print(f"{'strategy':>9} {'assigned':>9} {'pickup_m':>9} {'waiting':>8} {'queries':>8} {'assign/s':>10}")
+    for name, strategy in strategies.items():
+        result = simulate(strategy, args)
+        print(
+            f"{name:>9} {result['assigned']:>9} {result['avg_pickup_m']:>9.0f} {result['avg_waiting']:>8.1f} "
+            f"{result['location_queries']:>8} {result['assignments_per_s']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from bson import DBRef, ObjectId
+from dotenv import load_dotenv
+
+from data_access.db_repository import DatabaseRepository
+
+# Order create/read latency with items and status history stored as Link references to their
+# own collections (the previous layout) against embedded subdocuments. Needs a MongoDB reachable
+# through the usual MONGO_* settings; it writes to scratch collections and drops them afterwards.
+#
+#   PYTHONPATH=src python -m benchmarks.order_documents --orders 2000 --items 4 --statuses 5
+
+load_dotenv()
+
+LINKED_ORDERS = "benchmark_orders_linked"
+LINKED_ITEMS = "benchmark_order_items"
+LINKED_STATUS = "benchmark_order_status"
+EMBEDDED_ORDERS = "benchmark_orders_embedded"
+
+
+def order_fields(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "customer_id": f"customer_{rng.randrange(10_000)}",
+        "restaurant_id": f"restaurant_{rng.randrange(500)}",
+        "total_amount": 0,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def item_fields(rng: random.Random) -> Dict[str, Any]:
+    quantity, price = rng.randint(1, 3), round(rng.uniform(2, 30), 2)
+    return {
+        "menu_item_id": f"item_{rng.randrange(5_000)}",
+        "quantity": quantity,
+        "item_price": price,
+        "subtotal": quantity * price,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def status_fields(status: str) -> Dict[str, Any]:
+    return {"status": status, "created_at": datetime.utcnow()}
+
+
+STATUSES = ["placed", "confirmed", "preparing", "ready_for_pickup", "out_for_delivery", "delivered"]
+
+
+async def create_linked(database, rng: random.Random, items: int, statuses: int) -> ObjectId:
+    # One insert per linked document, as Beanie's write rule does for Link fields.
+    order_id = ObjectId()
+    item_refs, status_refs = [], []
+    for _ in range(items):
+        result = await database[LINKED_ITEMS].insert_one({"order_id": str(order_id), **item_fields(rng)})
+        item_refs.append(DBRef(LINKED_ITEMS, result.inserted_id))
+    for status in STATUSES[:statuses]:
+        result = await database[LINKED_STATUS].insert_one({"order_id": str(order_id), **status_fields(status)})
+        status_refs.append(DBRef(LINKED_STATUS, result.inserted_id))
+    await database[LINKED_ORDERS].insert_one({
+        "_id": order_id, **order_fields(rng), "order_items": item_refs, "status_history": status_refs,
+    })
+    return order_id
+
+
+async def read_linked(database, order_id: ObjectId) -> Dict[str, Any]:
+    order = await database[LINKED_ORDERS].find_one({"_id": order_id})
+    order["order_items"] = await database[LINKED_ITEMS].find(
+        {"_id": {"$in": [ref.id for ref in order["order_items"]]}}
+    ).to_list(length=None)
+    order["status_history"] = await database[LINKED_STATUS].find(
+        {"_id": {"$in": [ref.id for ref in order["status_history"]]}}
+    ).to_list(length=None)
+    return order
+
+
+async def create_embedded(database, rng: random.Random, items: int, statuses: int) -> ObjectId:
+    history = [status_fields(status) for status in STATUSES[:statuses]]
+    result = await database[EMBEDDED_ORDERS].insert_one({
+        **order_fields(rng),
+        "order_items": [item_fields(rng) for _ in range(items)],
+        "status_history": history,
+        "status": history[-1] if history else None,
+        "schema_version": 2,
+    })
+    return result.inserted_id
+
+
+async def read_embedded(database, order_id: ObjectId) -> Dict[str, Any]:
+    return await database[EMBEDDED_ORDERS].find_one({"_id": order_id})
+
+
+async def timed(operation: Callable, *args) -> Tuple[float, Any]:
+    started_at = time.perf_counter()
+    result = await operation(*args)
+    return time.perf_counter() - started_at, result
+
+
+def summary(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"{p50:>8.2f} {p99:>8.2f}"
+
+
+async def run(args: argparse.Namespace) -> None:
+    await DatabaseRepository.initialize()
+    database = DatabaseRepository.get_database()
+    layouts = {"linked": (create_linked, read_linked), "embedded": (create_embedded, read_embedded)}
+    try:
+        print(f"{'layout':>9} {'create_p50':>10} {'p99':>8} {'read_p50':>9} {'p99':>8}")
+        for name, (create, read) in layouts.items():
+            rng = random.Random(args.seed)
+            create_latencies, order_ids = [], []
+            for _ in range(args.orders):
+                latency, order_id = await timed(create, database, rng, args.items, args.statuses)
+                create_latencies.append(latency)
+                order_ids.append(order_id)
+            rng.shuffle(order_ids)
+            read_latencies = [(await timed(read, database, order_id))[0] for order_id in order_ids]
+            create_p50, create_p99 = summary(create_latencies).split()
+            print(f"{name:>9} {create_p50:>10} {create_p99:>8} {summary(read_latencies)}")
+    finally:
+        for collection in (LINKED_ORDERS, LINKED_ITEMS, LINKED_STATUS, EMBEDDED_ORDERS):
+            await database.drop_collection(collection)
+        await DatabaseRepository.terminate()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Order create/read latency: linked vs embedded items and history")
+    parser.add_argument("--orders", type=int, default=2_000)
+    parser.add_argument("--items", type=int, default=4)
+    parser.add_argument("--statuses", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
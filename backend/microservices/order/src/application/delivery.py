@@ -6,9 +6,11 @@ class DeliveryService:
     @staticmethod
     async def schedule_delivery(
         order_id: str,
-        driver_id: str,
+        driver_id: Optional[str],
         source_address_id: str,
         destination_address_id: str,
+        pickup_latitude: Optional[float] = None,
+        pickup_longitude: Optional[float] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         return await DeliveryHandler.schedule_delivery(
@@ -16,6 +18,8 @@ class DeliveryService:
             driver_id=driver_id,
             source_address_id=source_address_id,
             destination_address_id=destination_address_id,
+            pickup_latitude=pickup_latitude,
+            pickup_longitude=pickup_longitude,
             **kwargs
         )
 
@@ -6,18 +6,34 @@ class OrderService:
     async def create_order(
         customer_id: str,
         restaurant_id: str,
-        order_items_data: List[Dict[str, Any]],
+        order_items: List[Dict[str, Any]],
         special_instructions: Optional[str] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         return await OrderHandler.create_order(
             customer_id=customer_id,
             restaurant_id=restaurant_id,
-            order_items_data=order_items_data,
+            order_items=order_items,
             special_instructions=special_instructions,
             **kwargs
         )
 
+    @staticmethod
+    async def get_history(
+        customer_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return await OrderHandler.get_order_history(
+            customer_id=customer_id,
+            cursor=cursor,
+            limit=limit,
+            fields=fields,
+            **kwargs
+        )
+
     @staticmethod
     async def update_order(order_id: str, updated_items_data: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
         return await OrderHandler.update_order(order_id, updated_items_data, **kwargs)
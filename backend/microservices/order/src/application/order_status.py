@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional
 from ftgo_utils.enums import OrderStatus as OrderStatusEnum
 from domain.order_status import OrderStatusHandler
 
@@ -13,6 +13,16 @@ class OrderStatusService:
             **kwargs
         )
 
+    @staticmethod
+    async def change_many_order_statuses(order_ids: List[str], new_status: OrderStatusEnum, changed_by: Optional[str] = None, comments: Optional[str] = None, restaurant_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        return await OrderStatusHandler.change_many_order_statuses(
+            order_ids=order_ids,
+            new_status=new_status,
+            changed_by=changed_by,
+            comments=comments,
+            match={"restaurant_id": restaurant_id} if restaurant_id else None,
+        )
+
     @staticmethod
     async def cancel_order(order_id: str, **kwargs) -> Dict[str, Any]:
         return await OrderStatusHandler.cancel_order(order_id, **kwargs)
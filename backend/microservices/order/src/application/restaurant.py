@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional
 from ftgo_utils.enums import OrderStatus as OrderStatusEnum
 from domain.restaurant import RestaurantHandler
 
@@ -7,6 +7,14 @@ class RestaurantService:
     async def confirm_order(order_id: str, **kwargs) -> Dict[str, Any]:
         return await RestaurantHandler.confirm_order(order_id, **kwargs)
 
+    @staticmethod
+    async def confirm_orders(order_ids: List[str], **kwargs) -> Dict[str, Any]:
+        return await RestaurantHandler.confirm_orders(order_ids, **kwargs)
+
     @staticmethod
     async def reject_order(order_id: str, reason: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         return await RestaurantHandler.reject_order(order_id, reason, **kwargs)
+
+    @staticmethod
+    async def get_order_rollups(restaurant_id: str, start_day: str, end_day: str, **kwargs) -> Dict[str, Any]:
+        return await RestaurantHandler.get_order_rollups(restaurant_id, start_day, end_day)
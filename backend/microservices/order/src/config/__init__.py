@@ -3,3 +3,8 @@ from config.service import ServiceConfig
 from config.db import MongoConfig
 from config.enums import LayerNames
 from config.cache import RedisConfig
+from config.metrics import MetricsConfig
+from config.order_cache import OrderCacheConfig
+from config.outbox import OutboxConfig
+from config.dispatch import DispatchConfig
+from config.rollup import RollupConfig
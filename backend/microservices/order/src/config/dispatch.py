@@ -0,0 +1,22 @@
+from config.base import BaseConfig, env_var
+
+class DispatchConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        tick_interval_s: float = None,
+        batch_size: int = None,
+        search_radius_m: int = None,
+        candidates_per_delivery: int = None,
+        hungarian_max_size: int = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "DISPATCH_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.tick_interval_s = tick_interval_s or env_var("DISPATCH_TICK_INTERVAL_S", default=2.0, cast_type=float)
+        # Pending deliveries matched per tick, oldest first.
+        self.batch_size = batch_size or env_var("DISPATCH_BATCH_SIZE", default=500, cast_type=int)
+        self.search_radius_m = search_radius_m or env_var("DISPATCH_SEARCH_RADIUS_M", default=3000, cast_type=int)
+        self.candidates_per_delivery = candidates_per_delivery or env_var("DISPATCH_CANDIDATES_PER_DELIVERY", default=10, cast_type=int)
+        # Batches up to this many deliveries and drivers are solved optimally; larger ones greedily.
+        self.hungarian_max_size = hungarian_max_size or env_var("DISPATCH_HUNGARIAN_MAX_SIZE", default=60, cast_type=int)
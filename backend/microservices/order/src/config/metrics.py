@@ -0,0 +1,12 @@
+from config.base import BaseConfig, env_var
+
+class MetricsConfig(BaseConfig):
+    def __init__(
+        self,
+        enabled: bool = None,
+        port: int = None,
+    ):
+        self.enabled = enabled if enabled is not None else env_var(
+            "METRICS_ENABLED", default=True, cast_type=lambda s: str(s).lower() in ['true', '1']
+        )
+        self.port = port or env_var("METRICS_PORT", default=9100, cast_type=int)
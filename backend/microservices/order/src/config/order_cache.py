@@ -0,0 +1,14 @@
+from config.base import BaseConfig, env_var
+
+class OrderCacheConfig(BaseConfig):
+    def __init__(
+        self,
+        group: str = None,
+        active_ttl_s: int = None,
+        terminal_grace_ttl_s: int = None,
+    ):
+        self.group = group or env_var("ORDER_CACHE_GROUP", default="order")
+        # Upper bound for an active order's entry; every write refreshes it.
+        self.active_ttl_s = active_ttl_s or env_var("ORDER_CACHE_ACTIVE_TTL_S", default=3600, cast_type=int)
+        # Delivered, cancelled and rejected orders stay cached only briefly for follow-up reads.
+        self.terminal_grace_ttl_s = terminal_grace_ttl_s or env_var("ORDER_CACHE_TERMINAL_GRACE_TTL_S", default=60, cast_type=int)
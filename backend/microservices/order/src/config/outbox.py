@@ -0,0 +1,15 @@
+from config.base import BaseConfig, env_var
+
+class OutboxConfig(BaseConfig):
+    def __init__(
+        self,
+        exchange: str = None,
+        relay_interval_s: float = None,
+        batch_size: int = None,
+    ):
+        # Topic exchange order events are published on, routed by order.<status>.
+        self.exchange = exchange or env_var("ORDER_EVENTS_EXCHANGE", default="order.events")
+        # Pause between relay passes once the outbox is drained.
+        self.relay_interval_s = relay_interval_s or env_var("ORDER_OUTBOX_RELAY_INTERVAL_S", default=0.5, cast_type=float)
+        # Orders with pending events read per relay pass.
+        self.batch_size = batch_size or env_var("ORDER_OUTBOX_BATCH_SIZE", default=200, cast_type=int)
@@ -0,0 +1,17 @@
+from config.base import BaseConfig, env_var
+
+class RollupConfig(BaseConfig):
+    def __init__(
+        self,
+        backfill_batch_size: int = None,
+        max_range_days: int = None,
+        applied_events_kept: int = None,
+        rebuild_retries: int = None,
+    ):
+        # Orders scanned per rebuild round for the (restaurant, day) keys they fall on.
+        self.backfill_batch_size = backfill_batch_size or env_var("ROLLUP_BACKFILL_BATCH_SIZE", default=5000, cast_type=int)
+        self.max_range_days = max_range_days or env_var("ROLLUP_MAX_RANGE_DAYS", default=366, cast_type=int)
+        # Event ids remembered per rollup to skip replays; only events still in an outbox can replay.
+        self.applied_events_kept = applied_events_kept or env_var("ROLLUP_APPLIED_EVENTS_KEPT", default=1000, cast_type=int)
+        # Recounts of one key before a rebuild gives up on a key the relay keeps changing.
+        self.rebuild_retries = rebuild_retries or env_var("ROLLUP_REBUILD_RETRIES", default=10, cast_type=int)
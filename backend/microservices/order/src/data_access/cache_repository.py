@@ -1,8 +1,9 @@
 import json
-from typing import List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 from aredis_client import AsyncRedis
-from ftgo_utils.errors import ErrorCodes
+from ftgo_utils.errors import BaseError, ErrorCodes
+from redis.exceptions import WatchError
 
 from config import RedisConfig
 from data_access import get_logger
@@ -95,7 +96,8 @@ class CacheRepository(BaseRepository):
         keys: Union[str, List[str]],
         values: Union[str, dict, List[Union[str, dict]]],
         ttl: Optional[int] = None,
-        data_type: str = "string"
+        data_type: str = "string",
+        nx: bool = False,
     ) -> None:
         to_insert_keys = [keys] if isinstance(keys, str) else keys
         to_insert_values = [values] if not isinstance(values, list) else values
@@ -112,13 +114,53 @@ class CacheRepository(BaseRepository):
                         for item in value:
                             pipeline.rpush(cls._prefixed_key(key), cls._serialize_value(item))
                     else:
-                        pipeline.set(cls._prefixed_key(key), cls._serialize_value(value), ex=ttl)
+                        pipeline.set(cls._prefixed_key(key), cls._serialize_value(value), ex=ttl, nx=nx)
                 await pipeline.execute()
         except Exception as e:
             payload = {"keys": keys, "values": values, "ttl": ttl}
             get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
 
+    @classmethod
+    async def insert_if(
+        cls,
+        keys: List[str],
+        values: List[Union[str, dict]],
+        should_replace: Callable[[Any, Union[str, dict]], bool],
+        ttl: Optional[int] = None,
+        retries: int = 10,
+    ) -> List[str]:
+        # Optimistic check-and-set: the keys are WATCHed and read, and each value is written only
+        # where should_replace(current, value) holds. A concurrent write to any of the keys aborts
+        # EXEC and the round is repeated with fresh values. Returns the keys that were written.
+        try:
+            async with cls._data_access.get_or_create_session() as session:
+                for _ in range(retries):
+                    pipeline = session.pipeline()
+                    try:
+                        await pipeline.watch(*(cls._prefixed_key(key) for key in keys))
+                        current = await cls.fetch(keys)
+                        to_write = [
+                            (key, value) for key, value, cached in zip(keys, values, current)
+                            if should_replace(cached, value)
+                        ]
+                        if not to_write:
+                            return []
+                        pipeline.multi()
+                        for key, value in to_write:
+                            pipeline.set(cls._prefixed_key(key), cls._serialize_value(value), ex=ttl)
+                        await pipeline.execute()
+                        return [key for key, _ in to_write]
+                    except WatchError:
+                        continue
+                    finally:
+                        await pipeline.reset()
+            raise BaseError(error_code=ErrorCodes.CACHE_INSERT_ERROR, payload={"keys": keys, "retries": retries})
+        except Exception as e:
+            payload = {"keys": keys, "ttl": ttl}
+            get_logger().error(ErrorCodes.CACHE_INSERT_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.CACHE_INSERT_ERROR, payload=payload)
+
     @classmethod
     async def delete(
         cls,
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Optional
+
+import aio_pika
+from ftgo_utils.errors import ErrorCodes
+
+from config import LayerNames, OutboxConfig
+from config.broker import BrokerConfig
+from data_access import get_logger
+from utils import handle_exception
+
+
+class EventPublisher:
+    # Publishes order events on a durable topic exchange. The RPC client only speaks
+    # request/response, so events get their own connection with publisher confirms: publish
+    # returns once the broker has taken the message.
+    _connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+    _exchange: Optional[aio_pika.abc.AbstractExchange] = None
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if cls._connection is not None:
+            return
+        broker_config = BrokerConfig()
+        try:
+            cls._connection = await aio_pika.connect_robust(
+                host=broker_config.host,
+                port=broker_config.port,
+                login=broker_config.user,
+                password=broker_config.password,
+                virtualhost=broker_config.vhost,
+            )
+            channel = await cls._connection.channel(publisher_confirms=True)
+            cls._exchange = await channel.declare_exchange(
+                OutboxConfig().exchange, aio_pika.ExchangeType.TOPIC, durable=True,
+            )
+        except Exception as e:
+            payload = {"host": broker_config.host, "port": broker_config.port, "exchange": OutboxConfig().exchange}
+            get_logger(layer=LayerNames.MESSAGE_BROKER.value).error(ErrorCodes.RABBITMQ_CONNECTION_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.RABBITMQ_CONNECTION_ERROR, payload=payload)
+
+    @classmethod
+    async def publish(cls, routing_key: str, body: Dict[str, Any], message_id: str) -> None:
+        # message_id is the event id; consumers dedupe on it since delivery is at-least-once.
+        await cls._exchange.publish(
+            aio_pika.Message(
+                json.dumps(body).encode(),
+                message_id=message_id,
+                content_type="application/json",
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=routing_key,
+        )
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._connection is not None:
+            await cls._connection.close()
+            cls._connection = None
+            cls._exchange = None
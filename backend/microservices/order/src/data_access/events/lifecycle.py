@@ -6,6 +6,8 @@ from data_access import get_logger
 from data_access.broker import RPCBroker
 from data_access.cache_repository import CacheRepository
 from data_access.db_repository import DatabaseRepository
+from data_access.event_publisher import EventPublisher
+from data_access.outbox_relay import OrderOutboxRelay
 
 
 async def setup() -> None:
@@ -16,13 +18,21 @@ async def setup() -> None:
     logger.info("Connected to MongoDB")
     await RPCBroker.initialize(asyncio.get_event_loop())
     logger.info("Connected to RabbitMQ")
+    await EventPublisher.initialize()
+    logger.info("Connected to the order events exchange")
+    await OrderOutboxRelay.initialize()
+    logger.info("Started order outbox relay")
 
 
 async def teardown() -> None:
     logger = get_logger()
+    await OrderOutboxRelay.terminate()
+    logger.info("Stopped order outbox relay")
     await CacheRepository.terminate()
     get_logger().info("Disconnected from Redis")
     await DatabaseRepository.terminate()
     logger.info("Disconnected from MongoDB")
+    await EventPublisher.terminate()
+    logger.info("Disconnected from the order events exchange")
     await RPCBroker.terminate()
     logger.info("Disconnected from RabbitMQ")
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List
+
+from ftgo_utils.enums import ResponseStatus
+from ftgo_utils.errors import ErrorCodes, BaseError
+
+from config import LayerNames
+from data_access import get_logger
+from data_access.broker import RPCBroker
+
+
+class LocationService:
+    @staticmethod
+    async def _call(event: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        response = await RPCBroker.get_client().call(event, data=data)
+        if response.get("status") != ResponseStatus.SUCCESS.value:
+            payload = {"event": event, "error_code": response.get("error_code")}
+            get_logger(layer=LayerNames.MESSAGE_BROKER.value).error(ErrorCodes.GET_NEAREST_DRIVERS_ERROR.value, payload=payload)
+            raise BaseError(error_code=ErrorCodes.GET_NEAREST_DRIVERS_ERROR, payload=payload)
+        return response
+
+    @classmethod
+    async def get_nearest_drivers_many(
+        cls,
+        locations: List[Dict[str, float]],
+        radius: float,
+        max_count: int,
+    ) -> List[List[Dict[str, Any]]]:
+        response = await cls._call(
+            "location.drivers.get_nearest_many",
+            {"locations": locations, "radius": radius, "max_count": max_count},
+        )
+        return [result["drivers"] for result in response["results"]]
+
+    @classmethod
+    async def set_drivers_occupied(cls, driver_ids: List[str]) -> None:
+        await cls._call("driver.availability.occupied_many", {"driver_ids": driver_ids})
@@ -0,0 +1,125 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from beanie import PydanticObjectId
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import ErrorCodes
+
+from config import OrderCacheConfig
+from data_access import get_logger
+from data_access.cache_repository import CacheRepository
+from models.order import Order as OrderDocument
+from utils.metrics import (
+    ORDER_CACHE_HIT_RATIO,
+    ORDER_CACHE_LOOKUPS,
+    ORDER_CACHE_MONGO_READS_SAVED,
+    ORDER_CACHE_WRITES,
+)
+
+
+class OrderCache:
+    # Read-through cache of serialized order documents for orders that can still change.
+    # Writers put the document they just wrote (write-through), so an active order is always
+    # served from Redis; once an order is terminal its entry only lives for a short grace TTL.
+    # Redis failures never fail the caller: reads fall back to MongoDB and writes drop the
+    # entry instead. Write-throughs only replace an entry that is not newer than their document
+    # (by updated_at), so writers finishing out of order cannot leave a stale order cached, and
+    # read-through fills use SET NX so they cannot overwrite a newer write-through.
+    TERMINAL_STATUSES = frozenset({
+        OrderStatus.DELIVERED.value, OrderStatus.CANCELLED.value, OrderStatus.REJECTED.value,
+    })
+    _lookups = 0
+    _hits = 0
+
+    @staticmethod
+    def _cache():
+        return CacheRepository.get_cache(OrderCacheConfig().group)
+
+    @classmethod
+    def is_terminal(cls, document: OrderDocument) -> bool:
+        return document.status is not None and document.status.status in cls.TERMINAL_STATUSES
+
+    @classmethod
+    def _record_lookup(cls, result: str) -> None:
+        cls._lookups += 1
+        if result == "hit":
+            cls._hits += 1
+            ORDER_CACHE_MONGO_READS_SAVED.inc()
+        ORDER_CACHE_LOOKUPS.labels(result=result).inc()
+        ORDER_CACHE_HIT_RATIO.set(cls._hits / cls._lookups)
+
+    @staticmethod
+    def _is_not_newer(cached: Any, value: Dict[str, Any]) -> bool:
+        if not isinstance(cached, dict) or "updated_at" not in cached:
+            return True
+        return datetime.fromisoformat(cached["updated_at"]) <= datetime.fromisoformat(value["updated_at"])
+
+    @classmethod
+    async def _write_through(cls, documents: List[OrderDocument], ttl: int, state: str) -> None:
+        order_ids = [str(document.id) for document in documents]
+        written = await cls._cache().insert_if(
+            order_ids,
+            [document.model_dump(mode="json", exclude={"outbox"}) for document in documents],
+            cls._is_not_newer,
+            ttl=ttl,
+        )
+        ORDER_CACHE_WRITES.labels(state=state).inc(len(written))
+        if len(written) < len(order_ids):
+            ORDER_CACHE_WRITES.labels(state="superseded").inc(len(order_ids) - len(written))
+
+    @classmethod
+    async def put(cls, document: OrderDocument, fill: bool = False) -> None:
+        config = OrderCacheConfig()
+        terminal = cls.is_terminal(document)
+        if fill and terminal:
+            return
+        order_id = str(document.id)
+        ttl = config.terminal_grace_ttl_s if terminal else config.active_ttl_s
+        try:
+            if fill:
+                await cls._cache().insert(order_id, document.model_dump(mode="json", exclude={"outbox"}), ttl=ttl, nx=True)
+                ORDER_CACHE_WRITES.labels(state="active").inc()
+            else:
+                await cls._write_through([document], ttl, "terminal" if terminal else "active")
+        except Exception as e:
+            get_logger().warning(ErrorCodes.CACHE_INSERT_ERROR.value, payload={"order_id": order_id, "error": str(e)})
+            await cls.evict(order_id)
+
+    @classmethod
+    async def put_many(cls, documents: List[OrderDocument]) -> None:
+        # One checked write per TTL class instead of one per order.
+        config = OrderCacheConfig()
+        for terminal, ttl in ((False, config.active_ttl_s), (True, config.terminal_grace_ttl_s)):
+            batch = [document for document in documents if cls.is_terminal(document) == terminal]
+            if not batch:
+                continue
+            order_ids = [str(document.id) for document in batch]
+            try:
+                await cls._write_through(batch, ttl, "terminal" if terminal else "active")
+            except Exception as e:
+                get_logger().warning(ErrorCodes.CACHE_INSERT_ERROR.value, payload={"order_ids": order_ids, "error": str(e)})
+                await cls.evict(order_ids)
+
+    @classmethod
+    async def evict(cls, order_id: Union[str, List[str]]) -> None:
+        try:
+            await cls._cache().delete(order_id)
+        except Exception as e:
+            get_logger().warning(ErrorCodes.CACHE_DELETE_ERROR.value, payload={"order_id": order_id, "error": str(e)})
+
+    @classmethod
+    async def get(cls, order_id: str) -> Optional[OrderDocument]:
+        cached: Optional[Dict[str, Any]] = None
+        try:
+            cached = await cls._cache().fetch(order_id)
+        except Exception as e:
+            get_logger().warning(ErrorCodes.CACHE_FETCH_ERROR.value, payload={"order_id": order_id, "error": str(e)})
+            cls._record_lookup("error")
+        else:
+            cls._record_lookup("hit" if cached else "miss")
+        if cached:
+            return OrderDocument.model_validate(cached)
+        document = await OrderDocument.get(PydanticObjectId(order_id))
+        if document is not None:
+            await cls.put(document, fill=True)
+        return document
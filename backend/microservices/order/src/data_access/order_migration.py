@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import DBRef, ObjectId
+from pymongo import UpdateOne
+
+from ftgo_utils.errors import ErrorCodes
+
+from data_access import get_logger
+from data_access.db_repository import DatabaseRepository
+from models.order import SCHEMA_VERSION
+from utils import handle_exception
+
+
+class OrderEmbeddingMigration:
+    # Rewrites orders whose items and status history are Link references to the legacy
+    # order_items/order_status collections into embedded subdocuments, one batch at a time.
+    # Each order is updated only while still unmigrated, so the job can be re-run or stopped
+    # at any point; the legacy collections are left in place for a manual drop afterwards.
+    ORDERS = "orders"
+    ORDER_ITEMS = "order_items"
+    ORDER_STATUS = "order_status"
+    UNMIGRATED = {"schema_version": {"$ne": SCHEMA_VERSION}}
+    # Fields of the old standalone documents that have no meaning inside an order.
+    DROPPED_FIELDS = ("_id", "revision_id")
+
+    @staticmethod
+    def reference_id(reference: Any) -> Optional[ObjectId]:
+        if isinstance(reference, DBRef):
+            return reference.id
+        if isinstance(reference, dict):
+            return reference.get("$id", reference.get("_id"))
+        return None
+
+    @classmethod
+    def embedded(cls, document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if document is None:
+            return None
+        return {key: value for key, value in document.items() if key not in cls.DROPPED_FIELDS}
+
+    @classmethod
+    def resolve(cls, references: Iterable[Any], documents: Dict[ObjectId, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # References whose document is gone are dropped; already embedded entries are kept as they are.
+        resolved = []
+        for reference in references or []:
+            reference_id = cls.reference_id(reference)
+            if reference_id is None:
+                resolved.append(cls.embedded(reference))
+            elif reference_id in documents:
+                resolved.append(cls.embedded(documents[reference_id]))
+        return resolved
+
+    @classmethod
+    def build_update(
+        cls,
+        order: Dict[str, Any],
+        items: Dict[ObjectId, Dict[str, Any]],
+        statuses: Dict[ObjectId, Dict[str, Any]],
+    ) -> UpdateOne:
+        status_history = cls.resolve(order.get("status_history"), statuses)
+        status = order.get("status")
+        status_id = cls.reference_id(status)
+        if status_id is not None:
+            status = statuses.get(status_id)
+        return UpdateOne(
+            {"_id": order["_id"], **cls.UNMIGRATED},
+            {"$set": {
+                "order_items": cls.resolve(order.get("order_items"), items),
+                "status_history": status_history,
+                "status": cls.embedded(status) if status else (status_history[-1] if status_history else None),
+                "schema_version": SCHEMA_VERSION,
+            }},
+        )
+
+    @classmethod
+    async def run(cls, batch_size: int = 500) -> int:
+        database = DatabaseRepository.get_database()
+        orders, order_items, order_status = database[cls.ORDERS], database[cls.ORDER_ITEMS], database[cls.ORDER_STATUS]
+        migrated = 0
+        last_id = None
+        try:
+            while True:
+                query = dict(cls.UNMIGRATED)
+                if last_id is not None:
+                    query["_id"] = {"$gt": last_id}
+                batch = await orders.find(
+                    query, {"order_items": 1, "status_history": 1, "status": 1}
+                ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+                if not batch:
+                    return migrated
+                last_id = batch[-1]["_id"]
+                item_ids = {cls.reference_id(item) for order in batch for item in order.get("order_items") or []}
+                status_ids = {
+                    cls.reference_id(status)
+                    for order in batch
+                    for status in [*(order.get("status_history") or []), order.get("status")]
+                }
+                items = {
+                    document["_id"]: document
+                    async for document in order_items.find({"_id": {"$in": [i for i in item_ids if i is not None]}})
+                }
+                statuses = {
+                    document["_id"]: document
+                    async for document in order_status.find({"_id": {"$in": [i for i in status_ids if i is not None]}})
+                }
+                result = await orders.bulk_write([cls.build_update(order, items, statuses) for order in batch], ordered=False)
+                migrated += result.modified_count
+                get_logger().info("Embedded order items and history", payload={"batch": len(batch), "migrated": migrated})
+        except Exception as e:
+            payload = {"migrated": migrated, "last_id": str(last_id), "error": str(e)}
+            get_logger().error(ErrorCodes.UPDATE_ORDER_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.UPDATE_ORDER_ERROR, payload=payload)
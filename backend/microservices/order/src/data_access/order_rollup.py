@@ -0,0 +1,192 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import BaseError, ErrorCodes
+
+from config import RollupConfig
+from data_access import get_logger
+from data_access.order_cache import OrderCache
+from models.order import Order as OrderDocument
+from models.restaurant_daily_rollup import RestaurantDailyRollup
+from utils import handle_exception
+
+
+class OrderRollup:
+    # Keeps restaurant_daily_rollups in step with orders. The outbox relay hands over the events
+    # it published: order.placed and the terminal statuses each add one $inc upsert on the order's
+    # (restaurant_id, day) rollup, so order writes pay nothing for the rollups. The relay applies
+    # them before it pulls the events, and every upsert only matches while its event id is not in
+    # the rollup's applied_events, so an event republished after a crash is counted once.
+    # `rebuild` scans the orders in bounded _id ranges for the rollup keys they fall on and
+    # recounts each key in place while the relay keeps running (see rebuild_key).
+    DAY_FORMAT = "%Y-%m-%d"
+
+    @classmethod
+    def day(cls, moment: datetime) -> str:
+        return moment.strftime(cls.DAY_FORMAT)
+
+    @classmethod
+    def key(cls, restaurant_id: str, created_at: datetime) -> Dict[str, str]:
+        return {"restaurant_id": restaurant_id, "day": cls.day(created_at)}
+
+    @classmethod
+    def terminal_increments(cls, status: str, total_amount: float) -> Dict[str, Any]:
+        increments: Dict[str, Any] = {f"statuses.{status}": 1}
+        if status == OrderStatus.DELIVERED.value:
+            increments["revenue"] = total_amount
+        return increments
+
+    @classmethod
+    def event_update(cls, order: Dict[str, Any], event: Dict[str, Any]) -> Optional[UpdateOne]:
+        status = event["payload"].get("status")
+        if status == OrderStatus.PLACED.value:
+            increments = {"orders": 1}
+        elif status in OrderCache.TERMINAL_STATUSES:
+            increments = cls.terminal_increments(status, order["total_amount"])
+        else:
+            return None
+        return UpdateOne(
+            {**cls.key(order["restaurant_id"], order["created_at"]), "applied_events": {"$ne": event["event_id"]}},
+            {
+                "$inc": {**increments, "version": 1},
+                "$set": {"updated_at": datetime.utcnow()},
+                "$push": {"applied_events": {"$each": [event["event_id"]], "$slice": -RollupConfig().applied_events_kept}},
+            },
+            upsert=True,
+        )
+
+    @classmethod
+    async def record_events(cls, orders: List[Dict[str, Any]], events: List[List[Dict[str, Any]]]) -> None:
+        # `orders` carry restaurant_id, created_at and total_amount; `events` are their published
+        # outbox events. An upsert whose event was already applied misses its filter and fails
+        # on the unique key index; that duplicate key error is retried once, because it can also
+        # come from another relay creating the same rollup first. Other failures are raised so
+        # the relay keeps the events queued.
+        updates = [
+            update for order, order_events in zip(orders, events) for event in order_events
+            for update in [cls.event_update(order, event)] if update is not None
+        ]
+        for _ in range(2):
+            if not updates:
+                return
+            try:
+                await RestaurantDailyRollup.get_motor_collection().bulk_write(updates, ordered=False)
+                return
+            except BulkWriteError as e:
+                errors = e.details["writeErrors"]
+                if any(error["code"] != 11000 for error in errors):
+                    raise
+                updates = [updates[error["index"]] for error in errors]
+
+    @staticmethod
+    async def load(restaurant_id: str, start_day: str, end_day: str) -> List[RestaurantDailyRollup]:
+        return await RestaurantDailyRollup.find({
+            "restaurant_id": restaurant_id,
+            "day": {"$gte": start_day, "$lte": end_day},
+        }).sort("day").to_list()
+
+    @classmethod
+    def keys_pipeline(cls, last_id: Optional[ObjectId], batch_size: int) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"_id": {"$gt": last_id}} if last_id is not None else {}},
+            {"$sort": {"_id": 1}},
+            {"$limit": batch_size},
+            {"$group": {
+                "_id": {
+                    "restaurant_id": "$restaurant_id",
+                    "day": {"$dateToString": {"format": cls.DAY_FORMAT, "date": "$created_at"}},
+                },
+                "orders": {"$sum": 1},
+                "last_id": {"$max": "$_id"},
+            }},
+        ]
+
+    @classmethod
+    def key_pipeline(cls, key: Dict[str, str]) -> List[Dict[str, Any]]:
+        start = datetime.strptime(key["day"], cls.DAY_FORMAT)
+        terminal = sorted(OrderCache.TERMINAL_STATUSES)
+        is_status = lambda status: {"$eq": ["$status.status", status]}
+        return [
+            {"$match": {
+                "restaurant_id": key["restaurant_id"],
+                "created_at": {"$gte": start, "$lt": start + timedelta(days=1)},
+            }},
+            {"$group": {
+                "_id": None,
+                "orders": {"$sum": 1},
+                "revenue": {"$sum": {"$cond": [is_status(OrderStatus.DELIVERED.value), "$total_amount", 0]}},
+                **{status: {"$sum": {"$cond": [is_status(status), 1, 0]}} for status in terminal},
+                "pending_events": {"$push": "$outbox.event_id"},
+            }},
+        ]
+
+    @classmethod
+    async def _aggregate_key(cls, key: Dict[str, str]) -> Dict[str, Any]:
+        groups = await OrderDocument.get_motor_collection().aggregate(cls.key_pipeline(key)).to_list(length=None)
+        return groups[0]
+
+    @classmethod
+    def rebuilt_fields(cls, group: Dict[str, Any]) -> Dict[str, Any]:
+        # The events still queued in the orders' outboxes are already reflected in the counts,
+        # so they are recorded as applied and the relay skips them.
+        pending_events = [event_id for event_ids in group["pending_events"] for event_id in event_ids]
+        return {
+            "orders": group["orders"],
+            "revenue": group["revenue"],
+            "statuses": {status: group[status] for status in sorted(OrderCache.TERMINAL_STATUSES) if group[status]},
+            "applied_events": pending_events[-RollupConfig().applied_events_kept:],
+            "updated_at": datetime.utcnow(),
+        }
+
+    @classmethod
+    async def rebuild_key(cls, key: Dict[str, str], retries: Optional[int] = None) -> None:
+        # Compare-and-set on the rollup's version: the relay bumps it with every increment, so a
+        # recount that raced with one is discarded and repeated instead of overwriting it.
+        retries = retries or RollupConfig().rebuild_retries
+        rollups = RestaurantDailyRollup.get_motor_collection()
+        for _ in range(retries):
+            current = await rollups.find_one(key, {"version": 1})
+            fields = cls.rebuilt_fields(await cls._aggregate_key(key))
+            if current is None:
+                try:
+                    await rollups.insert_one({**key, **fields, "version": 1})
+                    return
+                except DuplicateKeyError:
+                    continue
+            result = await rollups.update_one(
+                {**key, "version": current.get("version")},
+                {"$set": fields, "$inc": {"version": 1}},
+            )
+            if result.matched_count:
+                return
+        raise BaseError(error_code=ErrorCodes.UPDATE_ORDER_ERROR, payload={**key, "retries": retries})
+
+    @classmethod
+    async def rebuild(cls, batch_size: Optional[int] = None) -> int:
+        batch_size = batch_size or RollupConfig().backfill_batch_size
+        orders = OrderDocument.get_motor_collection()
+        rebuilt = set()
+        aggregated = 0
+        last_id = None
+        try:
+            while True:
+                groups = await orders.aggregate(cls.keys_pipeline(last_id, batch_size)).to_list(length=None)
+                if not groups:
+                    break
+                last_id = max(group["last_id"] for group in groups)
+                keys = [group["_id"] for group in groups if tuple(group["_id"].values()) not in rebuilt]
+                await asyncio.gather(*(cls.rebuild_key(key) for key in keys))
+                rebuilt.update(tuple(key.values()) for key in keys)
+                aggregated += sum(group["orders"] for group in groups)
+                get_logger().info("Rebuilt order rollups", payload={"keys": len(rebuilt), "orders": aggregated})
+            return aggregated
+        except Exception as e:
+            payload = {"orders": aggregated, "last_id": str(last_id), "error": str(e)}
+            get_logger().error(ErrorCodes.UPDATE_ORDER_ERROR.value, payload=payload)
+            await handle_exception(e=e, error_code=ErrorCodes.UPDATE_ORDER_ERROR, payload=payload)
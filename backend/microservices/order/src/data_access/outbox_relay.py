@@ -0,0 +1,111 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from ftgo_utils.errors import ErrorCodes
+
+from config import OutboxConfig
+from data_access import get_logger
+from data_access.event_publisher import EventPublisher
+from data_access.order_rollup import OrderRollup
+from models.order import Order as OrderDocument, OUTBOX_INDEX
+from utils.metrics import (
+    ORDER_OUTBOX_LAG,
+    ORDER_OUTBOX_PUBLISH_FAILURES,
+    ORDER_OUTBOX_PUBLISHED,
+    ORDER_OUTBOX_RELAY_BATCH,
+    ORDER_OUTBOX_RELAY_LATENCY,
+)
+
+
+class OrderOutboxRelay:
+    # Drains the outbox embedded in order documents: reads the orders holding pending events
+    # (oldest first, through the sparse outbox index), publishes each order's events in order
+    # and then pulls the published ones in one bulk write. A crash between the publish and the
+    # pull republishes those events, so delivery is at-least-once and consumers dedupe on the
+    # event id. An event that fails to publish stops its order's queue until the next pass,
+    # so one order's events are never published out of order. The restaurant daily rollups are
+    # fed from the published events before the pull (see data_access/order_rollup.py).
+    _task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _publish_order(events: List[Dict[str, Any]]) -> Tuple[List[str], int]:
+        published = []
+        for event in events:
+            try:
+                await EventPublisher.publish(
+                    event["routing_key"],
+                    {"event_id": event["event_id"], **event["payload"]},
+                    message_id=event["event_id"],
+                )
+            except Exception as e:
+                get_logger().warning("Publishing order event failed", payload={"event_id": event["event_id"], "error": str(e)})
+                return published, 1
+            ORDER_OUTBOX_PUBLISHED.labels(routing_key=event["routing_key"]).inc()
+            published.append(event["event_id"])
+        return published, 0
+
+    @classmethod
+    async def relay(cls, batch_size: Optional[int] = None) -> int:
+        started_at = time.perf_counter()
+        collection = OrderDocument.get_motor_collection()
+        orders = await collection.find(
+            {"outbox.created_at": {"$exists": True}},
+            {"outbox": 1, "restaurant_id": 1, "created_at": 1, "total_amount": 1},
+            sort=[("outbox.created_at", 1)], limit=batch_size or OutboxConfig().batch_size,
+        ).hint(OUTBOX_INDEX).to_list(length=None)
+        if not orders:
+            ORDER_OUTBOX_LAG.set(0)
+            return 0
+        oldest = min(event["created_at"] for order in orders for event in order["outbox"])
+        ORDER_OUTBOX_LAG.set(max((datetime.utcnow() - oldest).total_seconds(), 0))
+
+        results = await asyncio.gather(*(cls._publish_order(order["outbox"]) for order in orders))
+        await OrderRollup.record_events(orders, [
+            [event for event in order["outbox"] if event["event_id"] in published]
+            for order, (published, _) in zip(orders, results)
+        ])
+        updates = [
+            UpdateOne({"_id": order["_id"]}, {"$pull": {"outbox": {"event_id": {"$in": published}}}})
+            for order, (published, _) in zip(orders, results)
+            if published
+        ]
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
+        published_count = sum(len(published) for published, _ in results)
+        ORDER_OUTBOX_PUBLISH_FAILURES.inc(sum(failures for _, failures in results))
+        ORDER_OUTBOX_RELAY_BATCH.observe(published_count)
+        ORDER_OUTBOX_RELAY_LATENCY.observe(time.perf_counter() - started_at)
+        return published_count
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            published = 0
+            try:
+                published = await cls.relay()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(ErrorCodes.DB_FETCH_ERROR.value, payload={"error": str(e)})
+            # Keep draining while passes find work; idle between passes otherwise.
+            if not published:
+                await asyncio.sleep(OutboxConfig().relay_interval_s)
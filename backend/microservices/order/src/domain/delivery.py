@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from domain.entities.delivery import Delivery
 from ftgo_utils.enums import DeliveryStatus
 from ftgo_utils.errors import ErrorCodes, BaseError
@@ -9,9 +9,11 @@ class DeliveryHandler:
     @staticmethod
     async def schedule_delivery(
         order_id: str,
-        driver_id: str,
+        driver_id: Optional[str],
         source_address_id: str,
         destination_address_id: str,
+        pickup_latitude: Optional[float] = None,
+        pickup_longitude: Optional[float] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         try:
@@ -19,7 +21,9 @@ class DeliveryHandler:
                 order_id=order_id,
                 driver_id=driver_id,
                 source_address_id=source_address_id,
-                destination_address_id=destination_address_id
+                destination_address_id=destination_address_id,
+                pickup_latitude=pickup_latitude,
+                pickup_longitude=pickup_longitude,
             )
             await delivery.save()
             return delivery.document.dict()
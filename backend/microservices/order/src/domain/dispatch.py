@@ -0,0 +1,252 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from config import DispatchConfig
+from data_access.location_service import LocationService
+from models import DeliveryDetail
+from models.delivery_detail import ACTIVE_DELIVERY_STATUSES
+from ftgo_utils.enums import DeliveryStatus
+from ftgo_utils.errors import ErrorCodes
+from domain import get_logger
+from utils.metrics import (
+    DISPATCH_ASSIGNMENTS,
+    DISPATCH_PENDING,
+    DISPATCH_PICKUP_DISTANCE,
+    DISPATCH_TICK_LATENCY,
+)
+
+# delivery_id -> [(driver_id, pickup distance in meters)]
+Candidates = Dict[str, List[Tuple[str, float]]]
+Assignments = Dict[str, Tuple[str, float]]
+
+
+class DispatchAssignment:
+    # Solvers for matching a batch of deliveries to candidate drivers by pickup distance. Greedy
+    # takes the globally shortest remaining pair first; Hungarian finds the assignment with the
+    # most matches and, among those, the least total distance, at O(n^3) cost.
+    @staticmethod
+    def greedy(candidates: Candidates) -> Assignments:
+        edges = sorted(
+            (distance, delivery_id, driver_id)
+            for delivery_id, drivers in candidates.items()
+            for driver_id, distance in drivers
+        )
+        assignments: Assignments = {}
+        taken: Set[str] = set()
+        for distance, delivery_id, driver_id in edges:
+            if delivery_id in assignments or driver_id in taken:
+                continue
+            assignments[delivery_id] = (driver_id, distance)
+            taken.add(driver_id)
+        return assignments
+
+    @staticmethod
+    def hungarian(candidates: Candidates) -> Assignments:
+        delivery_ids = [delivery_id for delivery_id, drivers in candidates.items() if drivers]
+        driver_ids = sorted({driver_id for delivery_id in delivery_ids for driver_id, _ in candidates[delivery_id]})
+        if not delivery_ids:
+            return {}
+        distances = {
+            (delivery_id, driver_id): distance
+            for delivery_id in delivery_ids
+            for driver_id, distance in candidates[delivery_id]
+        }
+        # Pairs that are not candidates cost more than any set of real pairs, so they are only
+        # used to fill the square matrix and are dropped from the result.
+        missing = sum(distances.values()) + 1.0
+        size = max(len(delivery_ids), len(driver_ids))
+        cost = [
+            [
+                distances.get((delivery_ids[row], driver_ids[column]), missing)
+                if row < len(delivery_ids) and column < len(driver_ids) else missing
+                for column in range(size)
+            ]
+            for row in range(size)
+        ]
+        columns = DispatchAssignment._solve_square(cost)
+        return {
+            delivery_ids[row]: (driver_ids[column], distances[(delivery_ids[row], driver_ids[column])])
+            for row, column in enumerate(columns)
+            if row < len(delivery_ids) and column < len(driver_ids)
+            and (delivery_ids[row], driver_ids[column]) in distances
+        }
+
+    @staticmethod
+    def _solve_square(cost: List[List[float]]) -> List[int]:
+        # Kuhn-Munkres with row/column potentials; returns the column assigned to each row.
+        size = len(cost)
+        u = [0.0] * (size + 1)
+        v = [0.0] * (size + 1)
+        owner = [0] * (size + 1)
+        way = [0] * (size + 1)
+        for row in range(1, size + 1):
+            owner[0] = row
+            column = 0
+            min_slack = [float("inf")] * (size + 1)
+            used = [False] * (size + 1)
+            while True:
+                used[column] = True
+                current_row = owner[column]
+                delta = float("inf")
+                next_column = 0
+                for candidate in range(1, size + 1):
+                    if used[candidate]:
+                        continue
+                    slack = cost[current_row - 1][candidate - 1] - u[current_row] - v[candidate]
+                    if slack < min_slack[candidate]:
+                        min_slack[candidate] = slack
+                        way[candidate] = column
+                    if min_slack[candidate] < delta:
+                        delta = min_slack[candidate]
+                        next_column = candidate
+                for candidate in range(size + 1):
+                    if used[candidate]:
+                        u[owner[candidate]] += delta
+                        v[candidate] -= delta
+                    else:
+                        min_slack[candidate] -= delta
+                column = next_column
+                if owner[column] == 0:
+                    break
+            while column:
+                previous = way[column]
+                owner[column] = owner[previous]
+                column = previous
+        columns = [0] * size
+        for column in range(1, size + 1):
+            columns[owner[column] - 1] = column - 1
+        return columns
+
+    @classmethod
+    def solve(cls, candidates: Candidates, hungarian_max_size: int) -> Tuple[str, Assignments]:
+        delivery_count = sum(1 for drivers in candidates.values() if drivers)
+        driver_count = len({driver_id for drivers in candidates.values() for driver_id, _ in drivers})
+        if max(delivery_count, driver_count) <= hungarian_max_size:
+            return "hungarian", cls.hungarian(candidates)
+        return "greedy", cls.greedy(candidates)
+
+
+class DispatchEngine:
+    # Matches pending deliveries to nearby available drivers once per tick: one batched
+    # nearest-driver query for every pending pickup, one global assignment over all of them,
+    # one conditional bulk write for the assignments and one call taking the drivers off the
+    # available sets. Assignments only apply to deliveries that are still pending and
+    # unassigned, so a delivery cancelled or assigned by hand meanwhile is left alone. Every
+    # replica runs a tick; the unique index on a driver's active delivery makes the claim atomic,
+    # so of two ticks offering the same driver only one assignment lands.
+    _task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def pending_deliveries(limit: int) -> List[DeliveryDetail]:
+        return await DeliveryDetail.find({
+            "delivery_status": DeliveryStatus.PENDING.value,
+            "driver_id": None,
+            "pickup_latitude": {"$ne": None},
+            "pickup_longitude": {"$ne": None},
+        }).sort("created_at").limit(limit).to_list()
+
+    @staticmethod
+    async def busy_drivers(driver_ids: Set[str]) -> Set[str]:
+        # Drivers still carrying an order; covers availability updates that did not reach location.
+        if not driver_ids:
+            return set()
+        documents = await DeliveryDetail.get_motor_collection().find({
+            "driver_id": {"$in": sorted(driver_ids)},
+            "delivery_status": {"$in": ACTIVE_DELIVERY_STATUSES},
+        }, {"driver_id": 1}).to_list(length=None)
+        return {document["driver_id"] for document in documents}
+
+    @staticmethod
+    async def assign(assignments: Assignments) -> Assignments:
+        collection = DeliveryDetail.get_motor_collection()
+        now = datetime.utcnow()
+        try:
+            result = await collection.bulk_write([
+                UpdateOne(
+                    {"_id": PydanticObjectId(delivery_id), "delivery_status": DeliveryStatus.PENDING.value, "driver_id": None},
+                    {"$set": {"driver_id": driver_id, "delivery_status": DeliveryStatus.ASSIGNED.value, "updated_at": now}},
+                )
+                for delivery_id, (driver_id, _) in assignments.items()
+            ], ordered=False)
+            modified_count = result.modified_count
+        except BulkWriteError as e:
+            # Drivers claimed by another tick meanwhile fail on the unique index; the rest of
+            # the unordered batch still applied.
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            modified_count = e.details.get("nModified", 0)
+        if modified_count == len(assignments):
+            return assignments
+        # Some deliveries or drivers changed since they were read; keep only the assignments that landed.
+        documents = await collection.find(
+            {"_id": {"$in": [PydanticObjectId(delivery_id) for delivery_id in assignments]}}, {"driver_id": 1},
+        ).to_list(length=None)
+        landed = {str(document["_id"]) for document in documents if document.get("driver_id") == assignments[str(document["_id"])][0]}
+        return {delivery_id: assignment for delivery_id, assignment in assignments.items() if delivery_id in landed}
+
+    @classmethod
+    async def dispatch(cls) -> Dict[str, Any]:
+        config = DispatchConfig()
+        started_at = time.perf_counter()
+        deliveries = await cls.pending_deliveries(config.batch_size)
+        DISPATCH_PENDING.set(len(deliveries))
+        if not deliveries:
+            return {"pending": 0, "assigned": 0}
+        nearest = await LocationService.get_nearest_drivers_many(
+            [{"latitude": delivery.pickup_latitude, "longitude": delivery.pickup_longitude} for delivery in deliveries],
+            radius=config.search_radius_m,
+            max_count=config.candidates_per_delivery,
+        )
+        busy = await cls.busy_drivers({driver["driver_id"] for drivers in nearest for driver in drivers})
+        candidates: Candidates = {
+            str(delivery.id): [(driver["driver_id"], driver["distance"]) for driver in drivers if driver["driver_id"] not in busy]
+            for delivery, drivers in zip(deliveries, nearest)
+        }
+        method, assignments = DispatchAssignment.solve(candidates, config.hungarian_max_size)
+        if assignments:
+            assignments = await cls.assign(assignments)
+        if assignments:
+            await LocationService.set_drivers_occupied(sorted(driver_id for driver_id, _ in assignments.values()))
+        DISPATCH_ASSIGNMENTS.labels(method=method).inc(len(assignments))
+        for _, distance in assignments.values():
+            DISPATCH_PICKUP_DISTANCE.observe(distance)
+        DISPATCH_TICK_LATENCY.observe(time.perf_counter() - started_at)
+        return {
+            "pending": len(deliveries),
+            "assigned": len(assignments),
+            "method": method,
+            "assignments": {delivery_id: driver_id for delivery_id, (driver_id, _) in assignments.items()},
+        }
+
+    @classmethod
+    async def initialize(cls) -> None:
+        if cls._task is not None or not DispatchConfig().enabled:
+            return
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def terminate(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(DispatchConfig().tick_interval_s)
+            try:
+                result = await cls.dispatch()
+                if result["assigned"]:
+                    get_logger().info("Dispatched deliveries", payload={key: result[key] for key in ("pending", "assigned", "method")})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().error(ErrorCodes.ASSIGN_DRIVER_ERROR.value, payload={"error": str(e)})
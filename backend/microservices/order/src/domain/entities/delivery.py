@@ -16,13 +16,23 @@ class Delivery(BaseEntity):
         super().__init__(document)
 
     @classmethod
-    def create(cls, order_id: str, driver_id: Optional[str], source_address_id: str, destination_address_id: str) -> "Delivery":
+    def create(
+        cls,
+        order_id: str,
+        driver_id: Optional[str],
+        source_address_id: str,
+        destination_address_id: str,
+        pickup_latitude: Optional[float] = None,
+        pickup_longitude: Optional[float] = None,
+    ) -> "Delivery":
         delivery_doc: DeliveryDetail = cls.document_cls(
             order_id=order_id,
             driver_id=driver_id,
             delivery_status=DeliveryStatus.PENDING.value,
             source_address_id=source_address_id,
             destination_address_id=destination_address_id,
+            pickup_latitude=pickup_latitude,
+            pickup_longitude=pickup_longitude,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
@@ -1,7 +1,6 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from models.order_item import OrderItem as OrderItemDocument
-from models.order_status import OrderStatus as OrderStatusDocument
 from models.order import Order as OrderDocument
 from pydantic import BaseModel, ValidationError
 from utils.exception import handle_exception
@@ -9,6 +8,8 @@ from ftgo_utils.errors import ErrorCodes, BaseError
 from ftgo_utils.enums import OrderStatus, PaymentStatus
 from domain import get_logger
 from domain.entities.base import BaseEntity
+from domain.order_state_machine import OrderStateMachine
+from data_access.order_cache import OrderCache
 
 
 class Order(BaseEntity):
@@ -41,6 +42,9 @@ class Order(BaseEntity):
             get_logger().error(ErrorCodes.ORDER_NOT_FOUND_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload=payload)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return self.document.model_dump(mode="json", exclude={"outbox"})
+
     async def save(self):
         try:
             await self.document.insert()
@@ -71,37 +75,31 @@ class Order(BaseEntity):
         try:
             self.document.total_amount = sum(item.subtotal for item in self.document.order_items)
             await self.document.save()
+            await OrderCache.put(self.document)
         except Exception as e:
             payload = {"order_id": str(self.document.id)}
             get_logger().error(ErrorCodes.CALCULATE_TOTAL_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.CALCULATE_TOTAL_ERROR, payload=payload)
 
-    async def change_status(self, status: OrderStatus, changed_by: Optional[str] = None, comments: Optional[str] = None):
+    async def change_status(
+        self,
+        status: OrderStatus,
+        changed_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        **fields,
+    ):
         try:
-            if status == OrderStatus.CANCELLED and self.document.status == OrderStatus.DELIVERED.value:
-                raise BaseError(error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR, payload={"status": self.document.status})
-            
-            new_status = OrderStatusDocument(
-                order_id=str(self.document.id),
-                status=status.value,
-                changed_by=changed_by,
-                comments=comments,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+            self.document = await OrderStateMachine.transition(
+                str(self.document.id), status, changed_by=changed_by, comments=comments, fields=fields
             )
-            self.document.status_history.append(new_status)
-            self.document.status = new_status
-            await self.document.save()
         except Exception as e:
-            payload = {"order_id": str(self.document.id), "status": status.value}
+            payload = {"order_id": str(self.document.id), "status": OrderStatus(status).value}
             get_logger().error(ErrorCodes.CHANGE_ORDER_STATUS_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR, payload=payload)
 
     async def process_payment(self, payment_id: str):
         try:
-            self.document.payment_id = payment_id
-            await self.change_status(OrderStatus.OUT_FOR_DELIVERY)
-            await self.save()
+            await self.change_status(OrderStatus.PAID, payment_id=payment_id)
         except Exception as e:
             payload = {"order_id": str(self.document.id), "payment_id": payment_id}
             get_logger().error(ErrorCodes.PROCESS_PAYMENT_ERROR.value, payload=payload)
@@ -110,7 +108,6 @@ class Order(BaseEntity):
     async def mark_ready_for_pickup(self):
         try:
             await self.change_status(OrderStatus.READY_FOR_PICKUP)
-            await self.save()
         except Exception as e:
             payload = {"order_id": str(self.document.id)}
             get_logger().error(ErrorCodes.MARK_READY_FOR_PICKUP_ERROR.value, payload=payload)
@@ -119,7 +116,6 @@ class Order(BaseEntity):
     async def cancel_order(self):
         try:
             await self.change_status(OrderStatus.CANCELLED)
-            await self.save()
         except Exception as e:
             payload = {"order_id": str(self.document.id)}
             get_logger().error(ErrorCodes.CANCEL_ORDER_ERROR.value, payload=payload)
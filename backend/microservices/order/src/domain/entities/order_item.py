@@ -1,5 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
+from beanie import PydanticObjectId, UpdateResponse
+from data_access.order_cache import OrderCache
+from models.order import Order as OrderDocument
 from models.order_item import OrderItem as OrderItemDocument
 from pydantic import BaseModel, ValidationError
 from utils.exception import handle_exception
@@ -27,29 +30,63 @@ class OrderItem(BaseEntity):
         )
         return cls(document=order_item_doc)
 
+    @classmethod
+    async def fetch_document(cls, **kwargs) -> Optional[OrderItemDocument]:
+        # Items are embedded in their order: find the order holding a matching item, then pick it out.
+        query = cls.build_query(**kwargs)
+        order_id = query.pop("order_id", None)
+        order_query: Dict[str, Any] = {"order_items": {"$elemMatch": query}} if query else {}
+        if order_id is not None:
+            order_query["_id"] = PydanticObjectId(order_id)
+        order = await OrderDocument.find_one(order_query)
+        if order is None:
+            return None
+        return next(
+            (item for item in order.order_items if all(getattr(item, key) == value for key, value in query.items())),
+            None,
+        )
+
     @classmethod
     async def load(cls, **kwargs):
         try:
             document: OrderItemDocument = await cls.fetch_document(**kwargs)
             return cls(document=document)
         except Exception as e:
-            payload = query
+            payload = kwargs
             get_logger().error(ErrorCodes.ORDER_NOT_FOUND_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload=payload)
 
     async def save(self):
         try:
-            await self.document.insert()
+            order = await OrderDocument.find_one({"_id": PydanticObjectId(self.document.order_id)}).update({
+                "$push": {"order_items": self.document.dict()},
+                "$inc": {"total_amount": self.document.subtotal},
+            }, response_type=UpdateResponse.NEW_DOCUMENT)
+            if order is not None:
+                await OrderCache.put(order)
         except ValidationError as e:
             payload = {"order_id": self.document.order_id, "menu_item_id": self.document.menu_item_id}
             get_logger().error(ErrorCodes.SAVE_ORDER_ITEM_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.SAVE_ORDER_ITEM_ERROR, payload=payload)
 
+    async def _update_in_order(self, **fields):
+        # Positional update of this item inside its order document.
+        self.document.updated_at = datetime.utcnow()
+        order = await OrderDocument.find_one({
+            "_id": PydanticObjectId(self.document.order_id),
+            "order_items.menu_item_id": self.document.menu_item_id,
+        }).update({"$set": {
+            f"order_items.$.{field}": value
+            for field, value in {**fields, "updated_at": self.document.updated_at}.items()
+        }}, response_type=UpdateResponse.NEW_DOCUMENT)
+        if order is not None:
+            await OrderCache.put(order)
+
     async def update_quantity(self, quantity: int):
         try:
             self.document.quantity = quantity
             self.document.subtotal = self.document.quantity * self.document.item_price
-            await self.document.save()
+            await self._update_in_order(quantity=self.document.quantity, subtotal=self.document.subtotal)
         except Exception as e:
             payload = {"order_id": self.document.order_id, "quantity": quantity}
             get_logger().error(ErrorCodes.UPDATE_ORDER_ITEM_QUANTITY_ERROR.value, payload=payload)
@@ -59,7 +96,7 @@ class OrderItem(BaseEntity):
         try:
             self.document.item_price = new_price
             self.document.subtotal = self.document.quantity * self.document.item_price
-            await self.document.save()
+            await self._update_in_order(item_price=self.document.item_price, subtotal=self.document.subtotal)
         except Exception as e:
             payload = {"order_id": self.document.order_id, "new_price": new_price}
             get_logger().error(ErrorCodes.UPDATE_ORDER_ITEM_PRICE_ERROR.value, payload=payload)
@@ -1,11 +1,15 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
+from beanie import PydanticObjectId, UpdateResponse
+from data_access.order_cache import OrderCache
+from models.order import Order as OrderDocument
 from models.order_status import OrderStatus as OrderStatusDocument
 from pydantic import BaseModel, ValidationError
 from utils.exception import handle_exception
 from ftgo_utils.errors import ErrorCodes, BaseError
 from ftgo_utils.enums import OrderStatus
 from domain.entities.base import BaseEntity
+from domain.order_events import OrderEvents
 from domain import get_logger
 
 class OrderStatus(BaseEntity):
@@ -25,19 +29,44 @@ class OrderStatus(BaseEntity):
         )
         return cls(document=order_status_doc)
 
+    @classmethod
+    async def fetch_document(cls, **kwargs) -> Optional[OrderStatusDocument]:
+        # History entries are embedded in their order; the latest matching entry is returned.
+        query = cls.build_query(**kwargs)
+        order_id = query.pop("order_id", None)
+        order_query: Dict[str, Any] = {"status_history": {"$elemMatch": query}} if query else {}
+        if order_id is not None:
+            order_query["_id"] = PydanticObjectId(order_id)
+        order = await OrderDocument.find_one(order_query)
+        if order is None:
+            return None
+        return next(
+            (
+                entry for entry in reversed(order.status_history)
+                if all(getattr(entry, key) == value for key, value in query.items())
+            ),
+            None,
+        )
+
     @classmethod
     async def load(cls, **kwargs):
         try:
             document: OrderStatusDocument = await cls.fetch_document(**kwargs)
             return cls(document=document)
         except Exception as e:
-            payload = query
+            payload = kwargs
             get_logger().error(ErrorCodes.ORDER_NOT_FOUND_ERROR.value, payload=payload)
             await handle_exception(e=e, error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload=payload)
 
     async def save(self):
         try:
-            await self.document.insert()
+            entry = self.document.dict()
+            order = await OrderDocument.find_one({"_id": PydanticObjectId(self.document.order_id)}).update({
+                "$push": {"status_history": entry, "outbox": OrderEvents.status_changed(self.document).model_dump()},
+                "$set": {"status": entry, "updated_at": datetime.utcnow()},
+            }, response_type=UpdateResponse.NEW_DOCUMENT)
+            if order is not None:
+                await OrderCache.put(order)
         except ValidationError as e:
             payload = {"order_id": self.document.order_id, "status": self.document.status}
             get_logger().error(ErrorCodes.SAVE_ORDER_STATUS_ERROR.value, payload=payload)
@@ -1,8 +1,11 @@
-from typing import List, Optional, Any
+from typing import Any, Dict, List, Optional
 from domain.entities import Order, OrderItem
+from domain.order_builder import OrderBuilder
+from domain.order_history import OrderHistory
 from domain.order_status import OrderStatusHandler
 from ftgo_utils.errors import ErrorCodes, BaseError
 from domain import get_logger
+from data_access.order_cache import OrderCache
 from utils import handle_exception
 
 class OrderHandler:
@@ -10,25 +13,39 @@ class OrderHandler:
     async def create_order(
         customer_id: str,
         restaurant_id: str,
-        order_items: List[OrderItem],
+        order_items: List[Dict[str, Any]],
         special_instructions: Optional[str] = None,
-    ) -> Order:
+        **kwargs,
+    ) -> Dict[str, Any]:
         try:
-            order = Order.create(
+            order = OrderBuilder(
                 customer_id=customer_id,
                 restaurant_id=restaurant_id,
-                special_instructions=special_instructions
-            )
-            for item in order_items:
-                await order.add_order_item(item)
-            
+                special_instructions=special_instructions,
+            ).add_items(order_items).build()
             await order.save()
-            return order
+            await OrderCache.put(order.document)
+            return order.to_dict()
         except Exception as e:
             payload = {"customer_id": customer_id, "restaurant_id": restaurant_id}
             get_logger().error(ErrorCodes.CREATE_ORDER_ERROR.value, payload=payload)
             await handle_exception(e, error_code=ErrorCodes.CREATE_ORDER_ERROR, payload=payload)
 
+    @staticmethod
+    async def get_order_history(
+        customer_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        try:
+            return await OrderHistory(customer_id, cursor=cursor, limit=limit, fields=fields).load()
+        except Exception as e:
+            payload = {"customer_id": customer_id, "cursor": cursor}
+            get_logger().error(ErrorCodes.DB_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e, error_code=ErrorCodes.DB_FETCH_ERROR, payload=payload)
+
     @staticmethod
     async def update_order(order_id: str, updated_items: List[OrderItem]):
         try:
@@ -44,8 +61,8 @@ class OrderHandler:
             await handle_exception(e, error_code=ErrorCodes.UPDATE_ORDER_ERROR, payload=payload)
 
     @staticmethod
-    async def get_order_details(order_id: str) -> Order:
-        order = await Order.load(order_id)
-        if not order:
+    async def get_order_details(order_id: str, **kwargs) -> Dict[str, Any]:
+        document = await OrderCache.get(order_id)
+        if document is None:
             raise BaseError(error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload={"order_id": order_id})
-        return order
+        return Order(document=document).to_dict()
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from beanie import PydanticObjectId
+from pydantic import ValidationError
+from models.order import Order as OrderDocument
+from models.order_item import OrderItem as OrderItemDocument
+from models.order_status import OrderStatus as OrderStatusDocument
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import ErrorCodes, BaseError
+from domain.entities import Order
+from domain.order_events import OrderEvents
+
+
+class OrderBuilder:
+    # Assembles a complete order in memory (validated items, total, initial status) so that
+    # creating it costs a single insert. The id is assigned up front so embedded items and
+    # the status entry can reference their order before it exists.
+    def __init__(self, customer_id: str, restaurant_id: str, special_instructions: Optional[str] = None):
+        self.order_id = PydanticObjectId()
+        self.customer_id = customer_id
+        self.restaurant_id = restaurant_id
+        self.special_instructions = special_instructions
+        self.items: List[OrderItemDocument] = []
+
+    def add_item(
+        self,
+        menu_item_id: str,
+        quantity: int,
+        item_price: float,
+        special_instructions: Optional[str] = None,
+        **kwargs,
+    ) -> "OrderBuilder":
+        try:
+            self.items.append(OrderItemDocument(
+                order_id=str(self.order_id),
+                menu_item_id=menu_item_id,
+                quantity=quantity,
+                item_price=item_price,
+                subtotal=quantity * item_price,
+                special_instructions=special_instructions,
+            ))
+        except (TypeError, ValidationError) as e:
+            raise BaseError(
+                error_code=ErrorCodes.ADD_ORDER_ITEM_ERROR,
+                message=str(e),
+                payload={"menu_item_id": menu_item_id, "quantity": quantity, "item_price": item_price},
+            )
+        return self
+
+    def add_items(self, items: List[Dict[str, Any]]) -> "OrderBuilder":
+        for item in items:
+            self.add_item(**item)
+        return self
+
+    def build(self) -> Order:
+        if not self.items:
+            raise BaseError(
+                error_code=ErrorCodes.CREATE_ORDER_ERROR,
+                message="an order needs at least one item",
+                payload={"customer_id": self.customer_id, "restaurant_id": self.restaurant_id},
+            )
+        now = datetime.utcnow()
+        status = OrderStatusDocument(
+            order_id=str(self.order_id),
+            status=OrderStatus.PLACED.value,
+            changed_by=self.customer_id,
+            created_at=now,
+            updated_at=now,
+        )
+        total_amount = sum(item.subtotal for item in self.items)
+        order_doc = OrderDocument(
+            id=self.order_id,
+            customer_id=self.customer_id,
+            restaurant_id=self.restaurant_id,
+            total_amount=total_amount,
+            status=status,
+            order_items=self.items,
+            status_history=[status],
+            special_instructions=self.special_instructions,
+            outbox=[OrderEvents.status_changed(
+                status,
+                customer_id=self.customer_id,
+                restaurant_id=self.restaurant_id,
+                total_amount=total_amount,
+            )],
+            created_at=now,
+            updated_at=now,
+        )
+        return Order(document=order_doc)
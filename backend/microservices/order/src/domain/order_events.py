@@ -0,0 +1,25 @@
+from typing import Any, Dict
+from models.order_status import OrderStatus as OrderStatusDocument
+from models.outbox_event import OutboxEvent
+
+
+class OrderEvents:
+    # Events are written into the order's embedded outbox by the same update that changes the
+    # order, and published later by the outbox relay on the topic exchange as order.<status>.
+    ROUTING_KEY_PREFIX = "order"
+
+    @classmethod
+    def routing_key(cls, status: str) -> str:
+        return f"{cls.ROUTING_KEY_PREFIX}.{status}"
+
+    @classmethod
+    def status_changed(cls, entry: OrderStatusDocument, **details: Any) -> OutboxEvent:
+        payload: Dict[str, Any] = {
+            "order_id": entry.order_id,
+            "status": entry.status,
+            "changed_by": entry.changed_by,
+            "comments": entry.comments,
+            "occurred_at": entry.created_at.isoformat(),
+            **details,
+        }
+        return OutboxEvent(routing_key=cls.routing_key(entry.status), payload=payload, created_at=entry.created_at)
@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pymongo
+from bson import ObjectId
+from models.order import Order as OrderDocument, CUSTOMER_HISTORY_INDEX, INTERNAL_FIELDS
+from ftgo_utils.errors import ErrorCodes, BaseError
+
+
+class OrderHistory:
+    # One page of a customer's orders, newest first. Pages are cut by keyset on
+    # (created_at, _id) rather than skip, so every page is a bounded range scan of the
+    # customer_history index whatever its depth. The cursor handed back to clients is the
+    # keyset of the last order on the page, encoded so that it stays opaque.
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    # Enough for list views; items and status history are only returned when asked for.
+    DEFAULT_FIELDS = ("customer_id", "restaurant_id", "total_amount", "status", "created_at", "updated_at")
+    SORT = [("created_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)]
+
+    def __init__(
+        self,
+        customer_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        self.customer_id = customer_id
+        self.after = self.decode_cursor(cursor) if cursor else None
+        self.limit = min(max(int(limit or self.DEFAULT_PAGE_SIZE), 1), self.MAX_PAGE_SIZE)
+        self.fields = self.validate_fields(fields or self.DEFAULT_FIELDS)
+
+    @classmethod
+    def validate_fields(cls, fields: Iterable[str]) -> List[str]:
+        fields = list(dict.fromkeys(fields))
+        unknown = [field for field in fields if field not in OrderDocument.model_fields or field in INTERNAL_FIELDS]
+        if unknown:
+            raise BaseError(
+                error_code=ErrorCodes.DB_FETCH_ERROR,
+                message=f"unknown order fields: {', '.join(unknown)}",
+                payload={"fields": unknown},
+            )
+        return fields
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, order_id: ObjectId) -> str:
+        raw = json.dumps([created_at.isoformat(), str(order_id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+        try:
+            created_at, order_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return datetime.fromisoformat(created_at), ObjectId(order_id)
+        except Exception:
+            raise BaseError(error_code=ErrorCodes.DB_FETCH_ERROR, message="invalid history cursor", payload={"cursor": cursor})
+
+    def query(self) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"customer_id": self.customer_id}
+        if self.after is not None:
+            created_at, order_id = self.after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": order_id}},
+            ]
+        return query
+
+    def projection(self) -> Dict[str, int]:
+        # created_at is always read since the next cursor is built from it.
+        return {field: 1 for field in [*self.fields, "created_at"]}
+
+    @classmethod
+    def serialize(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {("id" if key == "_id" else key): cls.serialize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls.serialize(item) for item in value]
+        if isinstance(value, ObjectId):
+            return str(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def plan(self) -> Dict[str, Any]:
+        # The hint pins the compound index: the customer_id equality followed by the index's own
+        # (created_at, _id) order means an index range scan with no in-memory sort, and a missing
+        # index fails the query instead of silently falling back to a collection scan.
+        # One extra document tells whether another page exists without a count.
+        return {
+            "filter": self.query(),
+            "projection": self.projection(),
+            "sort": self.SORT,
+            "limit": self.limit + 1,
+            "hint": CUSTOMER_HISTORY_INDEX,
+        }
+
+    async def load(self) -> Dict[str, Any]:
+        plan = self.plan()
+        documents = await OrderDocument.get_motor_collection().find(
+            plan["filter"], plan["projection"], sort=plan["sort"], limit=plan["limit"],
+        ).hint(plan["hint"]).to_list(length=plan["limit"])
+        page = documents[:self.limit]
+        next_cursor = None
+        if len(documents) > self.limit:
+            next_cursor = self.encode_cursor(page[-1]["created_at"], page[-1]["_id"])
+        orders = []
+        for document in page:
+            if "created_at" not in self.fields:
+                document.pop("created_at")
+            orders.append(self.serialize(document))
+        return {"orders": orders, "next_cursor": next_cursor}
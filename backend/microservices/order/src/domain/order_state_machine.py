@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional
+from uuid import uuid4
+from beanie import PydanticObjectId, UpdateResponse
+from pymongo import UpdateOne
+from data_access.order_cache import OrderCache
+from models.order import Order as OrderDocument
+from models.order_status import OrderStatus as OrderStatusDocument
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import ErrorCodes, BaseError
+from domain.order_events import OrderEvents
+
+
+class OrderStateMachine:
+    # Allowed order status transitions. A transition is one conditional find_one_and_update that
+    # only matches while the order is still in a state the target may be reached from, sets the
+    # new status, appends the history entry and returns the updated order. Concurrent transitions
+    # on the same order therefore serialize in MongoDB: one wins, the others see a conflict.
+    # The same update queues the status event in the order's outbox. Batches of orders moving to
+    # the same status go out as one unordered bulk write of those conditional updates.
+    TRANSITIONS: Dict[str, FrozenSet[str]] = {
+        OrderStatus.PLACED.value: frozenset({
+            OrderStatus.CONFIRMED.value, OrderStatus.REJECTED.value, OrderStatus.CANCELLED.value,
+        }),
+        OrderStatus.CONFIRMED.value: frozenset({
+            OrderStatus.PAID.value, OrderStatus.PREPARING.value, OrderStatus.CANCELLED.value,
+        }),
+        OrderStatus.PAID.value: frozenset({OrderStatus.PREPARING.value, OrderStatus.CANCELLED.value}),
+        OrderStatus.PREPARING.value: frozenset({OrderStatus.READY_FOR_PICKUP.value, OrderStatus.CANCELLED.value}),
+        OrderStatus.READY_FOR_PICKUP.value: frozenset({OrderStatus.OUT_FOR_DELIVERY.value}),
+        OrderStatus.OUT_FOR_DELIVERY.value: frozenset({OrderStatus.DELIVERED.value}),
+        OrderStatus.DELIVERED.value: frozenset(),
+        OrderStatus.REJECTED.value: frozenset(),
+        OrderStatus.CANCELLED.value: frozenset(),
+    }
+    APPLIED = "applied"
+    CONFLICT = "conflict"
+    NOT_FOUND = "not_found"
+
+    @classmethod
+    def can_transition(cls, current: Optional[str], target: str) -> bool:
+        return target in cls.TRANSITIONS.get(current, frozenset())
+
+    @classmethod
+    def sources(cls, target: str) -> FrozenSet[str]:
+        return frozenset(status for status, targets in cls.TRANSITIONS.items() if target in targets)
+
+    @classmethod
+    def transition_query(cls, target: str, expected: Optional[str] = None) -> Dict[str, Any]:
+        sources = cls.sources(target)
+        if expected is not None:
+            sources = sources & {expected}
+        return {"status.status": {"$in": sorted(sources)}}
+
+    @classmethod
+    def transition_update(
+        cls,
+        order_id: str,
+        target: str,
+        changed_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        now: Optional[datetime] = None,
+        batch_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        now = now or datetime.utcnow()
+        entry = OrderStatusDocument(
+            order_id=order_id,
+            status=target,
+            changed_by=changed_by,
+            comments=comments,
+            batch_id=batch_id,
+            created_at=now,
+            updated_at=now,
+        )
+        return {
+            "$set": {**(fields or {}), "status": entry.model_dump(), "updated_at": now},
+            "$push": {"status_history": entry.model_dump(), "outbox": OrderEvents.status_changed(entry).model_dump()},
+        }
+
+    @classmethod
+    async def transition(
+        cls,
+        order_id: str,
+        target: OrderStatus,
+        changed_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        expected: Optional[str] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> OrderDocument:
+        target = OrderStatus(target).value
+        document = await OrderDocument.find_one({
+            "_id": PydanticObjectId(order_id),
+            **cls.transition_query(target, expected),
+        }).update(
+            cls.transition_update(order_id, target, changed_by, comments, fields),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if document is not None:
+            await OrderCache.put(document)
+            return document
+        # Only the failure path pays for a second read, to tell a missing order from a conflict.
+        current = await OrderDocument.find_one({"_id": PydanticObjectId(order_id)})
+        if current is None:
+            raise BaseError(error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload={"order_id": order_id})
+        raise BaseError(
+            error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR,
+            message=f"cannot move order from {current.status.status if current.status else None} to {target}",
+            payload={"order_id": order_id, "status": current.status.status if current.status else None, "target": target},
+        )
+
+    @classmethod
+    async def transition_many(
+        cls,
+        order_ids: List[str],
+        target: OrderStatus,
+        changed_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        # One bulk write plus one read of the touched orders. Every entry carries the batch's own
+        # id, which is how the read tells the updates that landed from orders that had already
+        # moved on, even to the same status by the same actor in a concurrent batch. Orders not
+        # matching `match` count as not found.
+        target = OrderStatus(target).value
+        match = match or {}
+        order_ids = list(dict.fromkeys(order_ids))
+        object_ids = {order_id: PydanticObjectId(order_id) for order_id in order_ids if PydanticObjectId.is_valid(order_id)}
+        now = datetime.utcnow()
+        batch_id = uuid4().hex
+        documents: Dict[str, OrderDocument] = {}
+        if object_ids:
+            await OrderDocument.get_motor_collection().bulk_write([
+                UpdateOne(
+                    {"_id": object_id, **cls.transition_query(target), **match},
+                    cls.transition_update(order_id, target, changed_by, comments, now=now, batch_id=batch_id),
+                )
+                for order_id, object_id in object_ids.items()
+            ], ordered=False)
+            documents = {
+                str(document.id): document
+                for document in await OrderDocument.find({"_id": {"$in": list(object_ids.values())}}).to_list()
+                if all(getattr(document, field) == value for field, value in match.items())
+            }
+        results, applied = [], []
+        for order_id in order_ids:
+            document = documents.get(order_id)
+            if document is None:
+                results.append({"order_id": order_id, "result": cls.NOT_FOUND, "status": None})
+                continue
+            status = document.status
+            won = status is not None and status.batch_id == batch_id
+            if won:
+                applied.append(document)
+            results.append({
+                "order_id": order_id,
+                "result": cls.APPLIED if won else cls.CONFLICT,
+                "status": status.status if status else None,
+            })
+        await OrderCache.put_many(applied)
+        return results
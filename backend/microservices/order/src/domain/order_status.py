@@ -1,47 +1,70 @@
-from typing import Optional, Any
-from domain.entities import OrderStatus, Order
+from typing import Any, Dict, List, Optional
 from ftgo_utils.enums import OrderStatus as OrderStatusEnum
 from ftgo_utils.errors import ErrorCodes, BaseError
 from domain import get_logger
+from domain.entities import Order
+from domain.order_state_machine import OrderStateMachine
+from utils import handle_exception
 
 class OrderStatusHandler:
+    MAX_BATCH_SIZE = 500
+
     @staticmethod
     async def change_order_status(
         order_id: str,
         new_status: OrderStatusEnum,
         changed_by: Optional[str] = None,
         comments: Optional[str] = None,
-    ):
+        **kwargs,
+    ) -> Dict[str, Any]:
+        try:
+            order = await OrderStateMachine.transition(order_id, new_status, changed_by=changed_by, comments=comments)
+            return Order(document=order).to_dict()
+        except Exception as e:
+            payload = {"order_id": order_id, "new_status": str(new_status)}
+            get_logger().error(ErrorCodes.CHANGE_ORDER_STATUS_ERROR.value, payload=payload)
+            await handle_exception(e, error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR, payload=payload)
+
+    @classmethod
+    async def change_many_order_statuses(
+        cls,
+        order_ids: List[str],
+        new_status: OrderStatusEnum,
+        changed_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         try:
-            order = await Order.load(order_id)
-            if not order:
-                raise BaseError(error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload={"order_id": order_id})
-            
-            await order.change_status(new_status, changed_by=changed_by, comments=comments)
-            await order.save()
+            if not order_ids or len(order_ids) > cls.MAX_BATCH_SIZE:
+                raise BaseError(
+                    error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR,
+                    message=f"a batch takes between 1 and {cls.MAX_BATCH_SIZE} orders",
+                    payload={"orders": len(order_ids or [])},
+                )
+            results = await OrderStateMachine.transition_many(
+                order_ids, new_status, changed_by=changed_by, comments=comments, match=match,
+            )
+            return {"results": results}
         except Exception as e:
-            payload = {"order_id": order_id, "new_status": new_status.value}
+            payload = {"orders": len(order_ids or []), "new_status": str(new_status)}
             get_logger().error(ErrorCodes.CHANGE_ORDER_STATUS_ERROR.value, payload=payload)
             await handle_exception(e, error_code=ErrorCodes.CHANGE_ORDER_STATUS_ERROR, payload=payload)
 
     @staticmethod
-    async def cancel_order(order_id: str):
-        await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.CANCELLED)
+    async def cancel_order(order_id: str, **kwargs) -> Dict[str, Any]:
+        return await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.CANCELLED, **kwargs)
 
     @staticmethod
-    async def mark_order_ready_for_pickup(order_id: str):
-        await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.READY_FOR_PICKUP)
+    async def mark_order_ready_for_pickup(order_id: str, **kwargs) -> Dict[str, Any]:
+        return await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.READY_FOR_PICKUP, **kwargs)
 
     @staticmethod
-    async def process_payment_confirmation(order_id: str):
+    async def process_payment_confirmation(order_id: str, payment_id: str) -> Dict[str, Any]:
         try:
-            order = await Order.load(order_id)
-            if not order:
-                raise BaseError(error_code=ErrorCodes.ORDER_NOT_FOUND_ERROR, payload={"order_id": order_id})
-            
-            await order.process_payment(order.payment_id)
-            await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.PAID)
+            order = await OrderStateMachine.transition(order_id, OrderStatusEnum.PAID, fields={"payment_id": payment_id})
+            return Order(document=order).to_dict()
         except Exception as e:
-            payload = {"order_id": order_id}
+            payload = {"order_id": order_id, "payment_id": payment_id}
             get_logger().error(ErrorCodes.PROCESS_PAYMENT_ERROR.value, payload=payload)
             await handle_exception(e, error_code=ErrorCodes.PROCESS_PAYMENT_ERROR, payload=payload)
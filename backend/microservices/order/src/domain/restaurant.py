@@ -1,18 +1,62 @@
-from typing import Dict, Optional, Any
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config import RollupConfig
+from data_access.order_rollup import OrderRollup
 from ftgo_utils.enums import OrderStatus as OrderStatusEnum
-from domain.entities import Order
+from ftgo_utils.errors import ErrorCodes, BaseError
+from domain import get_logger
+from domain.order_status import OrderStatusHandler
+from utils import handle_exception
 
 class RestaurantHandler:
     @staticmethod
-    async def confirm_order(order_id: str, **kwargs) -> Dict[str, Any]:
-        order = await RestaurantHandler.load_entity(Order, order_id)
-        await order.change_status(OrderStatusEnum.CONFIRMED)
-        await RestaurantHandler.save_entity(order)
-        return order.document.dict()
+    async def confirm_order(order_id: str, restaurant_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        return await OrderStatusHandler.change_order_status(order_id, OrderStatusEnum.CONFIRMED, changed_by=restaurant_id)
 
     @staticmethod
-    async def reject_order(order_id: str, reason: Optional[str] = None, **kwargs) -> Dict[str, Any]:
-        order = await RestaurantHandler.load_entity(Order, order_id)
-        await order.change_status(OrderStatusEnum.REJECTED, comments=reason)
-        await RestaurantHandler.save_entity(order)
-        return order.document.dict()
+    async def confirm_orders(order_ids: List[str], restaurant_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        # Orders of other restaurants are reported as not found rather than confirmed.
+        return await OrderStatusHandler.change_many_order_statuses(
+            order_ids,
+            OrderStatusEnum.CONFIRMED,
+            changed_by=restaurant_id,
+            match={"restaurant_id": restaurant_id} if restaurant_id else None,
+        )
+
+    @staticmethod
+    async def reject_order(order_id: str, reason: Optional[str] = None, restaurant_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        return await OrderStatusHandler.change_order_status(
+            order_id, OrderStatusEnum.REJECTED, changed_by=restaurant_id, comments=reason
+        )
+
+    @staticmethod
+    async def get_order_rollups(restaurant_id: str, start_day: str, end_day: str, **kwargs) -> Dict[str, Any]:
+        # Served from the daily rollups only; raw orders are never scanned.
+        try:
+            try:
+                start, end = (datetime.strptime(day, OrderRollup.DAY_FORMAT) for day in (start_day, end_day))
+            except (TypeError, ValueError):
+                raise BaseError(error_code=ErrorCodes.DB_FETCH_ERROR, message="days are YYYY-MM-DD")
+            if not 0 <= (end - start).days < RollupConfig().max_range_days:
+                raise BaseError(
+                    error_code=ErrorCodes.DB_FETCH_ERROR,
+                    message=f"a range covers between 1 and {RollupConfig().max_range_days} days",
+                )
+            rollups = await OrderRollup.load(restaurant_id, start_day, end_day)
+            statuses = Counter()
+            for rollup in rollups:
+                statuses.update(rollup.statuses)
+            return {
+                "restaurant_id": restaurant_id,
+                "days": [rollup.model_dump(include={"day", "orders", "revenue", "statuses"}) for rollup in rollups],
+                "totals": {
+                    "orders": sum(rollup.orders for rollup in rollups),
+                    "revenue": sum(rollup.revenue for rollup in rollups),
+                    "statuses": dict(statuses),
+                },
+            }
+        except Exception as e:
+            payload = {"restaurant_id": restaurant_id, "start_day": start_day, "end_day": end_day}
+            get_logger().error(ErrorCodes.DB_FETCH_ERROR.value, payload=payload)
+            await handle_exception(e, error_code=ErrorCodes.DB_FETCH_ERROR, payload=payload)
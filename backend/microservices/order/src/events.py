@@ -19,7 +19,7 @@ async def register_events():
 
     events_handlers = {
         # Order Lifecycle Events
-        # 'order.history': OrderService.get_history,
+        'order.history': OrderService.get_history,
         'order.create': OrderService.create_order,
         'order.update': OrderService.update_order,
         'order.cancel': OrderStatusService.cancel_order,
@@ -27,6 +27,7 @@ async def register_events():
 
         # Order Status Events
         'order.status.change': OrderStatusService.change_order_status,
+        'order.status.change_many': OrderStatusService.change_many_order_statuses,
 
         # Delivery Coordination Events
         'order.delivery.update_status': DeliveryService.update_delivery_status,
@@ -34,7 +35,9 @@ async def register_events():
 
         # Restaurant Events
         'order.restaurant.confirm': RestaurantService.confirm_order,
+        'order.restaurant.confirm_many': RestaurantService.confirm_orders,
         'order.restaurant.reject': RestaurantService.reject_order,
+        'order.restaurant.rollups': RestaurantService.get_order_rollups,
         
         'order.delivery.driver_found': DeliveryService.assign_driver_to_delivery,
     }
@@ -6,22 +6,27 @@ from ftgo_utils.logger import init_logging
 
 from config import ServiceConfig
 from data_access.events.lifecycle import setup, teardown
+from domain.dispatch import DispatchEngine
 from events import register_events
+from utils.metrics import start_metrics_server
 
 load_dotenv()
 
 async def setup_env():
     service_config = ServiceConfig()
     init_logging(level=service_config.log_level)
+    start_metrics_server()
 
 async def startup_event():
     await setup_env()
     await setup()
     await asyncio.sleep(1)
     await register_events()
+    await DispatchEngine.initialize()
     await asyncio.Future()
 
 async def shutdown_event():
+    await DispatchEngine.terminate()
     await teardown()
 
 if __name__ == '__main__':
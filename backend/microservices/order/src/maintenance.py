@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+from ftgo_utils.logger import init_logging
+
+from config import ServiceConfig
+from data_access.db_repository import DatabaseRepository
+from data_access.order_migration import OrderEmbeddingMigration
+from data_access.order_rollup import OrderRollup
+
+load_dotenv()
+
+# Offline maintenance for the orders collection:
+#   python src/maintenance.py embed-orders [--batch-size 500]      embed linked items and status history
+#   python src/maintenance.py rebuild-rollups [--batch-size 5000]  recompute restaurant daily rollups
+
+
+async def run(args: argparse.Namespace) -> None:
+    init_logging(level=ServiceConfig().log_level)
+    await DatabaseRepository.initialize()
+    try:
+        if args.command == "embed-orders":
+            migrated = await OrderEmbeddingMigration.run(batch_size=args.batch_size)
+            print(f"Embedded items and history into {migrated} orders")
+        elif args.command == "rebuild-rollups":
+            aggregated = await OrderRollup.rebuild(batch_size=args.batch_size)
+            print(f"Rebuilt restaurant daily rollups from {aggregated} orders")
+    finally:
+        await DatabaseRepository.terminate()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Order data maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    embed_parser = commands.add_parser("embed-orders", help="Embed Link-referenced order items and status history")
+    embed_parser.add_argument("--batch-size", type=int, default=500)
+    rollup_parser = commands.add_parser("rebuild-rollups", help="Recompute restaurant daily rollups from the orders")
+    rollup_parser.add_argument("--batch-size", type=int, default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
 from models.delivery_detail import DeliveryDetail
 from models.order_item import OrderItem
 from models.order_status import OrderStatus
+from models.outbox_event import OutboxEvent
 from models.order import Order
+from models.restaurant_daily_rollup import RestaurantDailyRollup
@@ -5,15 +5,21 @@ from typing import Optional
 from beanie import Document
 from pydantic import Field
 from pymongo import IndexModel
+from ftgo_utils.enums import DeliveryStatus
 
+# Deliveries a driver is still carrying; a driver holds at most one of them at a time.
+ACTIVE_DELIVERY_STATUSES = [DeliveryStatus.ASSIGNED.value, DeliveryStatus.PICKED_UP.value]
 
 
 class DeliveryDetail(Document):
     order_id: str
-    driver_id: str
+    driver_id: Optional[str] = None
     delivery_status: str = Field(..., max_length=50)
     source_address_id: str
     destination_address_id: str
+    # Where the driver picks the order up; deliveries without it are not dispatched automatically.
+    pickup_latitude: Optional[float] = None
+    pickup_longitude: Optional[float] = None
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -23,7 +29,22 @@ class DeliveryDetail(Document):
         indexes = [
             IndexModel([("delivery_status", pymongo.ASCENDING)], name="delivery_detail_delivery_status_index"),
             IndexModel([("order_id", pymongo.ASCENDING)], name="delivery_detail_order_id_index"),
-            IndexModel([("driver_id", pymongo.ASCENDING)], name="delivery_detail_driver_id_index"),
+            IndexModel(
+                [("driver_id", pymongo.ASCENDING), ("delivery_status", pymongo.ASCENDING)],
+                name="delivery_detail_driver_status_index",
+            ),
+            IndexModel(
+                [("delivery_status", pymongo.ASCENDING), ("driver_id", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)],
+                name="delivery_detail_dispatch_index",
+            ),
+            # Makes claiming a driver atomic: a second assignment of a busy driver, from another
+            # dispatcher replica or by hand, fails with a duplicate key instead of double-booking.
+            IndexModel(
+                [("driver_id", pymongo.ASCENDING)],
+                name="delivery_detail_active_driver_unique_index",
+                unique=True,
+                partialFilterExpression={"delivery_status": {"$in": ACTIVE_DELIVERY_STATUSES}},
+            ),
         ]
         use_state_management = True
         validate_on_save = True
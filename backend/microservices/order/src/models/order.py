@@ -2,30 +2,49 @@ import pymongo
 
 from datetime import datetime
 from typing import Optional, List
-from beanie import Document, Link
+from beanie import Document
 from pydantic import Field
 from pymongo import IndexModel
 from models.order_item import OrderItem
 from models.order_status import OrderStatus
+from models.outbox_event import OutboxEvent
+
+# Orders written before items and history were embedded lack this field (see data_access/order_migration.py).
+SCHEMA_VERSION = 2
+# Serves a customer's order history newest first with (created_at, _id) as the keyset; it also
+# covers plain customer_id lookups, so no separate customer index is kept.
+CUSTOMER_HISTORY_INDEX = "order_customer_history_index"
+# Sparse over the embedded outbox, so it only holds orders with events still to publish.
+OUTBOX_INDEX = "order_outbox_index"
+# Serves restaurant lookups and the per-day recounts of the restaurant daily rollups.
+RESTAURANT_DAY_INDEX = "order_restaurant_created_at_index"
+# Bookkeeping that stays inside the service and is never projected into a response.
+INTERNAL_FIELDS = ("id", "schema_version", "outbox")
 
 class Order(Document):
     customer_id: str
     restaurant_id: str
     total_amount: float = Field(..., gt=0)
-    status: OrderStatus
-    order_items: List[Link[OrderItem]] = []
-    status_history: Optional[List[Link[OrderStatus]]] = [] 
+    status: Optional[OrderStatus] = None
+    order_items: List[OrderItem] = []
+    status_history: List[OrderStatus] = []
     payment_id: Optional[str] = None
     special_instructions: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    schema_version: int = SCHEMA_VERSION
+    outbox: List[OutboxEvent] = []
 
     class Settings:
         name = "orders"
         indexes = [
-            IndexModel([("customer_id", pymongo.ASCENDING)], name="order_customer_id_index"),
-            IndexModel([("restaurant_id", pymongo.ASCENDING)], name="order_restaurant_id_index"),
+            IndexModel(
+                [("customer_id", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)],
+                name=CUSTOMER_HISTORY_INDEX,
+            ),
+            IndexModel([("restaurant_id", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)], name=RESTAURANT_DAY_INDEX),
             IndexModel([("created_at", pymongo.DESCENDING)], name="order_created_at_index"),
+            IndexModel([("outbox.created_at", pymongo.ASCENDING)], name=OUTBOX_INDEX, sparse=True),
         ]
         use_state_management = True
         validate_on_save = True
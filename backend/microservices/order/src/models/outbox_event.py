@@ -0,0 +1,12 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+from pydantic import BaseModel, Field
+
+# Embedded in Order.outbox until the relay has published it (see data_access/outbox_relay.py).
+class OutboxEvent(BaseModel):
+    event_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    routing_key: str = Field(..., max_length=100)
+    payload: Dict[str, Any] = {}
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,30 @@
+import pymongo
+
+from datetime import datetime
+from typing import Dict, List
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+ROLLUP_KEY_INDEX = "restaurant_daily_rollup_key_index"
+
+
+class RestaurantDailyRollup(Document):
+    # Orders of one restaurant created on one UTC day. Terminal outcomes are counted on the day
+    # the order was created, so a day's figures only change while its orders are still open.
+    restaurant_id: str
+    day: str
+    orders: int = 0
+    revenue: float = 0.0
+    statuses: Dict[str, int] = {}
+    # Latest outbox events counted in here, so an event the relay republishes is not counted twice.
+    applied_events: List[str] = []
+    # Bumped by every change, so a rebuild can tell whether the relay wrote while it recounted.
+    version: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "restaurant_daily_rollups"
+        indexes = [
+            IndexModel([("restaurant_id", pymongo.ASCENDING), ("day", pymongo.ASCENDING)], name=ROLLUP_KEY_INDEX, unique=True),
+        ]
@@ -0,0 +1,72 @@
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from config import MetricsConfig
+
+ORDER_CACHE_LOOKUPS = Counter(
+    "order_cache_lookups_total",
+    "Order reads served through the active order cache, by result (hit, miss or error)",
+    ["result"],
+)
+ORDER_CACHE_HIT_RATIO = Gauge(
+    "order_cache_hit_ratio",
+    "Share of order cache lookups served from Redis since the process started",
+)
+ORDER_CACHE_MONGO_READS_SAVED = Counter(
+    "order_cache_mongo_reads_saved_total",
+    "MongoDB reads avoided because the order was served from the cache",
+)
+ORDER_CACHE_WRITES = Counter(
+    "order_cache_writes_total",
+    "Orders written through to the cache, by whether they are active or terminal, or superseded by a newer cached copy",
+    ["state"],
+)
+ORDER_OUTBOX_PUBLISHED = Counter(
+    "order_outbox_published_total",
+    "Order events published from the outbox, by routing key",
+    ["routing_key"],
+)
+ORDER_OUTBOX_PUBLISH_FAILURES = Counter(
+    "order_outbox_publish_failures_total",
+    "Order event publishes that failed and were left in the outbox for the next pass",
+)
+ORDER_OUTBOX_LAG = Gauge(
+    "order_outbox_lag_seconds",
+    "Age of the oldest order event still waiting in the outbox at the start of the last relay pass",
+)
+ORDER_OUTBOX_RELAY_BATCH = Histogram(
+    "order_outbox_relay_batch_events",
+    "Events published by one outbox relay pass",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500),
+)
+ORDER_OUTBOX_RELAY_LATENCY = Histogram(
+    "order_outbox_relay_latency_seconds",
+    "Time spent on one outbox relay pass, publishing and clearing included",
+)
+DISPATCH_PENDING = Gauge(
+    "order_dispatch_pending_deliveries",
+    "Pending deliveries read by the last dispatch tick",
+)
+DISPATCH_ASSIGNMENTS = Counter(
+    "order_dispatch_assignments_total",
+    "Deliveries assigned to a driver by the dispatch engine, by solver",
+    ["method"],
+)
+DISPATCH_PICKUP_DISTANCE = Histogram(
+    "order_dispatch_pickup_distance_meters",
+    "Distance from the assigned driver to the pickup at assignment time",
+    buckets=(100, 250, 500, 1000, 1500, 2000, 3000, 5000),
+)
+DISPATCH_TICK_LATENCY = Histogram(
+    "order_dispatch_tick_latency_seconds",
+    "Time spent on one dispatch tick, location calls included",
+)
+
+_metrics_server_started = False
+
+def start_metrics_server() -> None:
+    global _metrics_server_started
+    metrics_config = MetricsConfig()
+    if not metrics_config.enabled or _metrics_server_started:
+        return
+    start_http_server(metrics_config.port)
+    _metrics_server_started = True
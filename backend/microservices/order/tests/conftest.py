@@ -2,6 +2,12 @@ import pytest
 import asyncio
 import pytest_asyncio
 
+from data_access.cache_repository import CacheRepository
+from data_access.event_publisher import EventPublisher
+from models import DeliveryDetail, Order, RestaurantDailyRollup
+from test_doubles.broker import FakeExchange
+from test_doubles.mongo import FakeMongo
+from test_doubles.redis import FakeAsyncRedis
 from test_doubles.time import TimeProvider
 
 MOCKED_TIMESTAMP = 1704067200 # 2024, January 1	
@@ -13,3 +19,20 @@ def time_machine():
     yield provider
     provider.stop()
 
+@pytest_asyncio.fixture(scope='function')
+async def fake_mongo():
+    return await FakeMongo().init([Order, DeliveryDetail, RestaurantDailyRollup])
+
+@pytest.fixture(scope='function')
+def fake_redis():
+    redis = FakeAsyncRedis()
+    CacheRepository._data_access = redis
+    yield redis
+    CacheRepository._data_access = None
+
+@pytest.fixture(scope='function')
+def fake_exchange():
+    exchange = FakeExchange()
+    EventPublisher._exchange = exchange
+    yield exchange
+    EventPublisher._exchange = None
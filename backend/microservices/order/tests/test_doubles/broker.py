@@ -0,0 +1,23 @@
+import json
+from typing import Any, Dict, List, Optional, Set
+
+
+class FakeExchange:
+    # Records what EventPublisher would hand to the broker; routing keys in fail_routing_keys
+    # raise as an unconfirmed publish would.
+    def __init__(self, fail_routing_keys: Optional[Set[str]] = None):
+        self.published: List[Dict[str, Any]] = []
+        self.fail_routing_keys = fail_routing_keys or set()
+
+    async def publish(self, message, routing_key: str, **kwargs) -> None:
+        if routing_key in self.fail_routing_keys:
+            raise ConnectionError(f"publish of {routing_key} was not confirmed")
+        self.published.append({
+            "routing_key": routing_key,
+            "message_id": message.message_id,
+            "body": json.loads(message.body),
+        })
+
+    @property
+    def routing_keys(self) -> List[str]:
+        return [message["routing_key"] for message in self.published]
@@ -0,0 +1,84 @@
+import asyncio
+import inspect
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from beanie import Document, init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+
+class CountingCollection:
+    # Wraps a mock collection and counts every call that would be a round-trip to MongoDB.
+    # Awaited calls yield to the event loop first, as a network round-trip would, so concurrent
+    # coroutines interleave between their reads and writes.
+    OPERATIONS = {
+        "insert_one", "insert_many", "replace_one", "update_one", "update_many", "find_one",
+        "find_one_and_update", "find_one_and_replace", "delete_one", "delete_many", "bulk_write",
+        "find", "aggregate", "count_documents",
+    }
+
+    def __init__(self, collection: Any, operations: Counter, calls: List[Tuple[str, tuple, Dict[str, Any]]]):
+        self._collection = collection
+        self._operations = operations
+        self._calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._collection, name)
+        if name in self.OPERATIONS:
+            def counted(*args, **kwargs):
+                self._operations[name] += 1
+                self._calls.append((name, args, kwargs))
+                result = attribute(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    return self._after_yield(result)
+                return result
+            return counted
+        return attribute
+
+    @staticmethod
+    async def _after_yield(result: Any) -> Any:
+        await asyncio.sleep(0)
+        return await result
+
+    def __getitem__(self, name: str) -> Any:
+        return self._collection[name]
+
+
+class FakeMongo:
+    def __init__(self):
+        self.client = AsyncMongoMockClient()
+        self.database = self.client["order_database"]
+        self.operations: Counter = Counter()
+        self.calls: List[Tuple[str, tuple, Dict[str, Any]]] = []
+
+    async def init(self, document_models: Iterable[Type[Document]]) -> "FakeMongo":
+        await init_beanie(database=self.database, document_models=list(document_models))
+        for model in document_models:
+            settings = model.get_settings()
+            await self._restore_partial_indexes(settings)
+            settings.motor_collection = CountingCollection(settings.motor_collection, self.operations, self.calls)
+        return self
+
+    @staticmethod
+    async def _restore_partial_indexes(settings: Any) -> None:
+        # mongomock's create_indexes drops partialFilterExpression, which would turn a partial
+        # unique index into a full one; those indexes are recreated with their filter.
+        for index in settings.indexes or []:
+            document = index.index.document
+            if "partialFilterExpression" not in document:
+                continue
+            await settings.motor_collection.drop_index(document["name"])
+            await settings.motor_collection.create_index(
+                list(document["key"].items()),
+                name=document["name"],
+                unique=document.get("unique", False),
+                partialFilterExpression=document["partialFilterExpression"],
+            )
+
+    @property
+    def operation_count(self) -> int:
+        return sum(self.operations.values())
+
+    def reset_operations(self) -> None:
+        self.operations.clear()
+        self.calls.clear()
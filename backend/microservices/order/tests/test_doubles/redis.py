@@ -0,0 +1,106 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis: "FakeAsyncRedis"):
+        self.redis = redis
+        self.commands: List[Tuple[Callable, Tuple]] = []
+        self._watched: Dict[str, Optional[str]] = {}
+
+    async def watch(self, *keys: str):
+        self.redis.round_trips += 1
+        self._watched = {key: self.redis.get_value(key) for key in keys}
+
+    def multi(self):
+        return self
+
+    async def reset(self):
+        self.commands = []
+        self._watched = {}
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        if any(self.redis.get_value(key) != value for key, value in self._watched.items()):
+            self.commands = []
+            self._watched = {}
+            raise WatchError("Watched variable changed.")
+        results = [method(*args) for method, args in self.commands]
+        self.commands = []
+        self._watched = {}
+        return results
+
+    def get(self, key: str):
+        self.commands.append((self.redis.get_value, (key,)))
+        return self
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False):
+        self.commands.append((self.redis.set_value, (key, value, ex, nx)))
+        return self
+
+    def delete(self, key: str):
+        self.commands.append((self.redis.delete_value, (key,)))
+        return self
+
+    def expire(self, key: str, ttl: int):
+        self.commands.append((self.redis.expire_value, (key, ttl)))
+        return self
+
+
+class FakeAsyncRedisSession:
+    def __init__(self, redis: "FakeAsyncRedis"):
+        self.redis = redis
+
+    async def flushdb(self):
+        self.redis.store.clear()
+        self.redis.expiry_store.clear()
+
+    def pipeline(self, transaction: bool = True):
+        return FakeRedisPipeline(self.redis)
+
+
+class FakeAsyncRedis:
+    # String commands only, which is all the order service's CacheRepository issues.
+    def __init__(self, time_provider: Callable = time.time):
+        self.store: Dict[str, Any] = {}
+        self.expiry_store: Dict[str, float] = {}
+        self.time_provider = time_provider
+        self.round_trips = 0
+
+    @asynccontextmanager
+    async def get_or_create_session(self):
+        yield FakeAsyncRedisSession(self)
+
+    async def disconnect(self):
+        pass
+
+    def ttl(self, key: str) -> Optional[float]:
+        expires_at = self.expiry_store.get(key)
+        return None if expires_at is None else expires_at - self.time_provider()
+
+    def get_value(self, key: str) -> Optional[str]:
+        if key in self.expiry_store and self.expiry_store[key] <= self.time_provider():
+            self.delete_value(key)
+        return self.store.get(key)
+
+    def set_value(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self.get_value(key) is not None:
+            return None
+        self.store[key] = value
+        self.expiry_store.pop(key, None)
+        if ex is not None:
+            self.expiry_store[key] = self.time_provider() + ex
+        return True
+
+    def delete_value(self, key: str) -> int:
+        self.expiry_store.pop(key, None)
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    def expire_value(self, key: str, ttl: int) -> bool:
+        if self.get_value(key) is None:
+            return False
+        self.expiry_store[key] = self.time_provider() + ttl
+        return True
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from beanie import PydanticObjectId
+from prometheus_client import REGISTRY
+
+from config import OrderCacheConfig
+from data_access.cache_repository import CacheRepository
+from data_access.order_cache import OrderCache
+from domain.order import OrderHandler
+from domain.order_state_machine import OrderStateMachine
+from ftgo_utils.enums import OrderStatus
+from models import Order
+
+ITEMS = [{"menu_item_id": "item_0", "quantity": 2, "item_price": 4.0}]
+
+
+def reads_saved() -> float:
+    return REGISTRY.get_sample_value("order_cache_mongo_reads_saved_total") or 0.0
+
+
+def cache_key(order_id: str) -> str:
+    return f"{OrderCacheConfig().group}:{order_id}"
+
+
+@pytest.mark.asyncio
+async def test_active_orders_are_served_from_the_cache_after_every_transition(fake_mongo, fake_redis):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    await OrderStateMachine.transition(created["id"], OrderStatus.CONFIRMED)
+    fake_mongo.reset_operations()
+    saved_before = reads_saved()
+
+    details = await OrderHandler.get_order_details(created["id"])
+
+    assert fake_mongo.operation_count == 0
+    assert reads_saved() == saved_before + 1
+    assert details["status"]["status"] == OrderStatus.CONFIRMED.value
+    assert [entry["status"] for entry in details["status_history"]] == ["placed", "confirmed"]
+    assert details == (await OrderHandler.get_order_details(created["id"]))
+
+
+@pytest.mark.asyncio
+async def test_terminal_orders_expire_after_the_grace_ttl_and_are_not_refilled(fake_mongo, fake_redis):
+    config = OrderCacheConfig()
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    assert fake_redis.ttl(cache_key(created["id"])) == pytest.approx(config.active_ttl_s, abs=1)
+
+    await OrderStateMachine.transition(created["id"], OrderStatus.REJECTED)
+    assert fake_redis.ttl(cache_key(created["id"])) == pytest.approx(config.terminal_grace_ttl_s, abs=1)
+
+    fake_redis.time_provider = lambda: fake_redis.expiry_store[cache_key(created["id"])] + 1
+    fake_mongo.reset_operations()
+    details = await OrderHandler.get_order_details(created["id"])
+
+    assert details["status"]["status"] == OrderStatus.REJECTED.value
+    assert fake_mongo.operations == {"find_one": 1}
+    assert cache_key(created["id"]) not in fake_redis.store
+
+
+@pytest.mark.asyncio
+async def test_misses_fill_the_cache_and_redis_failures_fall_back_to_mongo(fake_mongo, fake_redis):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    fake_redis.store.clear()
+    fake_mongo.reset_operations()
+
+    await OrderHandler.get_order_details(created["id"])
+    await OrderHandler.get_order_details(created["id"])
+    assert fake_mongo.operations == {"find_one": 1}
+
+    CacheRepository._data_access = None
+    details = await OrderHandler.get_order_details(created["id"])
+    assert details["id"] == created["id"]
+    assert fake_mongo.operations == {"find_one": 2}
+
+
+def cached_status(fake_redis, order_id: str) -> str:
+    return json.loads(fake_redis.get_value(cache_key(order_id)))["status"]["status"]
+
+
+@pytest.mark.asyncio
+async def test_a_write_through_finishing_late_does_not_replace_a_newer_order(fake_mongo, fake_redis):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    placed = await Order.get(PydanticObjectId(created["id"]))
+    await OrderStateMachine.transition(created["id"], OrderStatus.CONFIRMED)
+
+    await OrderCache.put(placed)
+    await OrderCache.put_many([placed])
+
+    assert cached_status(fake_redis, created["id"]) == OrderStatus.CONFIRMED.value
+
+
+@pytest.mark.asyncio
+async def test_a_write_landing_between_the_read_and_the_write_is_rechecked(fake_mongo, fake_redis, monkeypatch):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    placed = await Order.get(PydanticObjectId(created["id"]))
+    await OrderStateMachine.transition(created["id"], OrderStatus.CONFIRMED)
+    confirmed = await Order.get(PydanticObjectId(created["id"]))
+    await OrderCache.evict(created["id"])
+    fetch = CacheRepository.fetch.__func__
+    reads = []
+
+    async def fetch_then_race(cls, keys, *args, **kwargs):
+        values = await fetch(cls, keys, *args, **kwargs)
+        if not reads:
+            # The newer write-through lands after the stale writer has read the (missing) entry.
+            fake_redis.set_value(cache_key(created["id"]), confirmed.model_dump_json(exclude={"outbox"}))
+        reads.append(values)
+        return values
+
+    monkeypatch.setattr(CacheRepository, "fetch", classmethod(fetch_then_race))
+    await OrderCache.put(placed)
+
+    assert len(reads) == 2
+    assert cached_status(fake_redis, created["id"]) == OrderStatus.CONFIRMED.value
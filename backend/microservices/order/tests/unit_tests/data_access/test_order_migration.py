@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from bson import DBRef, ObjectId
+
+from data_access.order_migration import OrderEmbeddingMigration
+from models import OrderItem, OrderStatus
+from models.order import SCHEMA_VERSION
+
+
+def legacy_documents():
+    order_id = ObjectId()
+    items = {
+        ObjectId(): {"order_id": str(order_id), "menu_item_id": f"item_{index}", "quantity": 1, "item_price": 5.0,
+                     "subtotal": 5.0, "created_at": datetime(2024, 1, 1), "revision_id": None}
+        for index in range(3)
+    }
+    statuses = {
+        ObjectId(): {"order_id": str(order_id), "status": status, "created_at": datetime(2024, 1, 1)}
+        for status in ("placed", "confirmed")
+    }
+    item_ids, status_ids = list(items), list(statuses)
+    for document_id, document in [*items.items(), *statuses.items()]:
+        document["_id"] = document_id
+    order = {
+        "_id": order_id,
+        # Reversed on purpose: the order's reference order wins, not the lookup order.
+        "order_items": [DBRef("order_items", item_id) for item_id in reversed(item_ids)] + [DBRef("order_items", ObjectId())],
+        "status_history": [DBRef("order_status", status_id) for status_id in status_ids],
+        "status": {"status": "confirmed", "_id": status_ids[-1]},
+    }
+    return order, items, statuses
+
+
+def test_links_are_replaced_by_their_documents_in_reference_order():
+    order, items, statuses = legacy_documents()
+
+    update = OrderEmbeddingMigration.build_update(order, items, statuses)
+
+    assert update._filter == {"_id": order["_id"], "schema_version": {"$ne": SCHEMA_VERSION}}
+    embedded = update._doc["$set"]
+    assert [item["menu_item_id"] for item in embedded["order_items"]] == ["item_2", "item_1", "item_0"]
+    assert all("_id" not in item and "revision_id" not in item for item in embedded["order_items"])
+    assert [OrderStatus(**entry).status for entry in embedded["status_history"]] == ["placed", "confirmed"]
+    assert OrderStatus(**embedded["status"]).status == "confirmed"
+    assert all(OrderItem(**item).subtotal == 5.0 for item in embedded["order_items"])
+    assert embedded["schema_version"] == SCHEMA_VERSION
+
+
+def test_already_embedded_entries_are_kept():
+    order, items, statuses = legacy_documents()
+    entry = {"status": "placed", "created_at": datetime(2024, 1, 1)}
+    order.update(status_history=[entry], status=entry, order_items=[])
+
+    embedded = OrderEmbeddingMigration.build_update(order, items, statuses)._doc["$set"]
+
+    assert embedded["status_history"] == [entry]
+    assert embedded["status"] == entry
+    assert embedded["order_items"] == []
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import pytest
+
+from data_access.order_rollup import OrderRollup
+from data_access.outbox_relay import OrderOutboxRelay
+from domain.order import OrderHandler
+from domain.order_state_machine import OrderStateMachine
+from domain.restaurant import RestaurantHandler
+from ftgo_utils.enums import OrderStatus
+from models import Order, RestaurantDailyRollup
+
+ITEMS = [{"menu_item_id": "item_0", "quantity": 2, "item_price": 4.0}]
+DELIVERY_PATH = [
+    OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY_FOR_PICKUP,
+    OrderStatus.OUT_FOR_DELIVERY, OrderStatus.DELIVERED,
+]
+
+
+async def place_orders():
+    orders = [await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS) for _ in range(4)]
+    await OrderHandler.create_order("customer_1", "restaurant_2", ITEMS)
+    for status in DELIVERY_PATH:
+        await OrderStateMachine.transition(orders[0]["id"], status)
+    await OrderStateMachine.transition(orders[1]["id"], OrderStatus.CANCELLED)
+    await RestaurantHandler.reject_order(orders[2]["id"], restaurant_id="restaurant_1")
+    await OrderOutboxRelay.relay()
+    return orders
+
+
+async def stored_rollups():
+    return sorted(
+        (rollup.restaurant_id, rollup.day, rollup.orders, rollup.revenue, rollup.statuses)
+        for rollup in await RestaurantDailyRollup.find_all().to_list()
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_orders_and_answer_ranges_without_reading_orders(fake_mongo, fake_redis, fake_exchange):
+    await place_orders()
+    today = OrderRollup.day(datetime.utcnow())
+    fake_mongo.reset_operations()
+
+    report = await RestaurantHandler.get_order_rollups("restaurant_1", today, today)
+
+    # A single read of the rollup collection; raw orders are not touched.
+    [(operation, _, kwargs)] = fake_mongo.calls
+    assert (operation, kwargs["filter"]) == ("find", {"restaurant_id": "restaurant_1", "day": {"$gte": today, "$lte": today}})
+    assert report["days"] == [{
+        "day": today, "orders": 4, "revenue": 8.0, "statuses": {"delivered": 1, "cancelled": 1, "rejected": 1},
+    }]
+    assert report["totals"] == {"orders": 4, "revenue": 8.0, "statuses": {"delivered": 1, "cancelled": 1, "rejected": 1}}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_aggregates_bounded_batches_into_the_same_rollups(fake_mongo, fake_redis, fake_exchange):
+    await place_orders()
+    incremental = await stored_rollups()
+    await RestaurantDailyRollup.get_motor_collection().drop()
+    fake_mongo.reset_operations()
+
+    aggregated = await OrderRollup.rebuild(batch_size=2)
+
+    assert aggregated == 5
+    # Three batches of at most two orders and the empty round that ends the scan, then one
+    # recount per (restaurant, day) key.
+    assert fake_mongo.operations["aggregate"] == 4 + 2
+    assert await stored_rollups() == incremental
+
+
+@pytest.mark.asyncio
+async def test_events_republished_after_a_failed_pull_are_counted_once(fake_mongo, fake_redis, fake_exchange, monkeypatch):
+    orders = await place_orders()
+    await OrderStateMachine.transition(orders[3]["id"], OrderStatus.CANCELLED)
+    before = await stored_rollups()
+    collection = Order.get_motor_collection()
+    bulk_write = collection.bulk_write
+
+    async def failing_pull(*args, **kwargs):
+        raise RuntimeError("connection reset")
+
+    # The rollups take the event, then the pull of the published event fails.
+    monkeypatch.setattr(collection, "bulk_write", failing_pull)
+    with pytest.raises(RuntimeError):
+        await OrderOutboxRelay.relay()
+    monkeypatch.setattr(collection, "bulk_write", bulk_write)
+    assert await OrderOutboxRelay.relay() == 1
+
+    assert fake_exchange.routing_keys[-2:] == ["order.cancelled", "order.cancelled"]
+    [rollup_1, rollup_2] = before
+    assert await stored_rollups() == [
+        rollup_1[:4] + ({**rollup_1[4], "cancelled": 2},),
+        rollup_2,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_converges_while_the_relay_keeps_writing(fake_mongo, fake_redis, fake_exchange, monkeypatch):
+    orders = await place_orders()
+    today = OrderRollup.day(datetime.utcnow())
+    rollups = RestaurantDailyRollup.get_motor_collection()
+    await rollups.update_one({"restaurant_id": "restaurant_1"}, {"$set": {"orders": 100}})
+    await rollups.delete_one({"restaurant_id": "restaurant_2"})
+    # Still in its outbox when the rebuild counts it.
+    await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    aggregate_key = OrderRollup._aggregate_key.__func__
+    raced = []
+
+    async def aggregate_then_race(cls, key):
+        group = await aggregate_key(cls, key)
+        if key["restaurant_id"] == "restaurant_1" and not raced:
+            # The recount is already stale: an order moves on and the relay applies it, and a
+            # new order is queued that only the relay after the rebuild publishes.
+            await OrderStateMachine.transition(orders[3]["id"], OrderStatus.CANCELLED)
+            await OrderOutboxRelay.relay()
+            await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+        raced.append(key["restaurant_id"])
+        return group
+
+    monkeypatch.setattr(OrderRollup, "_aggregate_key", classmethod(aggregate_then_race))
+    await OrderRollup.rebuild(batch_size=2)
+    monkeypatch.undo()
+    await OrderOutboxRelay.relay()
+
+    assert sorted(raced) == ["restaurant_1", "restaurant_1", "restaurant_2"]
+    assert await stored_rollups() == [
+        ("restaurant_1", today, 6, 8.0, {"delivered": 1, "cancelled": 2, "rejected": 1}),
+        ("restaurant_2", today, 1, 0.0, {}),
+    ]
@@ -0,0 +1,47 @@
+import pytest
+
+from data_access.outbox_relay import OrderOutboxRelay
+from domain.order import OrderHandler
+from domain.order_state_machine import OrderStateMachine
+from ftgo_utils.enums import OrderStatus
+from models import Order
+
+ITEMS = [{"menu_item_id": "item_0", "quantity": 1, "item_price": 6.0}]
+
+
+@pytest.mark.asyncio
+async def test_events_are_written_with_the_change_and_relayed_in_order(fake_mongo, fake_exchange):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    await OrderStateMachine.transition(created["id"], OrderStatus.CONFIRMED, changed_by="restaurant_1")
+
+    # Queuing the event costs no extra write.
+    assert fake_mongo.operations == {"insert_one": 1, "find_one_and_update": 1}
+    pending = (await Order.get(created["id"])).outbox
+    assert [event.routing_key for event in pending] == ["order.placed", "order.confirmed"]
+
+    assert await OrderOutboxRelay.relay() == 2
+    assert fake_exchange.routing_keys == ["order.placed", "order.confirmed"]
+    assert [message["message_id"] for message in fake_exchange.published] == [event.event_id for event in pending]
+    assert fake_exchange.published[0]["body"]["customer_id"] == "customer_1"
+    assert fake_exchange.published[1]["body"]["changed_by"] == "restaurant_1"
+    assert (await Order.get(created["id"])).outbox == []
+    assert await OrderOutboxRelay.relay() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_publishes_stay_queued_and_block_later_events_of_the_order(fake_mongo, fake_exchange):
+    first = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    second = await OrderHandler.create_order("customer_2", "restaurant_1", ITEMS)
+    await OrderStateMachine.transition(first["id"], OrderStatus.CONFIRMED)
+    await OrderStateMachine.transition(first["id"], OrderStatus.PREPARING)
+    await OrderStateMachine.transition(second["id"], OrderStatus.REJECTED)
+    fake_exchange.fail_routing_keys = {"order.confirmed"}
+
+    assert await OrderOutboxRelay.relay() == 3
+    assert sorted(fake_exchange.routing_keys) == ["order.placed", "order.placed", "order.rejected"]
+    assert [event.routing_key for event in (await Order.get(first["id"])).outbox] == ["order.confirmed", "order.preparing"]
+
+    fake_exchange.fail_routing_keys = set()
+    assert await OrderOutboxRelay.relay() == 2
+    assert fake_exchange.routing_keys[-2:] == ["order.confirmed", "order.preparing"]
+    assert len({message["message_id"] for message in fake_exchange.published}) == 5
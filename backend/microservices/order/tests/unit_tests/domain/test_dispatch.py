@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from data_access.location_service import LocationService
+from domain.dispatch import DispatchAssignment, DispatchEngine
+from ftgo_utils.enums import DeliveryStatus
+from models import DeliveryDetail
+
+
+def test_hungarian_minimizes_total_distance_where_greedy_does_not():
+    candidates = {
+        "delivery_a": [("driver_x", 1.0), ("driver_y", 2.0)],
+        "delivery_b": [("driver_x", 2.0), ("driver_y", 100.0)],
+        "delivery_c": [],
+    }
+
+    greedy = DispatchAssignment.greedy(candidates)
+    hungarian = DispatchAssignment.hungarian(candidates)
+
+    assert greedy == {"delivery_a": ("driver_x", 1.0), "delivery_b": ("driver_y", 100.0)}
+    assert hungarian == {"delivery_a": ("driver_y", 2.0), "delivery_b": ("driver_x", 2.0)}
+    assert DispatchAssignment.solve(candidates, hungarian_max_size=2)[0] == "hungarian"
+    assert DispatchAssignment.solve(candidates, hungarian_max_size=1)[0] == "greedy"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_assigns_a_batch_with_one_location_query_and_one_bulk_write(fake_mongo, monkeypatch):
+    deliveries = []
+    for index in range(3):
+        delivery = DeliveryDetail(
+            order_id=f"order_{index}",
+            delivery_status=DeliveryStatus.PENDING.value,
+            source_address_id="source",
+            destination_address_id="destination",
+            pickup_latitude=35.7 + index / 1000,
+            pickup_longitude=51.4,
+        )
+        await delivery.insert()
+        deliveries.append(delivery)
+    # Still carrying an earlier order, so never offered even if location lists it as available.
+    await DeliveryDetail(
+        order_id="order_busy", driver_id="driver_busy", delivery_status=DeliveryStatus.PICKED_UP.value,
+        source_address_id="source", destination_address_id="destination",
+    ).insert()
+    location_calls, occupied_calls = [], []
+
+    async def get_nearest_drivers_many(locations, radius, max_count):
+        location_calls.append(locations)
+        # The last delivery is assigned by hand while the tick is in flight.
+        await DeliveryDetail.get_motor_collection().update_one(
+            {"_id": deliveries[2].id},
+            {"$set": {"driver_id": "driver_manual", "delivery_status": DeliveryStatus.ASSIGNED.value}},
+        )
+        return [
+            [{"driver_id": "driver_busy", "distance": 10.0}, {"driver_id": "driver_0", "distance": 300.0}],
+            [{"driver_id": "driver_0", "distance": 200.0}, {"driver_id": "driver_1", "distance": 900.0}],
+            [{"driver_id": "driver_2", "distance": 100.0}],
+        ]
+
+    async def set_drivers_occupied(driver_ids):
+        occupied_calls.append(driver_ids)
+
+    monkeypatch.setattr(LocationService, "get_nearest_drivers_many", get_nearest_drivers_many)
+    monkeypatch.setattr(LocationService, "set_drivers_occupied", set_drivers_occupied)
+    fake_mongo.reset_operations()
+
+    result = await DispatchEngine.dispatch()
+
+    assert len(location_calls) == 1 and len(location_calls[0]) == 3
+    assert fake_mongo.operations["bulk_write"] == 1
+    assert result["pending"] == 3 and result["method"] == "hungarian"
+    assert result["assignments"] == {str(deliveries[0].id): "driver_0", str(deliveries[1].id): "driver_1"}
+    assert occupied_calls == [["driver_0", "driver_1"]]
+    stored = {delivery.order_id: delivery for delivery in await DeliveryDetail.find_all().to_list()}
+    assert (stored["order_0"].driver_id, stored["order_0"].delivery_status) == ("driver_0", DeliveryStatus.ASSIGNED.value)
+    assert stored["order_2"].driver_id == "driver_manual"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatches_never_give_one_driver_two_deliveries(fake_mongo, monkeypatch):
+    deliveries = []
+    for index in range(2):
+        delivery = DeliveryDetail(
+            order_id=f"order_{index}",
+            delivery_status=DeliveryStatus.PENDING.value,
+            source_address_id="source",
+            destination_address_id="destination",
+            pickup_latitude=35.7,
+            pickup_longitude=51.4,
+        )
+        await delivery.insert()
+        deliveries.append(delivery)
+    # Two replicas tick at once and each picks up a different pending delivery.
+    batches = [[deliveries[0]], [deliveries[1]]]
+    occupied_calls = []
+
+    async def pending_deliveries(limit):
+        return batches.pop(0)
+
+    async def get_nearest_drivers_many(locations, radius, max_count):
+        return [[{"driver_id": "driver_0", "distance": 100.0}] for _ in locations]
+
+    async def set_drivers_occupied(driver_ids):
+        occupied_calls.append(driver_ids)
+
+    monkeypatch.setattr(DispatchEngine, "pending_deliveries", staticmethod(pending_deliveries))
+    monkeypatch.setattr(LocationService, "get_nearest_drivers_many", get_nearest_drivers_many)
+    monkeypatch.setattr(LocationService, "set_drivers_occupied", set_drivers_occupied)
+
+    results = await asyncio.gather(DispatchEngine.dispatch(), DispatchEngine.dispatch())
+
+    assert sorted(result["assigned"] for result in results) == [0, 1]
+    assert occupied_calls == [["driver_0"]]
+    stored = await DeliveryDetail.find_all().to_list()
+    assert {(delivery.driver_id, delivery.delivery_status) for delivery in stored} == {
+        ("driver_0", DeliveryStatus.ASSIGNED.value),
+        (None, DeliveryStatus.PENDING.value),
+    }
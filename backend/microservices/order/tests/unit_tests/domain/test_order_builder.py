@@ -0,0 +1,33 @@
+import pytest
+
+from domain.order import OrderHandler
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import BaseError
+from models import Order
+
+
+def items(count: int) -> list:
+    return [{"menu_item_id": f"item_{index}", "quantity": index + 1, "item_price": 2.5} for index in range(count)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("item_count", [1, 5, 20])
+async def test_order_is_created_with_one_write_whatever_its_size(fake_mongo, item_count):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", items(item_count))
+
+    assert fake_mongo.operations == {"insert_one": 1}
+    stored = await Order.get(created["id"])
+    assert len(stored.order_items) == item_count
+    assert stored.total_amount == sum(item["quantity"] * item["item_price"] for item in items(item_count))
+    assert [entry.status for entry in stored.status_history] == [OrderStatus.PLACED.value]
+    assert {item.order_id for item in stored.order_items} == {created["id"]}
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_are_rejected_before_any_write(fake_mongo):
+    with pytest.raises(BaseError):
+        await OrderHandler.create_order("customer_1", "restaurant_1", [{"menu_item_id": "item_0", "quantity": 0, "item_price": 2.5}])
+    with pytest.raises(BaseError):
+        await OrderHandler.create_order("customer_1", "restaurant_1", [])
+
+    assert fake_mongo.operation_count == 0
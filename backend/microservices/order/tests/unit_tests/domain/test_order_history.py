@@ -0,0 +1,63 @@
+import pytest
+
+from ftgo_utils.errors import BaseError
+
+from domain.order import OrderHandler
+from domain.order_history import OrderHistory
+from models import Order
+from models.order import CUSTOMER_HISTORY_INDEX
+
+ITEMS = [{"menu_item_id": "item_0", "quantity": 1, "item_price": 3.0}]
+
+
+async def place_orders(customer_id: str, count: int) -> list:
+    return [(await OrderHandler.create_order(customer_id, f"restaurant_{index}", ITEMS))["id"] for index in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_history_pages_cover_every_order_once_newest_first(fake_mongo):
+    order_ids = await place_orders("customer_1", 23)
+    await place_orders("customer_2", 5)
+
+    pages, cursor = [], None
+    while True:
+        page = await OrderHandler.get_order_history("customer_1", cursor=cursor, limit=10)
+        pages.append(page["orders"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [10, 10, 3]
+    orders = [order for page in pages for order in page]
+    assert [order["id"] for order in orders] == list(reversed(order_ids))
+    # List views get the summary fields only.
+    assert all("order_items" not in order and "status_history" not in order for order in orders)
+    assert set(orders[0]) == {"id", *OrderHistory.DEFAULT_FIELDS}
+
+
+@pytest.mark.parametrize("field", ["outbox", "schema_version", "id", "missing"])
+def test_internal_and_unknown_fields_cannot_be_requested(field):
+    with pytest.raises(BaseError):
+        OrderHistory("customer_1", fields=["total_amount", field])
+
+
+@pytest.mark.asyncio
+async def test_history_query_is_an_index_range_scan(fake_mongo):
+    await place_orders("customer_1", 3)
+    first = await OrderHandler.get_order_history("customer_1", limit=2, fields=["total_amount"])
+    history = OrderHistory("customer_1", cursor=first["next_cursor"], limit=2, fields=["total_amount"])
+    fake_mongo.reset_operations()
+
+    await history.load()
+
+    # mongomock has no explain(), so the plan is checked against the index definition instead:
+    # equality on the index prefix, sort in the index's own order and the index pinned by hint.
+    plan = history.plan()
+    keys = (await Order.get_settings().motor_collection.index_information())[CUSTOMER_HISTORY_INDEX]["key"]
+    assert plan["hint"] == CUSTOMER_HISTORY_INDEX
+    assert list(keys) == [("customer_id", 1), *plan["sort"]]
+    assert set(plan["filter"]) == {"customer_id", "$or"}
+    assert {field for branch in plan["filter"]["$or"] for field in branch} == {"created_at", "_id"}
+    [(operation, args, kwargs)] = fake_mongo.calls
+    assert (operation, args[0], kwargs) == ("find", plan["filter"], {"sort": plan["sort"], "limit": 3})
+    assert plan["projection"] == {"total_amount": 1, "created_at": 1}
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import domain.order_state_machine
+from domain.order import OrderHandler
+from domain.order_state_machine import OrderStateMachine
+from domain.restaurant import RestaurantHandler
+from ftgo_utils.enums import OrderStatus
+from ftgo_utils.errors import BaseError, ErrorCodes
+from models import Order
+
+ITEMS = [{"menu_item_id": "item_0", "quantity": 2, "item_price": 4.0}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_transitions_on_one_order_have_a_single_winner(fake_mongo):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    # Confirming and rejecting a placed order are mutually exclusive, so exactly one may succeed.
+    targets = [OrderStatus.CONFIRMED, OrderStatus.REJECTED] * 30
+    fake_mongo.reset_operations()
+
+    results = await asyncio.gather(
+        *(OrderStateMachine.transition(created["id"], target, changed_by=f"actor_{index}") for index, target in enumerate(targets)),
+        return_exceptions=True,
+    )
+
+    winners = [result for result in results if isinstance(result, Order)]
+    conflicts = [result for result in results if isinstance(result, BaseError)]
+    assert len(winners) == 1 and len(conflicts) == len(targets) - 1
+    assert {conflict.error_code for conflict in conflicts} == {ErrorCodes.CHANGE_ORDER_STATUS_ERROR}
+    # Every attempt is one conditional update; only the losers read the order back.
+    assert fake_mongo.operations == {"find_one_and_update": len(targets), "find_one": len(targets) - 1}
+
+    stored = await Order.get(created["id"])
+    assert [entry.status for entry in stored.status_history] == [OrderStatus.PLACED.value, winners[0].status.status]
+    assert stored.status == winners[0].status
+
+
+@pytest.mark.asyncio
+async def test_transition_returns_the_new_document_and_rejects_invalid_moves(fake_mongo):
+    created = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    fake_mongo.reset_operations()
+
+    confirmed = await OrderStateMachine.transition(created["id"], OrderStatus.CONFIRMED)
+    paid = await OrderStateMachine.transition(created["id"], OrderStatus.PAID, fields={"payment_id": "payment_1"})
+
+    assert fake_mongo.operations == {"find_one_and_update": 2}
+    assert confirmed.status.status == OrderStatus.CONFIRMED.value
+    assert paid.payment_id == "payment_1"
+    assert [entry.status for entry in paid.status_history] == ["placed", "confirmed", "paid"]
+    with pytest.raises(BaseError):
+        await OrderStateMachine.transition(created["id"], OrderStatus.DELIVERED)
+    with pytest.raises(BaseError) as missing:
+        await OrderStateMachine.transition("0" * 24, OrderStatus.CONFIRMED)
+    assert missing.value.error_code == ErrorCodes.ORDER_NOT_FOUND_ERROR
+
+
+@pytest.mark.asyncio
+async def test_bulk_confirm_reports_every_order_and_writes_once(fake_mongo, fake_redis):
+    placed = [await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS) for _ in range(3)]
+    confirmed = await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS)
+    await OrderStateMachine.transition(confirmed["id"], OrderStatus.CONFIRMED)
+    elsewhere = await OrderHandler.create_order("customer_1", "restaurant_2", ITEMS)
+    order_ids = [order["id"] for order in placed] + [confirmed["id"], elsewhere["id"], "not-an-id", placed[0]["id"]]
+    fake_mongo.reset_operations()
+    fake_redis.round_trips = 0
+
+    response = await RestaurantHandler.confirm_orders(order_ids, restaurant_id="restaurant_1")
+
+    assert fake_mongo.operations == {"bulk_write": 1, "find": 1}
+    # One checked cache write for the whole batch: WATCH, the read of the cached copies and EXEC.
+    assert fake_redis.round_trips == 3
+    assert [(result["order_id"], result["result"], result["status"]) for result in response["results"]] == [
+        *((order["id"], OrderStateMachine.APPLIED, "confirmed") for order in placed),
+        (confirmed["id"], OrderStateMachine.CONFLICT, "confirmed"),
+        (elsewhere["id"], OrderStateMachine.NOT_FOUND, None),
+        ("not-an-id", OrderStateMachine.NOT_FOUND, None),
+    ]
+    stored = await Order.get(placed[0]["id"])
+    assert [entry.status for entry in stored.status_history] == ["placed", "confirmed"]
+    assert [event.routing_key for event in stored.outbox] == ["order.placed", "order.confirmed"]
+    assert (await Order.get(elsewhere["id"])).status.status == OrderStatus.PLACED.value
+
+
+@pytest.mark.asyncio
+async def test_overlapping_bulk_confirms_in_the_same_instant_report_each_order_applied_once(fake_mongo, fake_redis, monkeypatch):
+    placed = [await OrderHandler.create_order("customer_1", "restaurant_1", ITEMS) for _ in range(4)]
+    order_ids = [order["id"] for order in placed]
+    instant = datetime(2024, 1, 1, 12, 0, 0)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return instant
+
+    # Same actor, same target and the same timestamp: only the batch id tells the batches apart.
+    monkeypatch.setattr(domain.order_state_machine, "datetime", FrozenDatetime)
+    responses = await asyncio.gather(
+        RestaurantHandler.confirm_orders(order_ids[:3], restaurant_id="restaurant_1"),
+        RestaurantHandler.confirm_orders(order_ids[1:], restaurant_id="restaurant_1"),
+    )
+
+    applied = [
+        result["order_id"] for response in responses for result in response["results"]
+        if result["result"] == OrderStateMachine.APPLIED
+    ]
+    assert sorted(applied) == sorted(order_ids)
+    for order_id in order_ids:
+        stored = await Order.get(order_id)
+        assert [entry.status for entry in stored.status_history] == ["placed", "confirmed"]